@@ -10,6 +10,14 @@ BEAT_SCHEDULE = {
         "task": "apps.scheduler.tasks.collect_daily_news",
         "schedule": crontab(hour=8, minute=0),
     },
+    "flush-candle-buffer": {
+        "task": "src.apps.scheduler.worker_task.flush_candle_buffer",
+        "schedule": 30.0,
+    },
+    "monthly-candle-archive": {
+        "task": "src.apps.scheduler.worker_task.archive_candle_history",
+        "schedule": crontab(day_of_month=1, hour=3, minute=0),
+    },
     "daily-strategy-generation": {
         "task": "src.apps.scheduler.worker_task.generate_trade_strategies_task",
         "schedule": crontab(hour=21, minute=0),
@@ -1,5 +1,8 @@
 from celery import Celery
+from celery.signals import worker_init
 from src.config.config import settings
+from src.backend.infrastructure.db.factory import DatabaseFactory
+from src.backend.infrastructure.ratelimit.token_bucket import configure_shared_state
 
 
 celery_app = Celery(
@@ -9,6 +12,18 @@ celery_app = Celery(
     include=["apps.scheduler.tasks"]
 )
 
+# Market-data adapters draw from one request budget across all workers
+configure_shared_state(settings.rate_limit_redis_url)
+
+
+@worker_init.connect
+def migrate_database(**kwargs):
+    """
+        Brings the schema up to date once, in the main worker process before the pool forks.
+    """
+    DatabaseFactory.migrate()
+
+
 celery_app.conf.update(
     timezone="Asia/Seoul",
     enable_utc=False,
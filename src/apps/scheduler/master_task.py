@@ -4,7 +4,9 @@ import json
 from celery import chord
 
 from src.apps.scheduler.celery_app import celery_app
-from src.apps.scheduler.worker_task import collect_stock_data_chunk, collect_daily_news, analyze_market_news_task
+from src.apps.scheduler.worker_task import (
+    collect_stock_data_chunk, collect_market_snapshot, collect_daily_news, analyze_market_news_task
+)
 from src.backend.domain.reference_data import StockMarketType, NewsSourceType
 from celery import group
 from src.config.config import STATIC_FOLDER_PATH
@@ -25,13 +27,10 @@ def _load_codes(stock_file_path: str):
 
 @celery_app.task(queue="market_queue")
 def master_collect_stocks():
+    # pykrx returns the whole KOSPI market for a date in one call
     kospi_codes = _load_codes("kospi_200_codes.json")
-    kospi_group = group(
-        collect_stock_data_chunk.s(StockMarketType.KOSPI, code).set(queue="kospi_queue")
-        for code in kospi_codes
-    )
-    kospi_group.apply_async()
-    logger.info(f"Master task dispatched {len(kospi_codes)} individual tasks for KOSPI.")
+    collect_market_snapshot.s(StockMarketType.KOSPI, kospi_codes).set(queue="kospi_queue").apply_async()
+    logger.info(f"Master task dispatched one snapshot task for {len(kospi_codes)} KOSPI codes.")
 
     nasdaq_codes = _load_codes("nasdaq_codes.json")
     nasdaq_group = group(
@@ -1,5 +1,8 @@
 import logging
 import asyncio
+from typing import List
+
+from celery import group
 
 from src.apps.scheduler.celery_app import celery_app
 from src.backend.application import scheduler_services
@@ -11,12 +14,25 @@ from src.backend.infrastructure.crawler.factory import NewsCrawlerFactory
 
 from src.backend.infrastructure.llm.langchain_adapter import LangChainAdapter
 from src.backend.infrastructure.llm.langgraph_adapter import StrategyGenerationGraph
-from src.backend.infrastructure.db.database_api import SQLiteDatabase
+from src.backend.infrastructure.db.factory import DatabaseFactory
+from src.backend.infrastructure.db.candle_buffer import RedisCandleBuffer
 from src.backend.application.agent_services import StrategyGenerationService
+from src.config.config import settings
 
 
 logger = logging.getLogger(__name__)
 
+# Candle rows from every collection task are staged in Redis and written in large batches.
+# Without it each task writes its own candles: rows buffered inside a worker process would be
+# out of reach of the flush task and lost if the worker died after acking the task.
+CANDLE_BUFFER = (
+    RedisCandleBuffer(settings.candle_buffer_redis_url) if settings.candle_buffer_redis_url is not None else None
+)
+
+
+def _flush_candle_buffer_service():
+    return scheduler_services.FlushCandleBufferService(CANDLE_BUFFER, DatabaseFactory.get_port())
+
 
 @celery_app.task(
     bind=True,
@@ -26,7 +42,6 @@ logger = logging.getLogger(__name__)
     retry_backoff=60,
     retry_backoff_max=3600,
     retry_jitter=True,
-    rate_limit="30/m",
 )
 def collect_stock_data_chunk(self, market_type: StockMarketType, code: str):
     """
@@ -37,16 +52,77 @@ def collect_stock_data_chunk(self, market_type: StockMarketType, code: str):
     market_port = MarketAPIFactory.get_port(market_type)
     service = scheduler_services.CollectMarketDataService(
         market_port,
-        SQLiteDatabase()
+        DatabaseFactory.get_port(),
+        candle_buffer=CANDLE_BUFFER
     )
 
     symbols = Symbol(code)
     service.execute(symbols)
+
+    if CANDLE_BUFFER is not None and _flush_candle_buffer_service().should_flush():
+        flush_candle_buffer.apply_async()
     logger.info(f"[Task {self.request.id}] Successfully completed.")
 
     return f"KOSPI collection success: {self.request.id}"
 
 
+@celery_app.task(
+    bind=True,
+    max_retries=3,
+    reject_on_worker_lost=True,
+    autoretry_for=(Exception,),
+    retry_backoff=60,
+    retry_backoff_max=3600,
+    retry_jitter=True,
+)
+def collect_market_snapshot(self, market_type: StockMarketType, codes: List[str]):
+    """
+        Task for collecting the whole market one day per request, catching up on missed days.
+        Codes without indicator history yet, or too far behind, are handed to the per-ticker sync task.
+    """
+    logger.info(f"[Task {self.request.id}] Starting {market_type} snapshot collection")
+    market_port = MarketAPIFactory.get_port(market_type)
+    service = scheduler_services.CollectMarketDataService(
+        market_port,
+        DatabaseFactory.get_port()
+    )
+
+    missing_codes = service.execute_snapshot(market_type, [Symbol(code) for code in codes])
+    if missing_codes:
+        group(
+            collect_stock_data_chunk.s(market_type, code).set(queue=f"{str(market_type).lower()}_queue")
+            for code in missing_codes
+        ).apply_async()
+        logger.info(f"[Task {self.request.id}] Dispatched backfill for {len(missing_codes)} codes.")
+
+    logger.info(f"[Task {self.request.id}] Successfully completed.")
+    return f"{market_type} snapshot success: {self.request.id}"
+
+
+@celery_app.task(queue="market_queue")
+def flush_candle_buffer():
+    """
+        Single writer for buffered candles. Runs on beat for the time threshold
+        and on demand once collection tasks fill the buffer.
+    """
+    if CANDLE_BUFFER is None:
+        return 0
+    flush_service = _flush_candle_buffer_service()
+    if not flush_service.should_flush():
+        return 0
+    return flush_service.execute()
+
+
+@celery_app.task(queue="market_queue")
+def archive_candle_history():
+    """
+        Moves closed months of candles out of the live database into the archive tier.
+    """
+    service = scheduler_services.ArchiveCandlesService(DatabaseFactory.get_port(), DatabaseFactory.get_archive_port())
+    archived = service.execute()
+    return f"Candle archive completed: {archived} months archived."
+
+
 @celery_app.task(
     bind=True,
     max_retries=3,
@@ -64,16 +140,16 @@ def collect_daily_news(self, source: NewsSourceType):
 
     service = scheduler_services.CollectNewsService(
         crawler_port,
-        SQLiteDatabase(),
+        DatabaseFactory.get_port(),
     )
-    service.execute()
+    asyncio.run(service.execute())
 
     logger.info(f"[Task {self.request.id}] News collection completed successfully.")
 
 
 @celery_app.task(queue="news_queue")
 def analyze_market_news_task(results):
-    service = NewsAnalysisService(SQLiteDatabase(), LangChainAdapter())
+    service = NewsAnalysisService(DatabaseFactory.get_port(), LangChainAdapter())
 
     summary = asyncio.run(service.execute())
     return f"Market Analysis Completed: {summary}"
@@ -81,8 +157,8 @@ def analyze_market_news_task(results):
 
 @celery_app.task(queue="strategy_queue")
 def generate_trade_strategies_task():
-    market_port = MarketAPIFactory.get_port(StockMarketType.KOSPI)
-    db_port = SQLiteDatabase()
+    market_port = MarketAPIFactory.get_local_port(StockMarketType.KOSPI)
+    db_port = DatabaseFactory.get_port()
     llm_port = StrategyGenerationGraph()
     
     service = StrategyGenerationService(llm_port, db_port, market_port)
@@ -1,12 +1,16 @@
+import asyncio
 import logging
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict
+
+from datetime import datetime, timedelta
+import pandas as pd
 
-from datetime import datetime
 from src.backend.application.ports.output import LLMOutputPort, DatabaseOutputPort, MarketOutputPort
 from src.backend.domain.entities import TradeStrategy
 from src.backend.domain.services import IndicatorService
-from src.backend.domain.value_objects import MarketContext
 from src.backend.domain.reference_data import Interval
+from src.backend.domain.value_objects import StrategyConfig, MarketContext
 
 logger = logging.getLogger(__name__)
 
@@ -14,10 +18,20 @@ class StrategyGenerationService:
     def __init__(self, 
                  llm_port: LLMOutputPort, 
                  db_port: DatabaseOutputPort, 
-                 market_port: MarketOutputPort):
+                 market_port: MarketOutputPort,
+                 strategy_config: StrategyConfig = StrategyConfig(),
+                 max_concurrency: int = 16,
+                 news_per_candidate: int = 5,
+                 news_lookback_days: int = 3,
+                 market_news_limit: int = 20):
         self.llm_port = llm_port
         self.db_port = db_port
         self.market_port = market_port
+        self.strategy_config = strategy_config
+        self.max_concurrency = max_concurrency
+        self.news_per_candidate = news_per_candidate
+        self.news_lookback_days = news_lookback_days
+        self.market_news_limit = market_news_limit
 
     async def run_strategy_generation(self) -> List[TradeStrategy]:
         """
@@ -25,10 +39,10 @@ class StrategyGenerationService:
         """
         logger.info("Starting Strategy Generation Service...")
         
-        # 1. Fetch recent news
+        # 1. Fetch the latest news for the market-wide view; candidates get their related news below
         today = datetime.now().date()
-        news_items = self.db_port.get_news_by_date(today)
-        news_contents = [n.content for n in news_items] if news_items else []
+        news_items = self.db_port.search_news(since=today, limit=self.market_news_limit)
+        news_contents = [n.content for n in news_items if n.content]
         
         # 2. Candidate Selection & Technical Screening (Pre-filtering)
         candidate_symbols = self.db_port.get_all_symbols()
@@ -36,40 +50,43 @@ class StrategyGenerationService:
             logger.warning("No candidate symbols found in the DB. Ensure data collector is running.")
             return []
             
-        from src.backend.domain.specifications import RsiOverSoldSpec, TrendAndPerfectOrderSpec
+        from src.backend.domain.specifications import default_screening_rule
         
         # Build our custom hard-filter rule: "Either RSI is oversold OR it's in a perfect uptrend order"
         # This prevents sending 200+ useless symbols to the LLM
-        screening_rule = RsiOverSoldSpec() | TrendAndPerfectOrderSpec()
+        screening_rule = default_screening_rule(self.strategy_config)
             
+        # Symbols whose warmed-up indicator state already includes the latest trading day need no
+        # history fetch at all; older states (failed collection, suspended trading) are reloaded
+        candidates = {str(sym) for sym in candidate_symbols}
+        latest_trading_day = self.market_port.get_window_start(Interval.DAY, 1, today)
+        market_contexts = {
+            state.symbol: state.market_context
+            for state in self.db_port.get_indicator_states(Interval.DAY)
+            if state.is_warm and state.symbol in candidates
+            and (latest_trading_day is None or state.last_date >= latest_trading_day)
+        }
+
+        pending_symbols = [sym for sym in candidate_symbols if str(sym) not in market_contexts]
+        market_contexts.update(await self._load_market_contexts(pending_symbols))
+
         stock_analyses = []
-        for sym in candidate_symbols:
-            try:
-                # Need at least 150 days for indicators
-                df = self.market_port.get_candle_history(target=sym, interval=Interval.DAY, count=150)
-                if df is not None and not df.empty:
-                    close_prices = df['Close']
-                    sma_result = IndicatorService.get_simple_moving_average_lines(close_prices)
-                    ema_result = IndicatorService.get_exponential_moving_average_lies(close_prices)
-                    rsi_result = IndicatorService.get_relative_strength_index(close_prices)
-                    
-                    market_context = MarketContext(sma=sma_result, ema=ema_result, rsi=rsi_result)
-                    
-                    # Apply Domain Specification Filter
-                    if screening_rule.is_satisfied_by(market_context):
-                        logger.info(f"Symbol {sym} passed the technical screen.")
-                        tech_context_str = (
-                            f"SMA(20={sma_result.sma_20:.2f}, 60={sma_result.sma_60:.2f}), "
-                            f"RSI(14={rsi_result.rsi_14:.2f})"
-                        )
-                        
-                        stock_analyses.append({
-                            "symbol": sym,
-                            "technical_context": tech_context_str
-                        })
-            except Exception as e:
-                logger.error(f"Failed to fetch data for {sym}: {e}")
-                
+        for sym, market_context in market_contexts.items():
+            # Apply Domain Specification Filter
+            if screening_rule.is_satisfied_by(market_context):
+                logger.info(f"Symbol {sym} passed the technical screen.")
+                sma_result, rsi_result = market_context.sma, market_context.rsi
+                tech_context_str = (
+                    f"SMA(20={sma_result.sma_20:.2f}, 60={sma_result.sma_60:.2f}), "
+                    f"RSI(14={rsi_result.rsi_14:.2f})"
+                )
+
+                stock_analyses.append({
+                    "symbol": sym,
+                    "technical_context": tech_context_str,
+                    "related_news": self._related_news(sym, today)
+                })
+
         if not stock_analyses:
             logger.info("No stocks passed the technical screen today. Skipping strategy generation.")
             return []
@@ -81,5 +98,73 @@ class StrategyGenerationService:
         # 4. Save/Log generated strategies
         for s in strategies:
             logger.info(f"Generated Strategy for {s.symbol}: {s.action} at {s.entry_price}")
-            
+        self.db_port.save_trade_strategies(today, strategies)
+
         return strategies
+
+    def _related_news(self, symbol: str, today) -> List[str]:
+        """
+        Only the few articles about the candidate, instead of the whole day's corpus.
+        Articles name the company rather than its ticker code, so the name is searched when known.
+        """
+        since = today - timedelta(days=self.news_lookback_days)
+        query = self.market_port.get_symbol_name(symbol) or str(symbol)
+        news_items = self.db_port.search_news(query=query, since=since, limit=self.news_per_candidate)
+        tagged = self.db_port.search_news(related_stocks=[str(symbol)], since=since, limit=self.news_per_candidate)
+
+        related, seen = [], set()
+        for n in [*news_items, *tagged]:
+            if n.id not in seen and len(related) < self.news_per_candidate:
+                seen.add(n.id)
+                related.append(f"{n.title}\n{n.content or ''}")
+        return related
+
+    async def _load_market_contexts(self, symbols: List[str]) -> Dict[str, MarketContext]:
+        """
+        Fetches candle histories concurrently and computes indicators as they arrive.
+        Histories that arrive together share one vectorized panel pass; the panel computes
+        every symbol over its own candles, so a symbol's context does not depend on which
+        other histories happened to arrive in the same batch.
+        """
+        if not symbols:
+            return {}
+
+        loop = asyncio.get_running_loop()
+        arrived: asyncio.Queue = asyncio.Queue()
+
+        async def _fetch(sym, executor):
+            try:
+                # Need at least 150 days for indicators
+                df = await loop.run_in_executor(
+                    executor, self.market_port.get_candle_history, sym, Interval.DAY, 150
+                )
+            except Exception as e:
+                logger.error(f"Failed to fetch data for {sym}: {e}")
+                df = None
+            await arrived.put((str(sym), df))
+
+        market_contexts = {}
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            fetchers = [asyncio.create_task(_fetch(sym, executor)) for sym in symbols]
+
+            remaining = len(symbols)
+            while remaining:
+                batch = [await arrived.get()]
+                while not arrived.empty():
+                    batch.append(arrived.get_nowait())
+                remaining -= len(batch)
+
+                close_prices = {
+                    sym: df.set_index('candle_date_time')['close_price']
+                    for sym, df in batch
+                    if df is not None and not df.empty
+                }
+                if close_prices:
+                    # One vectorized pass over the (dates x symbols) matrix instead of one per symbol;
+                    # dates missing from a symbol's calendar are NaN and skipped for that symbol
+                    price_matrix = pd.DataFrame(close_prices).sort_index()
+                    panel = IndicatorService.get_indicator_panel(price_matrix)
+                    market_contexts.update(panel.to_market_contexts())
+
+            await asyncio.gather(*fetchers)
+        return market_contexts
@@ -0,0 +1,195 @@
+import datetime
+import itertools
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import List, Callable, Iterable, Optional
+
+import numpy as np
+
+from src.backend.application.ports.output import CandleHistoryOutputPort
+from src.backend.domain.reference_data import Interval
+from src.backend.domain.services import BacktestEngine
+from src.backend.domain.specifications import TradingCondition, threshold_screening_rule
+from src.backend.domain.value_objects import (
+    BacktestResult, ExitRule, CandleMatrix, StrategyConfig, SweepResult
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BacktestService:
+    """
+        Use case for measuring how a screening rule would have performed.
+        Orchestrates:
+        - Loading the OHLCV history of a symbol universe, from the archive tier as well as
+          the live database
+        - Replaying the rule with the vectorized BacktestEngine
+    """
+    database_port: CandleHistoryOutputPort
+
+    def execute(self,
+                symbols: List[str],
+                start_date: datetime.date,
+                end_date: datetime.date,
+                rule: TradingCondition,
+                exit_rule: ExitRule,
+                interval: Interval = Interval.DAY) -> BacktestResult:
+        candles = self.database_port.get_candle_matrix(symbols, interval, start_date, end_date)
+        logger.info(f"Backtesting {len(candles.symbols)} symbols over {len(candles.dates)} bars.")
+
+        result = BacktestEngine(candles, exit_rule).run(rule)
+        logger.info(
+            f"Backtest finished: trades={result.trades}, hit_rate={result.hit_rate:.2%}, "
+            f"total_return={result.total_return:.4f}, max_drawdown={result.max_drawdown:.4f}"
+        )
+        return result
+
+
+@dataclass
+class StrategySweepService:
+    """
+        Use case for searching StrategyConfig thresholds over historical data.
+        Orchestrates:
+        - Loading the OHLCV history (archive tier and live database) once into shared memory
+        - Backtesting every config on a process pool (workers attach to the same memory)
+        - Ranking configs by total return, hit rate and drawdown
+    """
+    database_port: CandleHistoryOutputPort
+    # Must read every StrategyConfig field the configs vary, or those fields sweep nothing
+    rule_factory: Callable[[StrategyConfig], TradingCondition] = threshold_screening_rule
+    max_workers: Optional[int] = None
+
+    def execute(self,
+                symbols: List[str],
+                start_date: datetime.date,
+                end_date: datetime.date,
+                configs: List[StrategyConfig],
+                exit_rule: ExitRule,
+                interval: Interval = Interval.DAY) -> List[SweepResult]:
+        candles = self.database_port.get_candle_matrix(symbols, interval, start_date, end_date)
+        workers = self.max_workers or os.cpu_count() or 1
+        logger.info(f"Sweeping {len(configs)} configs over {candles.close.shape} candles with {workers} workers.")
+
+        shared = _SharedCandles.create(candles)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_sweep_worker,
+                initargs=(shared.descriptor, exit_rule, self.rule_factory),
+            ) as pool:
+                chunksize = max(1, len(configs) // (workers * 4))
+                results = list(pool.map(_run_sweep_config, configs, chunksize=chunksize))
+        finally:
+            shared.release()
+
+        return rank_sweep_results([SweepResult(config=c, result=r) for c, r in zip(configs, results)])
+
+
+def rank_sweep_results(results: List[SweepResult]) -> List[SweepResult]:
+    """
+        Best first: higher total return, then higher hit rate, then smaller drawdown.
+    """
+    return sorted(
+        results,
+        key=lambda r: (-r.result.total_return, -r.result.hit_rate, r.result.max_drawdown)
+    )
+
+
+def grid_strategy_configs(oversold_limits: Iterable[float],
+                          overbought_limits: Iterable[float],
+                          sharp_drop_limits: Iterable[float]) -> List[StrategyConfig]:
+    """
+        Every valid combination of the given thresholds.
+    """
+    configs = []
+    for oversold, overbought, sharp_drop in itertools.product(oversold_limits, overbought_limits, sharp_drop_limits):
+        try:
+            configs.append(StrategyConfig(oversold, overbought, sharp_drop))
+        except ValueError:
+            continue
+    return configs
+
+
+def random_strategy_configs(count: int, seed: Optional[int] = None) -> List[StrategyConfig]:
+    """
+        Uniformly sampled configs inside the ranges StrategyConfig accepts.
+    """
+    rng = np.random.default_rng(seed)
+    return [
+        StrategyConfig(
+            rsi_oversold_limit=float(oversold),
+            rsi_overbought_limit=float(overbought),
+            sharp_drop_limit=float(sharp_drop),
+        )
+        for oversold, overbought, sharp_drop in zip(
+            rng.uniform(5.0, 50.0, count),
+            rng.uniform(50.0, 95.0, count),
+            rng.uniform(0.0, 10.0, count),
+        )
+        if oversold < overbought
+    ]
+
+
+@dataclass(frozen=True)
+class _SharedCandles:
+    """
+        The OHLCV arrays of a CandleMatrix packed into one shared memory block,
+        so workers map them instead of receiving a pickled copy per task.
+    """
+    memory: shared_memory.SharedMemory
+    descriptor: dict
+
+    _FIELDS = ("open", "high", "low", "close", "volume")
+
+    @classmethod
+    def create(cls, candles: CandleMatrix) -> "_SharedCandles":
+        shape = (len(cls._FIELDS),) + candles.close.shape
+        memory = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * 8))
+        packed = np.ndarray(shape, dtype=np.float64, buffer=memory.buf)
+        for i, name in enumerate(cls._FIELDS):
+            packed[i] = getattr(candles, name)
+
+        descriptor = {
+            "name": memory.name,
+            "shape": shape,
+            "dates": candles.dates,
+            "symbols": candles.symbols,
+        }
+        return cls(memory=memory, descriptor=descriptor)
+
+    @classmethod
+    def attach(cls, descriptor: dict):
+        memory = shared_memory.SharedMemory(name=descriptor["name"])
+        packed = np.ndarray(descriptor["shape"], dtype=np.float64, buffer=memory.buf)
+        candles = CandleMatrix(
+            dates=descriptor["dates"],
+            symbols=descriptor["symbols"],
+            **{name: packed[i] for i, name in enumerate(cls._FIELDS)},
+        )
+        return memory, candles
+
+    def release(self):
+        self.memory.close()
+        self.memory.unlink()
+
+
+# Per-process state of a sweep worker, built once by the pool initializer
+_worker_memory: Optional[shared_memory.SharedMemory] = None
+_worker_engine: Optional[BacktestEngine] = None
+_worker_rule_factory: Optional[Callable[[StrategyConfig], TradingCondition]] = None
+
+
+def _init_sweep_worker(descriptor: dict, exit_rule: ExitRule,
+                       rule_factory: Callable[[StrategyConfig], TradingCondition]):
+    global _worker_memory, _worker_engine, _worker_rule_factory
+    _worker_memory, candles = _SharedCandles.attach(descriptor)
+    _worker_engine = BacktestEngine(candles, exit_rule)
+    _worker_rule_factory = rule_factory
+
+
+def _run_sweep_config(config: StrategyConfig) -> BacktestResult:
+    return _worker_engine.run(_worker_rule_factory(config))
@@ -1,12 +1,13 @@
 import datetime
 from abc import ABC, abstractmethod
 
-from src.backend.domain.entities import MarketAnalysis
-from src.backend.domain.value_objects import Symbol
+from src.backend.domain.entities import MarketAnalysis, IndicatorState, TradeStrategy
+from src.backend.domain.value_objects import Symbol, CandleMatrix, DataOHLCV
 from src.backend.domain.reference_data import Interval, StockMarketType
 from src.backend.domain.entities import News
+import numpy as np
 import pandas as pd # Pragmatic exception!
-from typing import List
+from typing import AsyncIterator, Callable, Dict, List, Optional, Set
 
 
 class MarketOutputPort(ABC):
@@ -18,6 +19,21 @@ class MarketOutputPort(ABC):
     def get_candle_history(self, target: Symbol, interval: Interval, count: int = 200) -> pd.DataFrame:
         ...
 
+    @abstractmethod
+    def get_candle_history_since(self, target: Symbol, interval: Interval, since: datetime.date) -> pd.DataFrame:
+        """
+            Only the candles after `since`, for incremental syncs.
+        """
+        ...
+
+    @abstractmethod
+    def get_candle_history_between(self, target: Symbol, interval: Interval,
+                                   start_date: datetime.date, end_date: datetime.date) -> pd.DataFrame:
+        """
+            The candles from `start_date` to `end_date`, both inclusive.
+        """
+        ...
+
     @abstractmethod
     def get_candles_history(self, targets: List[Symbol], interval: Interval, count: int = 1) -> pd.DataFrame:
         """
@@ -25,30 +41,121 @@ class MarketOutputPort(ABC):
         """
         ...
 
+    @abstractmethod
+    def get_window_start(self, interval: Interval, count: int, until: datetime.date) -> Optional[datetime.date]:
+        """
+            Date of the oldest of the latest `count` candles up to `until` by the market's trading
+            calendar (count=1 gives the latest trading day), or None when no calendar applies.
+        """
+        ...
+
+    @abstractmethod
+    def get_market_snapshot(self, market_type: StockMarketType, target_date: datetime.date) -> pd.DataFrame:
+        """
+            1 day candles of every ticker in the market for one date, in a single request.
+        """
+        ...
+
     @abstractmethod
     def get_all_symbols(self, market_type: StockMarketType):
         ...
 
+    @abstractmethod
+    def get_symbol_name(self, target: Symbol) -> Optional[str]:
+        """
+            Company name of a ticker as news articles write it, or None if unknown.
+        """
+        ...
+
+
+class CandleHistoryOutputPort(ABC):
+    @abstractmethod
+    def get_candle_columns(self, symbols: List[str], interval: Interval,
+                           start_date: datetime.date, end_date: datetime.date) -> np.ndarray:
+        """
+            Load stored OHLCV of many symbols as one contiguous CandleMatrix.COLUMNS_DTYPE array,
+            both dates inclusive. `symbol` holds the position of the symbol in `symbols`.
+        """
+        ...
+
+    @abstractmethod
+    def get_candle_matrix(self, symbols: List[str], interval: Interval,
+                          start_date: datetime.date, end_date: datetime.date) -> CandleMatrix:
+        """
+            Load stored OHLCV of many symbols as (dates x symbols) arrays, both dates inclusive.
+        """
+        ...
+
 
-class DatabaseOutputPort(ABC):
+class DatabaseOutputPort(CandleHistoryOutputPort):
     @abstractmethod
     def put_ohlcv_to_database(self, data: pd.DataFrame):
         ...
 
+    @abstractmethod
+    def put_candles(self, symbol: str, interval: Interval, candles: List[DataOHLCV],
+                    market_type: Optional[str] = None):
+        """
+            Store DataOHLCV candles of one symbol without going through a DataFrame.
+            market_type None keeps the market type already stored for the symbol.
+        """
+        ...
+
     @abstractmethod
     def put_news(self, news: List[News]):
         ...
 
     @abstractmethod
-    def get_news_by_date(self, target_date: datetime.date) -> List[News]:
+    def get_news_by_date(self, target_date: datetime.date, source: Optional[str] = None) -> List[News]:
         """
-            Query news with target date.
+            Query news published on the target date, optionally from one source only.
         """
 
+    @abstractmethod
+    def get_known_news_ids(self, ids: List[str]) -> Set[str]:
+        """
+            The subset of `ids` already stored, so crawlers skip articles they have saved before.
+        """
+        ...
+
+    @abstractmethod
+    def search_news(self, query: Optional[str] = None, related_stocks: Optional[List[str]] = None,
+                    related_sectors: Optional[List[str]] = None, since: Optional[datetime.date] = None,
+                    limit: int = 10) -> List[News]:
+        """
+            Full-text search over title and content, ranked by relevance and recency.
+            Without a query the newest matching news come first.
+            related_stocks / related_sectors keep news tagged with any of the given values.
+        """
+        ...
+
     @abstractmethod
     def save_market_analysis(self, analysis: MarketAnalysis):
         """
-            save the results of market analysis.
+            save the results of market analysis. A later analysis of the same date replaces it.
+        """
+        ...
+
+    @abstractmethod
+    def get_market_analyses(self, start_date: datetime.date, end_date: datetime.date) -> List[MarketAnalysis]:
+        """
+            Saved market analyses between both dates (inclusive), oldest first.
+        """
+        ...
+
+    @abstractmethod
+    def save_trade_strategies(self, strategy_date: datetime.date, strategies: List[TradeStrategy]):
+        """
+            save the strategies generated on a date, replacing every strategy saved earlier for that date,
+            so symbols left out of a re-run do not keep stale rows. An empty list leaves the date untouched.
+        """
+        ...
+
+    @abstractmethod
+    def get_trade_strategies(self, start_date: datetime.date, end_date: datetime.date,
+                             symbol: Optional[str] = None) -> Dict[datetime.date, List[TradeStrategy]]:
+        """
+            Saved strategies between both dates (inclusive) by date, optionally of one symbol only.
         """
         ...
         
@@ -59,10 +166,155 @@ class DatabaseOutputPort(ABC):
         """
         ...
 
+    @abstractmethod
+    def get_last_candle_date(self, symbol: str, interval: Interval) -> Optional[datetime.date]:
+        """
+            Date of the latest stored candle, or None if the symbol has none.
+        """
+        ...
+
+    @abstractmethod
+    def get_recent_candles(self, interval: Interval, count: int) -> pd.DataFrame:
+        """
+            Load the latest `count` stored candles of every symbol in one query (newest first per symbol).
+        """
+        ...
+
+    @abstractmethod
+    def get_first_candle_date(self, interval: Interval) -> Optional[datetime.date]:
+        """
+            Date of the oldest stored candle of any symbol, or None if there is none.
+        """
+        ...
+
+    @abstractmethod
+    def get_month_candles(self, interval: Interval, year: int, month: int) -> pd.DataFrame:
+        """
+            Every stored candle of one calendar month, for archiving.
+        """
+        ...
+
+    @abstractmethod
+    def delete_candles_between(self, interval: Interval, start_date: datetime.date, before_date: datetime.date):
+        """
+            Delete the candles dated from `start_date` up to, but not including, `before_date`.
+            A failed delete raises, so a caller that already archived the candles does not report them as moved.
+        """
+        ...
+
+    @abstractmethod
+    def get_indicator_state(self, symbol: str, interval: Interval) -> Optional[IndicatorState]:
+        """
+            Load the running indicator state of one symbol.
+        """
+        ...
+
+    @abstractmethod
+    def get_indicator_states(self, interval: Interval) -> List[IndicatorState]:
+        """
+            Load the running indicator states of every symbol for the interval.
+        """
+        ...
+
+    @abstractmethod
+    def put_indicator_state(self, state: IndicatorState):
+        ...
+
+    @abstractmethod
+    def put_indicator_states(self, states: List[IndicatorState]):
+        ...
+
+
+class CandleBufferOutputPort(ABC):
+    """
+        Staging area for candle rows, drained into the database by a single writer.
+    """
+    @abstractmethod
+    def push(self, data: pd.DataFrame):
+        ...
+
+    @abstractmethod
+    def peek(self, max_rows: int) -> pd.DataFrame:
+        """
+            Returns up to `max_rows` of the oldest rows without removing them.
+        """
+        ...
+
+    @abstractmethod
+    def trim(self, rows: int):
+        """
+            Removes the `rows` oldest rows, once they are safely written.
+        """
+        ...
+
+    @abstractmethod
+    def size(self) -> int:
+        ...
+
+    @abstractmethod
+    def age(self) -> float:
+        """
+            Seconds since the oldest pending row was pushed, 0 when empty.
+        """
+        ...
+
+    @abstractmethod
+    def acquire_flush_lock(self, ttl: float) -> bool:
+        ...
+
+    @abstractmethod
+    def release_flush_lock(self):
+        ...
+
+
+class CandleArchiveOutputPort(CandleHistoryOutputPort):
+    """
+        Cold storage for closed months of candles, read without touching the live database.
+    """
+    @abstractmethod
+    def archived_until(self, interval: Interval) -> Optional[datetime.date]:
+        """
+            Last date of the newest archived month; every month up to it is archived.
+        """
+        ...
+
+    @abstractmethod
+    def put_month(self, interval: Interval, year: int, month: int, data: pd.DataFrame):
+        ...
+
+    @abstractmethod
+    def get_recent_candle_columns(self, symbols: List[str], interval: Interval, count: int) -> np.ndarray:
+        """
+            At least the latest `count` archived candles of every symbol that has that many
+            (CandleMatrix.COLUMNS_DTYPE records, symbol as an index into `symbols`).
+        """
+        ...
+
 
 class NewsCrawlerOutputPort(ABC):
     @abstractmethod
-    async def fetch_news(self):
+    def fetch_news(self, known_ids: Optional[Callable[[List[str]], Set[str]]] = None) -> List[News]:
+        """
+            known_ids returns which of the given news ids are already stored; their articles are not fetched.
+        """
+        ...
+
+    @abstractmethod
+    async def fetch_news_async(self, deadline: float = 60,
+                               known_ids: Optional[Callable[[List[str]], Set[str]]] = None) -> List[News]:
+        """
+            Fetch feeds and articles concurrently. Whatever is still loading after `deadline`
+            seconds is left for the next run.
+        """
+        ...
+
+    @abstractmethod
+    def stream_news(self, deadline: float = 60,
+                    known_ids: Optional[Callable[[List[str]], Set[str]]] = None) -> AsyncIterator[News]:
+        """
+            Like fetch_news_async, but yields each news item as soon as it is parsed.
+            The crawl waits while the consumer is behind.
+        """
         ...
 
 
@@ -1,13 +1,16 @@
+import asyncio
 import logging
 import datetime
 from dataclasses import dataclass
 
 from src.backend.application.ports.output import MarketOutputPort, DatabaseOutputPort, NewsCrawlerOutputPort, \
-    LLMOutputPort
+    LLMOutputPort, CandleBufferOutputPort, CandleArchiveOutputPort
+from src.backend.domain.entities import IndicatorState, News
 from src.backend.domain.reference_data import Interval, StockMarketType
-from src.backend.domain.value_objects import Symbol
+from src.backend.domain.value_objects import Symbol, DataOHLCV
 
-from typing import List
+import pandas as pd
+from typing import List, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -24,28 +27,251 @@ class CollectMarketDataService:
     """
     market_port: MarketOutputPort
     database_port: DatabaseOutputPort
+    # When set, candles are staged here and FlushCandleBufferService writes them
+    # and advances their indicator states
+    candle_buffer: Optional[CandleBufferOutputPort] = None
+
+    # Candles needed to seed a new indicator state (longest SMA window + margin)
+    INDICATOR_WARMUP_COUNT = 150
+    # Calendar days a snapshot run catches up on; symbols further behind are synced per ticker
+    SNAPSHOT_CATCH_UP_DAYS = 7
+
+    def execute(self, symbol: Symbol, interval: Interval = Interval.DAY, count: int = 1, incremental: bool = True):
+        """
+            With `incremental`, a symbol that already has stored candles only fetches
+            the trading days after its last stored candle; `count` seeds new symbols.
+        """
+        state = self.database_port.get_indicator_state(str(symbol), interval)
+        last_date = None
+        if state is None:
+            count = max(count, self.INDICATOR_WARMUP_COUNT)
+            state = IndicatorState(symbol=str(symbol), interval=str(interval))
+        elif incremental:
+            last_date = self.database_port.get_last_candle_date(str(symbol), interval)
+
+        if last_date is not None:
+            data = self.market_port.get_candle_history_since(symbol, interval, last_date)
+        else:
+            data = self.market_port.get_candle_history(symbol, interval, count)
+
+        if data.empty:
+            return
+
+        if self.candle_buffer is not None:
+            self.candle_buffer.push(data)
+            return
+
+        # The state only moves past candles that are stored
+        self.database_port.put_ohlcv_to_database(data)
+        if any([state.update(candle) for candle in to_ohlcv_candles(data)]):
+            self.database_port.put_indicator_state(state)
+
+    def execute_snapshot(self, market_type: StockMarketType, symbols: List[Symbol],
+                         target_date: Optional[datetime.date] = None) -> List[str]:
+        """
+            Collects the whole market one day per request and writes it in one bulk insert.
+            Every day after the oldest last stored candle up to `target_date` is fetched, so
+            days missed by earlier runs are filled in.
+
+            Returns:
+                Symbols without an indicator state yet or more than SNAPSHOT_CATCH_UP_DAYS
+                behind, which need a per-ticker sync.
+        """
+        target_date = target_date or datetime.datetime.now().date()
+        wanted = {str(s) for s in symbols}
+        states = {s.symbol: s for s in self.database_port.get_indicator_states(Interval.DAY) if s.symbol in wanted}
+
+        oldest_allowed = target_date - datetime.timedelta(days=self.SNAPSHOT_CATCH_UP_DAYS)
+        last_dates = {symbol: state.last_date for symbol, state in states.items()}
+        lagging = {symbol for symbol, last_date in last_dates.items() if last_date is None or last_date < oldest_allowed}
+        catching_up = {symbol: last_date for symbol, last_date in last_dates.items() if symbol not in lagging}
+        per_ticker = sorted((wanted - states.keys()) | lagging)
+
+        since = min(catching_up.values(), default=target_date)
+        days = [since + datetime.timedelta(days=n) for n in range(1, (target_date - since).days + 1)]
+        if not days:
+            logger.info(f"No {market_type} symbol needs a snapshot up to {target_date}.")
+            return per_ticker
+
+        snapshots = []
+        for day in days:
+            snapshot = self.market_port.get_market_snapshot(market_type, day)
+            if not snapshot.empty:
+                # Symbols synced per ticker must not get a newer stored candle ahead of their gap
+                snapshots.append(snapshot[snapshot['symbol'].isin(catching_up.keys())])
+
+        data = pd.concat(snapshots, ignore_index=True) if snapshots else pd.DataFrame()
+        if data.empty:
+            logger.warning(f"No {market_type} snapshot collected for {len(days)} days up to {target_date}.")
+            return per_ticker
 
-    def execute(self, symbol: Symbol, interval: Interval = Interval.DAY, count: int = 1):
-        data = self.market_port.get_candle_history(symbol, interval, count)
         self.database_port.put_ohlcv_to_database(data)
+        logger.info(f"Saved {len(data)} {market_type} candles of {len(snapshots)} trading days up to {target_date}.")
+
+        updated = []
+        for symbol, rows in data.groupby('symbol'):
+            state = states[symbol]
+            if any([state.update(candle) for candle in to_ohlcv_candles(rows)]):
+                updated.append(state)
+        self.database_port.put_indicator_states(updated)
+
+        return per_ticker
+
+
+@dataclass
+class FlushCandleBufferService:
+    """
+        Single writer that drains buffered candles into the database in large transactions,
+        once the buffer holds `flush_rows` rows or its oldest row is `flush_seconds` old.
+
+        Each batch is written and its symbols' indicator states advanced before the rows are
+        trimmed from the buffer, so a failed write leaves them buffered for the next flush.
+        Rewriting a batch is harmless: candles are upserted and states skip candles they have seen.
+    """
+    candle_buffer: CandleBufferOutputPort
+    database_port: DatabaseOutputPort
+    flush_rows: int = 5_000
+    flush_seconds: float = 30.0
+    batch_rows: int = 50_000
+    lock_ttl: float = 300.0
+
+    def should_flush(self) -> bool:
+        return self.candle_buffer.size() >= self.flush_rows or self.candle_buffer.age() >= self.flush_seconds
+
+    def execute(self) -> int:
+        if not self.candle_buffer.acquire_flush_lock(self.lock_ttl):
+            logger.debug("Candle buffer is already being flushed by another writer.")
+            return 0
+
+        flushed = 0
+        try:
+            while not (batch := self.candle_buffer.peek(self.batch_rows)).empty:
+                self.database_port.put_ohlcv_to_database(batch)
+                self._update_indicator_states(batch)
+                self.candle_buffer.trim(len(batch))
+                flushed += len(batch)
+        finally:
+            self.candle_buffer.release_flush_lock()
+
+        if flushed:
+            logger.info(f"Flushed {flushed} buffered candles to Database.")
+        return flushed
+
+    def _update_indicator_states(self, batch: pd.DataFrame):
+        updated = []
+        for interval, rows in batch.groupby('interval'):
+            interval = Interval(interval)
+            states = {s.symbol: s for s in self.database_port.get_indicator_states(interval)}
+            for symbol, candles in rows.groupby('symbol'):
+                state = states.get(symbol) or IndicatorState(symbol=str(symbol), interval=str(interval))
+                if any([state.update(candle) for candle in to_ohlcv_candles(candles)]):
+                    updated.append(state)
+        self.database_port.put_indicator_states(updated)
+
+
+@dataclass
+class ArchiveCandlesService:
+    """
+        Use case for moving closed months of candles to the archive tier.
+        Orchestrates:
+        - Copying every month older than `hot_months` into the archive, oldest first
+        - Deleting the months archived in this run from the live database; candles backfilled
+          into an already archived month stay there and are read alongside the archive
+    """
+    database_port: DatabaseOutputPort
+    archive_port: CandleArchiveOutputPort
+    hot_months: int = 24
+
+    def execute(self, interval: Interval = Interval.DAY, today: Optional[datetime.date] = None) -> int:
+        today = today or datetime.datetime.now().date()
+        cutoff_index = today.year * 12 + today.month - 1 - self.hot_months
+
+        archived_until = self.archive_port.archived_until(interval)
+        first = (archived_until + datetime.timedelta(days=1)) if archived_until \
+            else self.database_port.get_first_candle_date(interval)
+        if first is None:
+            return 0
+
+        first_index = first.year * 12 + first.month - 1
+        archived = 0
+        for index in range(first_index, cutoff_index):
+            year, month = divmod(index, 12)
+            data = self.database_port.get_month_candles(interval, year, month + 1)
+            self.archive_port.put_month(interval, year, month + 1, data)
+            archived += 1
+
+        if archived:
+            self.database_port.delete_candles_between(interval, _month_start(first_index), _month_start(cutoff_index))
+            logger.info(f"Archived {archived} months of {interval} candles.")
+        return archived
+
+
+def _month_start(month_index: int) -> datetime.date:
+    year, month = divmod(month_index, 12)
+    return datetime.date(year, month + 1, 1)
+
+
+def to_ohlcv_candles(data: pd.DataFrame) -> List[DataOHLCV]:
+    """
+        Converts an OHLCV DataFrame into DataOHLCV candles, oldest first.
+    """
+    timestamps = (pd.to_datetime(data['candle_date_time']) - pd.Timestamp(0)) // pd.Timedelta(seconds=1)
+    ordered = data.assign(timestamp=timestamps).sort_values('timestamp')
+    return [
+        DataOHLCV(
+            open=float(row.open_price),
+            high=float(row.high_price),
+            low=float(row.low_price),
+            close=float(row.close_price),
+            volume=float(row.volume),
+            timestamp=int(row.timestamp),
+        )
+        for row in ordered.itertuples(index=False)
+    ]
 
 
 @dataclass
 class CollectNewsService:
+    """
+        Use case for collecting news.
+        Orchestrates:
+        - Streaming news out of the crawler, skipping articles already stored
+        - Saving them in batches of `batch_size` while the crawl goes on
+    """
     news_crawler_port: NewsCrawlerOutputPort
     database_port: DatabaseOutputPort
+    deadline: float = 60
+    batch_size: int = 50
 
-    def execute(self):
-        news_list = self.news_crawler_port.fetch_news()
+    async def execute(self):
+        """
+            Every full batch is saved before more news are taken from the crawler, so memory
+            stays at one batch and the crawl waits while the database is busy. News collected
+            before a failure are saved before the failure is raised.
+        """
+        saved = 0
+        batch: List[News] = []
+        try:
+            async for news in self.news_crawler_port.stream_news(
+                    self.deadline, known_ids=self.database_port.get_known_news_ids):
+                batch.append(news)
+                if len(batch) >= self.batch_size:
+                    saved += await self._save(batch)
+                    batch = []
+        finally:
+            if batch:
+                saved += await self._save(batch)
 
-        if not news_list:
+        if not saved:
             logger.warning("No news collected.")
             return
 
-        logger.info(f"Saving {len(news_list)} news items to Database..")
-        self.database_port.put_news(news_list)
+        logger.info(f"Saved {saved} news items to Database.")
+        return saved
 
-        return len(news_list)
+    async def _save(self, batch: List[News]) -> int:
+        await asyncio.to_thread(self.database_port.put_news, batch)
+        return len(batch)
 
 
 @dataclass
@@ -53,12 +279,17 @@ class NewsAnalysisService:
     database_port: DatabaseOutputPort
     llm_port: LLMOutputPort
 
-    def execute(self):
+    async def execute(self):
         today = datetime.datetime.now().date()
         news_list = self.database_port.get_news_by_date(today)
         if not news_list:
             return "No news to analyze"
 
-        analysis = self.llm_port.analyze_market(news_list)
+        analysis = await self.llm_port.analyze_market(news_list)
+        if analysis.failed:
+            # Keeps the day's last good analysis instead of replacing it with the failure
+            logger.warning(f"Market analysis failed, not saving it: {analysis.reasons}")
+            return analysis.summary
+
         self.database_port.save_market_analysis(analysis)
         return analysis.summary
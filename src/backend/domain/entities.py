@@ -1,8 +1,11 @@
-from datetime import datetime
+from collections import deque
+from datetime import date, datetime, timedelta
 from dataclasses import dataclass, field
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Deque
 
-from src.backend.domain.value_objects import Symbol
+from src.backend.domain.value_objects import (
+    Symbol, DataOHLCV, SMAResult, EMAResult, RSIResult, MarketContext, ExitRule
+)
 from src.backend.domain.reference_data import MarketSentiment, TradingStrategy
 
 
@@ -17,6 +20,21 @@ class TradeStrategy:
     reasoning: str = ""
     valid_until: Optional[datetime] = None
 
+    def exit_rule(self, max_holding_bars: int = 20) -> ExitRule:
+        """
+        Turns the absolute take profit / stop loss prices into ratios of the entry price,
+        so the same strategy can be replayed on any symbol.
+        """
+        if not self.entry_price or self.take_profit is None or self.stop_loss is None:
+            raise ValueError(f"Strategy for {self.symbol} needs entry, take profit and stop loss prices.")
+
+        return ExitRule(
+            take_profit_pct=abs(self.take_profit / self.entry_price - 1),
+            stop_loss_pct=abs(self.stop_loss / self.entry_price - 1),
+            max_holding_bars=max_holding_bars,
+            action=self.action,
+        )
+
 
 @dataclass
 class StockAnalysis:
@@ -74,6 +92,9 @@ class MarketAnalysis:
     thought_process: Optional[str] = None
     cited_news_ids: List[str] = field(default_factory=list)
 
+    # Set when the LLM gave no usable answer; such an analysis is not stored
+    failed: bool = False
+
     @property
     def determined_market_sentiment(self) -> MarketSentiment:
         if self.sentiment_score >= 0.3:
@@ -93,3 +114,134 @@ class MarketAnalysis:
             return TradingStrategy.SHORT
         else:
             return TradingStrategy.CASH_HOLD
+
+
+@dataclass
+class IndicatorState:
+    """
+    Running SMA/EMA/RSI state of one (symbol, interval) series.
+    Each new candle updates it in O(1), and the values match a full recomputation
+    over every candle the state has seen.
+    """
+    SMA_WINDOWS = (20, 60, 120)
+    EMA_SPANS = (20, 60, 120)
+    RSI_PERIODS = (2, 7, 9, 14, 50)
+
+    symbol: str
+    interval: str
+    last_timestamp: Optional[int] = None
+
+    closes: Deque[float] = field(default_factory=lambda: deque(maxlen=max(IndicatorState.SMA_WINDOWS)))
+    sma_sums: Dict[int, float] = field(default_factory=lambda: {w: 0.0 for w in IndicatorState.SMA_WINDOWS})
+    emas: Dict[int, Optional[float]] = field(default_factory=lambda: {s: None for s in IndicatorState.EMA_SPANS})
+
+    prev_close: Optional[float] = None
+    delta_count: int = 0
+    avg_gains: Dict[int, Optional[float]] = field(default_factory=lambda: {p: None for p in IndicatorState.RSI_PERIODS})
+    avg_losses: Dict[int, Optional[float]] = field(default_factory=lambda: {p: None for p in IndicatorState.RSI_PERIODS})
+
+    @property
+    def is_warm(self) -> bool:
+        return len(self.closes) >= max(self.SMA_WINDOWS)
+
+    @property
+    def last_date(self) -> Optional[date]:
+        """
+        Date of the last candle the state has seen.
+        """
+        if self.last_timestamp is None:
+            return None
+        return (datetime(1970, 1, 1) + timedelta(seconds=self.last_timestamp)).date()
+
+    def update(self, candle: DataOHLCV) -> bool:
+        """
+        Applies a new candle. Candles at or before the last seen timestamp are ignored.
+        """
+        if self.last_timestamp is not None and candle.timestamp <= self.last_timestamp:
+            return False
+
+        close = float(candle.close)
+        for window in self.SMA_WINDOWS:
+            self.sma_sums[window] += close
+            if len(self.closes) >= window:
+                self.sma_sums[window] -= self.closes[-window]
+        self.closes.append(close)
+
+        for span in self.EMA_SPANS:
+            alpha = 2.0 / (span + 1.0)
+            ema = self.emas[span]
+            self.emas[span] = close if ema is None else (1 - alpha) * ema + alpha * close
+
+        if self.prev_close is not None:
+            delta = close - self.prev_close
+            gain, loss = max(delta, 0.0), max(-delta, 0.0)
+            self.delta_count += 1
+            for period in self.RSI_PERIODS:
+                alpha = 1.0 / period
+                avg_gain, avg_loss = self.avg_gains[period], self.avg_losses[period]
+                self.avg_gains[period] = gain if avg_gain is None else (1 - alpha) * avg_gain + alpha * gain
+                self.avg_losses[period] = loss if avg_loss is None else (1 - alpha) * avg_loss + alpha * loss
+        self.prev_close = close
+
+        self.last_timestamp = candle.timestamp
+        return True
+
+    @property
+    def sma(self) -> SMAResult:
+        values = [
+            self.sma_sums[w] / w if len(self.closes) >= w else float("nan")
+            for w in self.SMA_WINDOWS
+        ]
+        return SMAResult(sma_20=values[0], sma_60=values[1], sma_120=values[2])
+
+    @property
+    def ema(self) -> EMAResult:
+        values = [self.emas[s] if self.emas[s] is not None else float("nan") for s in self.EMA_SPANS]
+        return EMAResult(ema_20=values[0], ema_60=values[1], ema_120=values[2])
+
+    @property
+    def rsi(self) -> RSIResult:
+        values = []
+        for period in self.RSI_PERIODS:
+            avg_gain, avg_loss = self.avg_gains[period], self.avg_losses[period]
+            if self.delta_count < period or avg_gain is None:
+                values.append(0.0)
+            elif avg_loss == 0:
+                values.append(100.0 if avg_gain > 0 else 0.0)
+            else:
+                values.append(100 - (100 / (1 + avg_gain / avg_loss)))
+        return RSIResult(rsi_2=values[0], rsi_7=values[1], rsi_9=values[2], rsi_14=values[3], rsi_50=values[4])
+
+    @property
+    def market_context(self) -> MarketContext:
+        return MarketContext(sma=self.sma, ema=self.ema, rsi=self.rsi)
+
+    def to_dict(self) -> dict:
+        return {
+            "symbol": self.symbol,
+            "interval": self.interval,
+            "last_timestamp": self.last_timestamp,
+            "closes": list(self.closes),
+            "sma_sums": self.sma_sums,
+            "emas": self.emas,
+            "prev_close": self.prev_close,
+            "delta_count": self.delta_count,
+            "avg_gains": self.avg_gains,
+            "avg_losses": self.avg_losses,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "IndicatorState":
+        # JSON turns the integer window keys into strings.
+        return cls(
+            symbol=data["symbol"],
+            interval=data["interval"],
+            last_timestamp=data["last_timestamp"],
+            closes=deque(data["closes"], maxlen=max(cls.SMA_WINDOWS)),
+            sma_sums={int(k): v for k, v in data["sma_sums"].items()},
+            emas={int(k): v for k, v in data["emas"].items()},
+            prev_close=data["prev_close"],
+            delta_count=data["delta_count"],
+            avg_gains={int(k): v for k, v in data["avg_gains"].items()},
+            avg_losses={int(k): v for k, v in data["avg_losses"].items()},
+        )
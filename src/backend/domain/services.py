@@ -1,7 +1,15 @@
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
-from src.backend.domain.value_objects import SMAResult, EMAResult, RSIResult
+from src.backend.domain.reference_data import TradingStrategy
+from src.backend.domain.specifications import TradingCondition
+from src.backend.domain.value_objects import (
+    SMAResult, EMAResult, RSIResult, IndicatorPanel, CandleMatrix, ExitRule, BacktestResult
+)
+
+_MOVING_AVERAGE_WINDOWS = (20, 60, 120)
+_RSI_PERIODS = (2, 7, 9, 14, 50)
 
 
 class IndicatorService:
@@ -91,3 +99,255 @@ class IndicatorService:
             rsi_14=rsi_data[3],
             rsi_50=rsi_data[4],
         )
+
+    @staticmethod
+    def get_indicator_panel(prices: pd.DataFrame, full_history: bool = False) -> IndicatorPanel:
+        """
+        Calculates SMA, EMA and RSI for every symbol of a wide close-price matrix at once.
+        Each symbol is computed over its own candles only, so dates on which it did not trade
+        (other markets' calendars, halts) are skipped, and the results are identical to the
+        single-series methods above applied to that symbol's candles.
+
+        Args:
+            prices: Close prices, one row per date (ascending) and one column per symbol.
+                NaN marks a date without a candle of that symbol.
+            full_history: Keep a value for every date instead of only the latest one.
+                Dates without a candle of the symbol hold NaN (RSI 0).
+
+        Returns:
+            Indicator Panel Value Object.
+        """
+        # Each column's candles are moved to the bottom rows in date order, so consecutive rows
+        # are consecutive candles of that symbol and the last row is its latest candle
+        raw = prices.to_numpy(dtype=np.float64)
+        order = _observed_order(raw)
+        values = np.take_along_axis(raw, order, axis=0)
+
+        sma = [_rolling_mean(values, window) for window in _MOVING_AVERAGE_WINDOWS]
+
+        delta = np.full_like(values, np.nan)
+        delta[1:] = values[1:] - values[:-1]
+        gain = np.where(delta > 0, delta, np.where(np.isnan(delta), np.nan, 0.0))
+        loss = np.where(delta < 0, -delta, np.where(np.isnan(delta), np.nan, 0.0))
+
+        # Every EMA and both RSI averages share one recursive pass over the dates.
+        stacked = np.stack(
+            [values] * len(_MOVING_AVERAGE_WINDOWS) + [gain] * len(_RSI_PERIODS) + [loss] * len(_RSI_PERIODS)
+        )
+        alphas = [2.0 / (span + 1.0) for span in _MOVING_AVERAGE_WINDOWS] + [1.0 / period for period in _RSI_PERIODS] * 2
+        min_periods = [1] * len(_MOVING_AVERAGE_WINDOWS) + list(_RSI_PERIODS) * 2
+        averages = _exponential_mean(stacked, np.array(alphas), np.array(min_periods))
+
+        n_ema = len(_MOVING_AVERAGE_WINDOWS)
+        n_rsi = len(_RSI_PERIODS)
+        ema = averages[:n_ema]
+        avg_gain = averages[n_ema:n_ema + n_rsi]
+        avg_loss = averages[n_ema + n_rsi:]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+        rsi = np.nan_to_num(rsi, nan=0.0, posinf=100.0)
+
+        if full_history:
+            sma = [_restore_order(line, order) for line in sma]
+            ema = np.stack([_restore_order(line, order) for line in ema])
+            rsi = np.stack([_restore_order(line, order) for line in rsi])
+        else:
+            sma = [line[-1] for line in sma]
+            ema = ema[:, -1]
+            rsi = rsi[:, -1]
+
+        return IndicatorPanel(
+            symbols=tuple(str(c) for c in prices.columns),
+            sma_20=sma[0],
+            sma_60=sma[1],
+            sma_120=sma[2],
+            ema_20=ema[0],
+            ema_60=ema[1],
+            ema_120=ema[2],
+            rsi_2=rsi[0],
+            rsi_7=rsi[1],
+            rsi_9=rsi[2],
+            rsi_14=rsi[3],
+            rsi_50=rsi[4],
+        )
+
+
+class BacktestEngine:
+    """
+    Pure Domain Service.
+    Replays trading rules over a CandleMatrix without any per-bar Python loop.
+
+    Indicators and the outcome of a trade entered on every bar are computed once,
+    so each rule only costs one mask evaluation. A trade is entered at the close of
+    the bar on which the rule starts to hold, and exits on the first later bar whose
+    high/low reaches the take profit or stop loss (stop loss first if both are touched),
+    or at the close after max_holding_bars, or at the last close when the history ends first.
+    Bars before the 120-bar SMA is available never open a trade.
+    Symbols may trade on different calendars: indicators, rule transitions and holding
+    windows follow each symbol's own candles, and dates without a candle of the symbol
+    never open a trade.
+    """
+
+    def __init__(self, candles: CandleMatrix, exit_rule: ExitRule):
+        self.candles = candles
+        self.exit_rule = exit_rule
+        self._observed = ~np.isnan(candles.close)
+        self._order = _observed_order(candles.close)
+
+        close_prices = pd.DataFrame(candles.close, columns=list(candles.symbols))
+        self.panel = IndicatorService.get_indicator_panel(close_prices, full_history=True)
+        self.trade_returns, self.exit_bars = _simulate_exits(candles, exit_rule)
+
+    def run(self, rule: TradingCondition) -> BacktestResult:
+        signals = rule.satisfied_mask(self.panel) & self._observed
+
+        # The rule starts to hold when it did not on the symbol's previous candle,
+        # which is not the previous row after a date the symbol skipped
+        aligned = np.take_along_axis(signals, self._order, axis=0)
+        starts = aligned.copy()
+        starts[1:] &= ~aligned[:-1]
+        entries = _restore_order(starts, self._order)
+        # Skip bars before every indicator has enough history (RSI reads 0 there)
+        entries &= ~np.isnan(self.panel.sma_120) & ~np.isnan(self.trade_returns)
+
+        bars, symbols = np.nonzero(entries)
+        returns = self.trade_returns[bars, symbols]
+        exit_bars = self.exit_bars[bars, symbols]
+        return _summarize(returns[np.argsort(exit_bars, kind="stable")])
+
+
+def _simulate_exits(candles: CandleMatrix, exit_rule: ExitRule):
+    """
+    Return and exit row of a trade entered at the close of every (bar, symbol).
+    The holding window counts the symbol's own candles, so dates it skipped neither shorten
+    the window nor leave the time exit without a price. A trade whose window runs past the
+    history exits at the close of the symbol's last candle; entries on that candle and dates
+    without a candle are NaN.
+    """
+    order = _observed_order(candles.close)
+    close, high, low = (np.take_along_axis(prices, order, axis=0) for prices in (candles.close, candles.high, candles.low))
+    horizon = exit_rule.max_holding_bars
+    take_profit, stop_loss = exit_rule.take_profit_pct, exit_rule.stop_loss_pct
+
+    # Observed candles sit at the bottom of each column, so the last row is every symbol's last candle
+    n_bars = close.shape[0]
+    rows = np.arange(n_bars)[:, np.newaxis]
+    remaining = np.minimum(n_bars - 1 - rows, horizon)
+    exit_close = close[np.minimum(rows + horizon, n_bars - 1).ravel()]
+
+    # (bars x symbols x horizon) views of the candles following each entry, NaN past the history
+    padding = np.full((horizon, close.shape[1]), np.nan)
+    entry = close[:, :, np.newaxis]
+    future_high = sliding_window_view(np.vstack([high[1:], padding]), horizon, axis=0)[:n_bars]
+    future_low = sliding_window_view(np.vstack([low[1:], padding]), horizon, axis=0)[:n_bars]
+
+    with np.errstate(invalid="ignore"):
+        if exit_rule.action == TradingStrategy.LONG:
+            target_hit = future_high >= entry * (1 + take_profit)
+            stop_hit = future_low <= entry * (1 - stop_loss)
+            time_exit = exit_close / close - 1
+        else:
+            target_hit = future_low <= entry * (1 - take_profit)
+            stop_hit = future_high >= entry * (1 + stop_loss)
+            time_exit = 1 - exit_close / close
+
+    first_target = np.where(target_hit.any(axis=-1), target_hit.argmax(axis=-1), horizon)
+    first_stop = np.where(stop_hit.any(axis=-1), stop_hit.argmax(axis=-1), horizon)
+
+    stopped = first_stop <= first_target
+    returns = np.where(
+        stopped,
+        np.where(first_stop < horizon, -stop_loss, time_exit),
+        take_profit,
+    )
+    returns[(remaining == 0) | np.isnan(close)] = np.nan
+    offsets = np.minimum(np.minimum(first_stop, first_target) + 1, remaining)
+    exit_bars = np.take_along_axis(order, rows + offsets, axis=0)
+    return _restore_order(returns, order), _restore_order(exit_bars, order)
+
+
+def _summarize(returns: np.ndarray) -> BacktestResult:
+    """
+    Aggregates per-trade returns ordered by exit time.
+    """
+    if returns.size == 0:
+        return BacktestResult(trades=0, hit_rate=0.0, average_return=0.0, total_return=0.0, max_drawdown=0.0)
+
+    equity = np.cumsum(returns)
+    peaks = np.maximum.accumulate(np.concatenate([[0.0], equity]))[1:]
+    return BacktestResult(
+        trades=int(returns.size),
+        hit_rate=float(np.mean(returns > 0)),
+        average_return=float(np.mean(returns)),
+        total_return=float(equity[-1]),
+        max_drawdown=float(np.max(peaks - equity)),
+    )
+
+
+def _observed_order(values: np.ndarray) -> np.ndarray:
+    """
+    Per column, the row order that puts the NaN rows first and the observed rows after them,
+    each group keeping its original order.
+    """
+    return np.argsort(~np.isnan(values), axis=0, kind="stable")
+
+
+def _restore_order(aligned: np.ndarray, order: np.ndarray) -> np.ndarray:
+    """
+    Inverse of np.take_along_axis(values, order, axis=0).
+    """
+    restored = np.empty_like(aligned)
+    np.put_along_axis(restored, order, aligned, axis=0)
+    return restored
+
+
+def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Column-wise equivalent of `Series.rolling(window).mean()` on a (dates x symbols) array.
+    """
+    result = np.full(values.shape, np.nan)
+    if values.shape[0] < window:
+        return result
+
+    missing = np.isnan(values)
+    padding = np.zeros((1, values.shape[1]))
+    sums = np.concatenate([padding, np.cumsum(np.where(missing, 0.0, values), axis=0)])
+    gaps = np.concatenate([padding, np.cumsum(missing, axis=0)])
+
+    window_sums = sums[window:] - sums[:-window]
+    window_gaps = gaps[window:] - gaps[:-window]
+    result[window - 1:] = np.where(window_gaps == 0, window_sums / window, np.nan)
+    return result
+
+
+def _exponential_mean(values: np.ndarray, alphas: np.ndarray, min_periods: np.ndarray) -> np.ndarray:
+    """
+    Equivalent of `Series.ewm(alpha=..., adjust=False, min_periods=...).mean()` applied to
+    a stack of (dates x symbols) arrays, one alpha and min_periods per stacked array.
+    The recursion runs once per date; each step is vectorized over every array and symbol.
+    """
+    alphas = alphas.reshape(-1, 1)
+    min_periods = min_periods.reshape(-1, 1)
+    decay = 1.0 - alphas
+
+    result = np.empty(values.shape)
+    weighted = values[:, 0].copy()
+    observations = (~np.isnan(weighted)).astype(np.int64)
+    old_weight = np.ones(weighted.shape)
+    result[:, 0] = np.where(observations >= min_periods, weighted, np.nan)
+
+    for i in range(1, values.shape[1]):
+        current = values[:, i]
+        observed = ~np.isnan(current)
+        observations += observed
+
+        started = ~np.isnan(weighted)
+        old_weight = np.where(started, old_weight * decay, old_weight)
+        update = started & observed
+        blended = (old_weight * weighted + alphas * current) / (old_weight + alphas)
+        weighted = np.where(update & (weighted != current), blended, weighted)
+        old_weight = np.where(update, 1.0, old_weight)
+        weighted = np.where(~started & observed, current, weighted)
+
+        result[:, i] = np.where(observations >= min_periods, weighted, np.nan)
+    return result
@@ -1,4 +1,6 @@
-from src.backend.domain.value_objects import MarketContext
+import numpy as np
+
+from src.backend.domain.value_objects import MarketContext, IndicatorPanel, StrategyConfig
 from abc import ABC, abstractmethod
 
 
@@ -7,6 +9,13 @@ class TradingCondition(ABC):
     def is_satisfied_by(self, context: MarketContext) -> bool:
         ...
 
+    @abstractmethod
+    def satisfied_mask(self, panel: IndicatorPanel) -> np.ndarray:
+        """
+        Vectorized is_satisfied_by: evaluates every cell of the panel at once.
+        """
+        ...
+
     def and_(self, other: "TradingCondition") -> "TradingCondition":
         return AndSpecification(self, other)
 
@@ -19,6 +28,9 @@ class TradingCondition(ABC):
     def __or__(self, other):
         return self.or_(other)
 
+    def __invert__(self):
+        return NotSpecification(self)
+
 class AndSpecification(TradingCondition):
     def __init__(self, one: TradingCondition, other: TradingCondition):
         self.one = one
@@ -27,6 +39,9 @@ class AndSpecification(TradingCondition):
     def is_satisfied_by(self, ctx: MarketContext) -> bool:
         return self.one.is_satisfied_by(ctx) and self.other.is_satisfied_by(ctx)
 
+    def satisfied_mask(self, panel: IndicatorPanel) -> np.ndarray:
+        return self.one.satisfied_mask(panel) & self.other.satisfied_mask(panel)
+
 
 class OrSpecification(TradingCondition):
     def __init__(self, one: TradingCondition, other: TradingCondition):
@@ -36,6 +51,20 @@ class OrSpecification(TradingCondition):
     def is_satisfied_by(self, ctx: MarketContext) -> bool:
         return self.one.is_satisfied_by(ctx) or self.other.is_satisfied_by(ctx)
 
+    def satisfied_mask(self, panel: IndicatorPanel) -> np.ndarray:
+        return self.one.satisfied_mask(panel) | self.other.satisfied_mask(panel)
+
+
+class NotSpecification(TradingCondition):
+    def __init__(self, one: TradingCondition):
+        self.one = one
+
+    def is_satisfied_by(self, ctx: MarketContext) -> bool:
+        return not self.one.is_satisfied_by(ctx)
+
+    def satisfied_mask(self, panel: IndicatorPanel) -> np.ndarray:
+        return ~self.one.satisfied_mask(panel)
+
 
 class TrendAndPerfectOrderSpec(TradingCondition):
     def is_satisfied_by(self, ctx: MarketContext) -> bool:
@@ -43,6 +72,9 @@ class TrendAndPerfectOrderSpec(TradingCondition):
             return False
         return ctx.sma.is_a_trend_market and ctx.ema.is_perfect_order
 
+    def satisfied_mask(self, panel: IndicatorPanel) -> np.ndarray:
+        return panel.is_a_trend_market & panel.is_perfect_order
+
 
 class RsiFastCrossOverSlowSpec(TradingCondition):
     def is_satisfied_by(self, ctx: MarketContext) -> bool:
@@ -50,29 +82,69 @@ class RsiFastCrossOverSlowSpec(TradingCondition):
             return False
         return ctx.rsi.fast_cross_over_slow
 
+    def satisfied_mask(self, panel: IndicatorPanel) -> np.ndarray:
+        return panel.fast_cross_over_slow
+
 
 class RsiOverSoldSpec(TradingCondition):
+    def __init__(self, config: StrategyConfig = StrategyConfig()):
+        self.config = config
+
     def is_satisfied_by(self, ctx: MarketContext) -> bool:
         if ctx.rsi is None:
             return False
 
-        threshold = 30
+        threshold = self.config.rsi_oversold_limit
         return ctx.rsi.is_rsi_oversold(threshold)
 
+    def satisfied_mask(self, panel: IndicatorPanel) -> np.ndarray:
+        threshold = self.config.rsi_oversold_limit
+        return panel.is_rsi_oversold(threshold)
+
 
 class RsiOverBoughtSpec(TradingCondition):
+    def __init__(self, config: StrategyConfig = StrategyConfig()):
+        self.config = config
+
     def is_satisfied_by(self, ctx: MarketContext) -> bool:
         if ctx.rsi is None:
             return False
 
-        threshold = 70
+        threshold = self.config.rsi_overbought_limit
         return ctx.rsi.is_rsi_overbought(threshold)
 
+    def satisfied_mask(self, panel: IndicatorPanel) -> np.ndarray:
+        threshold = self.config.rsi_overbought_limit
+        return panel.is_rsi_overbought(threshold)
+
 
 class RsiSharpDropSpec(TradingCondition):
+    def __init__(self, config: StrategyConfig = StrategyConfig()):
+        self.config = config
+
     def is_satisfied_by(self, ctx: MarketContext) -> bool:
         if ctx.rsi is None:
             return False
 
-        threshold = 10
+        threshold = self.config.sharp_drop_limit
         return ctx.rsi.has_the_stock_dropped_sharply(threshold)
+
+    def satisfied_mask(self, panel: IndicatorPanel) -> np.ndarray:
+        threshold = self.config.sharp_drop_limit
+        return panel.has_the_stock_dropped_sharply(threshold)
+
+
+def default_screening_rule(config: StrategyConfig = StrategyConfig()) -> TradingCondition:
+    """
+    "Either RSI is oversold OR it's in a perfect uptrend order"
+    """
+    return RsiOverSoldSpec(config) | TrendAndPerfectOrderSpec()
+
+
+def threshold_screening_rule(config: StrategyConfig = StrategyConfig()) -> TradingCondition:
+    """
+    "RSI is oversold, OR a sharp RSI(2) pullback inside a perfect uptrend, unless RSI is already overbought"
+    Reads every StrategyConfig threshold, so each field of a parameter sweep changes the signals.
+    """
+    pullback_in_trend = TrendAndPerfectOrderSpec() & RsiSharpDropSpec(config)
+    return (RsiOverSoldSpec(config) | pullback_in_trend) & ~RsiOverBoughtSpec(config)
@@ -1,7 +1,9 @@
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Tuple, Dict
 
-from src.backend.domain.reference_data import CryptoMarketType
+import numpy as np
+
+from src.backend.domain.reference_data import CryptoMarketType, TradingStrategy
 import re
 
 
@@ -127,6 +129,184 @@ class MarketContext:
     rsi: Optional[RSIResult] = None
 
 
+@dataclass(frozen=True, eq=False)
+class IndicatorPanel:
+    """
+    Columnar indicator values for a whole universe of symbols.
+    The last axis of every array follows `symbols`; an optional leading axis is time.
+    """
+    symbols: Tuple[str, ...]
+    sma_20: np.ndarray
+    sma_60: np.ndarray
+    sma_120: np.ndarray
+    ema_20: np.ndarray
+    ema_60: np.ndarray
+    ema_120: np.ndarray
+    rsi_2: np.ndarray
+    rsi_7: np.ndarray
+    rsi_9: np.ndarray
+    rsi_14: np.ndarray
+    rsi_50: np.ndarray
+
+    def row(self, index: int) -> "IndicatorPanel":
+        """
+        Drops the time axis, keeping only one row of every indicator.
+        """
+        return IndicatorPanel(
+            symbols=self.symbols,
+            **{name: getattr(self, name)[index] for name in self._indicator_fields()}
+        )
+
+    def latest(self) -> "IndicatorPanel":
+        if self.sma_20.ndim == 1:
+            return self
+        return self.row(-1)
+
+    @property
+    def is_perfect_order(self) -> np.ndarray:
+        return (self.ema_20 > self.ema_60) & (self.ema_60 > self.ema_120)
+
+    @property
+    def is_a_trend_market(self) -> np.ndarray:
+        return self.sma_20 > self.sma_120
+
+    @property
+    def fast_cross_over_slow(self) -> np.ndarray:
+        return self.rsi_14 < self.rsi_9
+
+    def is_rsi_oversold(self, threshold) -> np.ndarray:
+        return self.rsi_14 < threshold
+
+    def is_rsi_overbought(self, threshold) -> np.ndarray:
+        return self.rsi_14 > threshold
+
+    def has_the_stock_dropped_sharply(self, threshold) -> np.ndarray:
+        return self.rsi_2 < threshold
+
+    def to_market_contexts(self) -> Dict[str, MarketContext]:
+        """
+        Builds a MarketContext per symbol from the latest row of the panel.
+        """
+        panel = self.latest()
+        contexts = {}
+        for i, symbol in enumerate(panel.symbols):
+            contexts[symbol] = MarketContext(
+                sma=SMAResult(
+                    sma_20=float(panel.sma_20[i]),
+                    sma_60=float(panel.sma_60[i]),
+                    sma_120=float(panel.sma_120[i]),
+                ),
+                ema=EMAResult(
+                    ema_20=float(panel.ema_20[i]),
+                    ema_60=float(panel.ema_60[i]),
+                    ema_120=float(panel.ema_120[i]),
+                ),
+                rsi=RSIResult(
+                    rsi_2=float(panel.rsi_2[i]),
+                    rsi_7=float(panel.rsi_7[i]),
+                    rsi_9=float(panel.rsi_9[i]),
+                    rsi_14=float(panel.rsi_14[i]),
+                    rsi_50=float(panel.rsi_50[i]),
+                ),
+            )
+        return contexts
+
+    @staticmethod
+    def _indicator_fields() -> Tuple[str, ...]:
+        return (
+            "sma_20", "sma_60", "sma_120",
+            "ema_20", "ema_60", "ema_120",
+            "rsi_2", "rsi_7", "rsi_9", "rsi_14", "rsi_50",
+        )
+
+
+@dataclass(frozen=True, eq=False)
+class CandleMatrix:
+    """
+    OHLCV history of many symbols as (dates x symbols) arrays.
+    Dates are ascending; a missing candle is NaN in every array.
+    """
+    dates: np.ndarray
+    symbols: Tuple[str, ...]
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    # Long-format candles: one record per (symbol, candle), symbol as an index into `symbols`
+    COLUMNS_DTYPE = np.dtype([
+        ('symbol', np.int32),
+        ('date', 'datetime64[s]'),
+        ('open', np.float64),
+        ('high', np.float64),
+        ('low', np.float64),
+        ('close', np.float64),
+        ('volume', np.float64),
+    ])
+
+    @classmethod
+    def from_columns(cls, columns: np.ndarray, symbols: Tuple[str, ...]) -> "CandleMatrix":
+        """
+        Pivots long-format records (COLUMNS_DTYPE) into (dates x symbols) arrays.
+        """
+        dates, rows = np.unique(columns['date'], return_inverse=True)
+        shape = (len(dates), len(symbols))
+
+        def _pivot(field: str) -> np.ndarray:
+            matrix = np.full(shape, np.nan)
+            matrix[rows, columns['symbol']] = columns[field]
+            return matrix
+
+        return cls(
+            dates=dates,
+            symbols=tuple(symbols),
+            open=_pivot('open'),
+            high=_pivot('high'),
+            low=_pivot('low'),
+            close=_pivot('close'),
+            volume=_pivot('volume'),
+        )
+
+
+@dataclass(frozen=True)
+class ExitRule:
+    """
+    How a backtested position is closed, relative to its entry price.
+    """
+    take_profit_pct: float
+    stop_loss_pct: float
+    max_holding_bars: int = 20
+    action: TradingStrategy = TradingStrategy.LONG
+
+    def __post_init__(self):
+        if self.take_profit_pct <= 0.0 or self.stop_loss_pct <= 0.0:
+            raise ValueError("Take profit and stop loss must be positive ratios.")
+        if self.max_holding_bars < 1:
+            raise ValueError(f"Max holding bars ({self.max_holding_bars}) must be at least 1.")
+        if self.action == TradingStrategy.CASH_HOLD:
+            raise ValueError("A cash hold strategy has no position to exit.")
+
+
+@dataclass(frozen=True)
+class BacktestResult:
+    """
+    Returns are per trade with a fixed stake, so total_return and max_drawdown
+    are in units of that stake.
+    """
+    trades: int
+    hit_rate: float
+    average_return: float
+    total_return: float
+    max_drawdown: float
+
+
+@dataclass(frozen=True)
+class SweepResult:
+    config: "StrategyConfig"
+    result: BacktestResult
+
+
 @dataclass(frozen=True)
 class StrategyConfig:
     rsi_oversold_limit: float = 30.0
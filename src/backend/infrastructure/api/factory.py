@@ -1,15 +1,27 @@
 from src.backend.application.ports.output import MarketOutputPort
 from src.backend.domain.reference_data import StockMarketType
 from src.backend.infrastructure.api.pykrx_api import PykrxAPI
+from src.backend.infrastructure.db.factory import DatabaseFactory
+from src.backend.infrastructure.db.local_market_api import LocalMarketAPI
+from src.backend.infrastructure.ratelimit.token_bucket import get_rate_limiter
+from src.config.config import settings
 
 
 class MarketAPIFactory:
     @staticmethod
     def get_port(market_type: StockMarketType) -> MarketOutputPort:
         if market_type in [StockMarketType.KOSPI, StockMarketType.KOSDAQ]:
-            return PykrxAPI()
+            return PykrxAPI(get_rate_limiter("pykrx", settings.pykrx_requests_per_second))
         elif market_type in [StockMarketType.NASDAQ, StockMarketType.NYSE]:
             return
             # return YFinanceAPI()
         raise ValueError(f"Unsupported market: {market_type}")
 
+    @staticmethod
+    def get_local_port(market_type: StockMarketType) -> MarketOutputPort:
+        """
+            Reads the local candle store and its archive first and only calls the network for missing history.
+        """
+        return LocalMarketAPI(DatabaseFactory.get_port(), fallback_port=MarketAPIFactory.get_port(market_type),
+                              archive_port=DatabaseFactory.get_archive_port())
+
@@ -1,14 +1,13 @@
-import time
-import random
 import logging
 import datetime
 import pandas as pd
-from typing import List
+from typing import List, Dict, Optional
 
 from pykrx import stock
 from src.backend.application.ports.output import MarketOutputPort
 from src.backend.domain.value_objects import Symbol
 from src.backend.domain.reference_data import Interval, StockMarketType
+from src.backend.infrastructure.ratelimit.token_bucket import AdaptiveRateLimiter, get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -23,47 +22,73 @@ class PykrxAPI(MarketOutputPort):
         Interval.WEEK: 'w',
         Interval.MONTH: 'm'
     }
+    # Calendar days covered by one candle, used when no trading calendar applies
+    _INTERVAL_DAYS = {
+        Interval.DAY: 1,
+        Interval.WEEK: 7,
+        Interval.MONTH: 31
+    }
+
+    # KRX business days per (year, month), shared by every instance in the process
+    _business_days: Dict[tuple, List[datetime.date]] = {}
+
+    # KRX starts blocking clients at a few requests per second
+    DEFAULT_REQUESTS_PER_SECOND = 2.0
+
+    def __init__(self, rate_limiter: Optional[AdaptiveRateLimiter] = None):
+        self._rate_limiter = rate_limiter or get_rate_limiter("pykrx", self.DEFAULT_REQUESTS_PER_SECOND)
 
     def get_candle_history(self, target: Symbol, interval: Interval, count: int = 1) -> pd.DataFrame:
         logger.info(f"Fetching candle history: ticker={target}, interval={interval}, count={count}")
-        freq = self._INTERVAL_MAP.get(interval)
-        if not freq:
-            logger.error(f"Invalid interval '{interval}'")
-            raise ValueError("Pykrx only supports Day, Week, and Month intervals.")
+        freq = self._freq(interval)
 
-        ohlcv_df = pd.DataFrame()
-        to_date = datetime.datetime.now()
-        for _ in range(10):
-            from_date = to_date - datetime.timedelta(days=count + 5)
-            from_str, to_str = from_date.strftime("%Y%m%d"), to_date.strftime("%Y%m%d")
-
-            logger.debug(f"Fetching candle history from {from_str} to {to_str}")
-            result = stock.get_market_ohlcv(
-                from_str,
-                to_str,
-                str(target),
-                freq
-            )
-            ohlcv_df = pd.concat([ohlcv_df, result])
+        to_date = datetime.date.today()
+        from_date = self._window_start(to_date, interval, count)
+        if from_date is not None:
+            # The trading calendar sizes the window exactly, so one request is enough
+            ohlcv_df = self._fetch(target, from_date, to_date, freq)
             if len(ohlcv_df) >= count:
-                break
-            if ohlcv_df.empty and result.empty:
-                logger.error(f"The target is not available symbol: {target}")
+                return self._to_candle_frame(ohlcv_df, target, interval, count)
+
+        return self._get_candle_history_by_scanning(target, interval, count)
+
+    def get_candle_history_since(self, target: Symbol, interval: Interval, since: datetime.date) -> pd.DataFrame:
+        logger.info(f"Syncing candle history: ticker={target}, interval={interval}, since={since}")
+        freq = self._freq(interval)
+
+        from_date, to_date = since + datetime.timedelta(days=1), datetime.date.today()
+        if from_date > to_date:
+            return pd.DataFrame()
+        if interval == Interval.DAY:
+            trading_days = self._trading_days_between(from_date, to_date)
+            if trading_days is not None and not trading_days:
+                logger.debug(f"No trading day after {since}, nothing to fetch for {target}")
                 return pd.DataFrame()
-            to_date = from_date
 
-        ohlcv_df.index.name = 'candle_date_time'
-        df = ohlcv_df.sort_index(ascending=False).head(count).rename(columns=self._ENG_COLUMNS).assign(
-            interval=str(interval),
-            symbol=str(target)
-        )
-        df.reset_index(inplace=True)
-        return df
+        ohlcv_df = self._fetch(target, from_date, to_date, freq)
+        if ohlcv_df.empty:
+            return pd.DataFrame()
+        return self._to_candle_frame(ohlcv_df, target, interval)
+
+    def get_candle_history_between(self, target: Symbol, interval: Interval,
+                                   start_date: datetime.date, end_date: datetime.date) -> pd.DataFrame:
+        logger.info(f"Fetching candle history: ticker={target}, interval={interval}, from={start_date}, to={end_date}")
+        if start_date > end_date:
+            return pd.DataFrame()
+        ohlcv_df = self._fetch(target, start_date, end_date, self._freq(interval))
+        if ohlcv_df.empty:
+            return pd.DataFrame()
+        return self._to_candle_frame(ohlcv_df, target, interval)
+
+    def get_window_start(self, interval: Interval, count: int, until: datetime.date) -> Optional[datetime.date]:
+        # Week and month windows are only estimated from their length in days
+        if interval != Interval.DAY:
+            return None
+        return self._window_start(until, interval, count)
 
     def get_candles_history(self, targets: List[Symbol], interval: Interval, count: int = 1) -> pd.DataFrame:
         results = []
         for target in targets:
-            time.sleep(random.uniform(0.2, 0.7))
             try:
                 df = self.get_candle_history(target, interval, count)
                 if not df.empty:
@@ -76,5 +101,132 @@ class PykrxAPI(MarketOutputPort):
 
         return pd.concat(results, ignore_index=True)
 
+    def get_market_snapshot(self, market_type: StockMarketType, target_date: datetime.date) -> pd.DataFrame:
+        logger.info(f"Fetching market snapshot: market={market_type}, date={target_date}")
+        if market_type not in (StockMarketType.KOSPI, StockMarketType.KOSDAQ):
+            raise ValueError("Pykrx snapshots only support KOSPI and KOSDAQ.")
+
+        trading_days = self._trading_days_between(target_date, target_date)
+        if trading_days is not None and not trading_days:
+            logger.info(f"{target_date} is not a trading day, no snapshot to fetch.")
+            return pd.DataFrame()
+
+        snapshot = self._rate_limiter.call(
+            stock.get_market_ohlcv, target_date.strftime("%Y%m%d"), market=str(market_type)
+        )
+        if snapshot.empty:
+            return pd.DataFrame()
+
+        snapshot.index.name = 'symbol'
+        df = snapshot.rename(columns=self._ENG_COLUMNS).reset_index().assign(
+            candle_date_time=pd.Timestamp(target_date),
+            interval=str(Interval.DAY),
+            market_type=str(market_type)
+        )
+        # Suspended tickers are listed with an all-zero candle
+        return df[df['close_price'] > 0].reset_index(drop=True)
+
     def get_all_symbols(self, market_type: StockMarketType):
-        pass
\ No newline at end of file
+        pass
+
+    def get_symbol_name(self, target: Symbol) -> Optional[str]:
+        try:
+            name = self._rate_limiter.call(stock.get_market_ticker_name, str(target))
+        except Exception as e:
+            logger.warning(f"Failed to get the name of {target}: {e}")
+            return None
+        # Unknown tickers come back as an empty DataFrame instead of a name
+        return name if isinstance(name, str) and name else None
+
+    def _freq(self, interval: Interval) -> str:
+        freq = self._INTERVAL_MAP.get(interval)
+        if not freq:
+            logger.error(f"Invalid interval '{interval}'")
+            raise ValueError("Pykrx only supports Day, Week, and Month intervals.")
+        return freq
+
+    def _fetch(self, target: Symbol, from_date: datetime.date, to_date: datetime.date, freq: str) -> pd.DataFrame:
+        from_str, to_str = from_date.strftime("%Y%m%d"), to_date.strftime("%Y%m%d")
+        logger.debug(f"Fetching candle history from {from_str} to {to_str}")
+        return self._rate_limiter.call(stock.get_market_ohlcv, from_str, to_str, str(target), freq)
+
+    def _get_candle_history_by_scanning(self, target: Symbol, interval: Interval, count: int) -> pd.DataFrame:
+        """
+            Walks backwards in windows until `count` candles are collected.
+            Used only when the trading calendar is unavailable.
+        """
+        freq = self._freq(interval)
+        frames, collected = [], 0
+        to_date = datetime.date.today()
+        for _ in range(10):
+            from_date = to_date - datetime.timedelta(days=(count + 5) * self._INTERVAL_DAYS[interval])
+            result = self._fetch(target, from_date, to_date, freq)
+            if result.empty and not collected:
+                logger.error(f"The target is not available symbol: {target}")
+                return pd.DataFrame()
+            frames.append(result)
+            collected += len(result)
+            if collected >= count:
+                break
+            to_date = from_date - datetime.timedelta(days=1)
+
+        return self._to_candle_frame(pd.concat(frames), target, interval, count)
+
+    def _to_candle_frame(self, ohlcv_df: pd.DataFrame, target: Symbol, interval: Interval,
+                         count: Optional[int] = None) -> pd.DataFrame:
+        ohlcv_df.index.name = 'candle_date_time'
+        df = ohlcv_df[~ohlcv_df.index.duplicated()].sort_index(ascending=False)
+        if count is not None:
+            df = df.head(count)
+        df = df.rename(columns=self._ENG_COLUMNS).assign(
+            interval=str(interval),
+            symbol=str(target)
+        )
+        df.reset_index(inplace=True)
+        return df
+
+    def _window_start(self, to_date: datetime.date, interval: Interval, count: int) -> Optional[datetime.date]:
+        """
+            First date of a window holding exactly `count` candles up to `to_date`.
+        """
+        if interval != Interval.DAY:
+            return to_date - datetime.timedelta(days=count * self._INTERVAL_DAYS[interval])
+
+        trading_days: List[datetime.date] = []
+        year, month = to_date.year, to_date.month
+        # A year of empty months means the calendar is not usable
+        for _ in range(count // 15 + 12):
+            days = self._month_business_days(year, month)
+            if days is None:
+                return None
+            trading_days = [d for d in days if d <= to_date] + trading_days
+            if len(trading_days) >= count:
+                return trading_days[-count]
+            year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+        return trading_days[0] if trading_days else None
+
+    def _trading_days_between(self, from_date: datetime.date, to_date: datetime.date) -> Optional[List[datetime.date]]:
+        trading_days = []
+        year, month = from_date.year, from_date.month
+        while (year, month) <= (to_date.year, to_date.month):
+            days = self._month_business_days(year, month)
+            if days is None:
+                return None
+            trading_days.extend(d for d in days if from_date <= d <= to_date)
+            year, month = (year, month + 1) if month < 12 else (year + 1, 1)
+        return trading_days
+
+    def _month_business_days(self, year: int, month: int) -> Optional[List[datetime.date]]:
+        today = datetime.date.today()
+        # The current month grows every day, so it is cached per day
+        key = (year, month, today) if (year, month) == (today.year, today.month) else (year, month)
+        if key not in self._business_days:
+            try:
+                days = self._rate_limiter.call(stock.get_previous_business_days, year=year, month=month)
+            except Exception as e:
+                logger.warning(f"Failed to load KRX business days for {year}-{month:02d}: {e}")
+                return None
+            if not days:
+                return None
+            self._business_days[key] = [pd.Timestamp(d).date() for d in days]
+        return self._business_days[key]
@@ -0,0 +1,102 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import List, Optional
+
+from bs4 import BeautifulSoup
+from lxml import etree
+
+
+# Text inside these never shows on the page; BeautifulSoup's get_text() leaves it out as well
+_HIDDEN_TAGS = {"script", "style", "template"}
+# BeautifulSoup collapses whitespace-only strings to one newline or space, except inside these
+_PRESERVE_WHITESPACE_TAGS = {"pre", "textarea"}
+_ASCII_SPACES = "\x20\x0a\x09\x0c\x0d"
+
+
+@dataclass(frozen=True)
+class ExtractionRule:
+    """
+        Where the article body of a source lives: the first `tag` whose class list contains `class_name`.
+    """
+    tag: str
+    class_name: str
+
+
+class ContentExtractor(ABC):
+    def __init__(self, rule: ExtractionRule):
+        self.rule = rule
+
+    @abstractmethod
+    def extract(self, html: str) -> Optional[str]:
+        """
+            Stripped text of the rule's container, or None if the page has none.
+        """
+        ...
+
+
+class SoupExtractor(ContentExtractor):
+    """
+        Builds the whole BeautifulSoup tree of the page; kept as the reference implementation.
+    """
+    def extract(self, html: str) -> Optional[str]:
+        soup = BeautifulSoup(html, 'html.parser')
+        element = soup.find(self.rule.tag, class_=self.rule.class_name)
+        return element.text.strip() if element else None
+
+
+class StreamingExtractor(ContentExtractor):
+    """
+        Feeds the page to libxml2's incremental HTML parser in chunks and stops as soon as the
+        container's end tag has been parsed, so the comments, related-article lists and footer
+        after the body are never parsed.
+        The text equals SoupExtractor's except that CR / CRLF line breaks come out as LF, as in a browser.
+    """
+    CHUNK_SIZE = 16 * 1024
+
+    def extract(self, html: str) -> Optional[str]:
+        parser = etree.HTMLPullParser(events=("start", "end"), tag=self.rule.tag)
+        container = None
+        for offset in range(0, len(html), self.CHUNK_SIZE):
+            parser.feed(html[offset:offset + self.CHUNK_SIZE])
+            for event, element in parser.read_events():
+                if container is None and event == "start" and self._matches(element):
+                    container = element
+                elif event == "end" and element is container:
+                    return self._text(container).strip()
+
+        # Unclosed container, or one the parser only emitted when flushed at the end of the page
+        try:
+            parser.close()
+        except etree.XMLSyntaxError:
+            # Raised for pages without any element at all
+            pass
+        for event, element in parser.read_events():
+            if container is None and event == "start" and self._matches(element):
+                container = element
+        return self._text(container).strip() if container is not None else None
+
+    def _matches(self, element) -> bool:
+        return self.rule.class_name in (element.get("class") or "").split()
+
+    @classmethod
+    def _text(cls, element) -> str:
+        parts: List[str] = []
+        cls._collect(element, parts, element.tag in _PRESERVE_WHITESPACE_TAGS)
+        return "".join(parts)
+
+    @classmethod
+    def _collect(cls, element, parts: List[str], preserve: bool):
+        if element.text:
+            parts.append(cls._string(element.text, preserve))
+        for child in element:
+            # Comments have a non-string tag; their text is skipped but what follows them is not
+            if isinstance(child.tag, str) and child.tag not in _HIDDEN_TAGS:
+                cls._collect(child, parts, preserve or child.tag in _PRESERVE_WHITESPACE_TAGS)
+            if child.tail:
+                parts.append(cls._string(child.tail, preserve))
+
+    @staticmethod
+    def _string(text: str, preserve: bool) -> str:
+        if preserve or text.strip(_ASCII_SPACES):
+            return text
+        return "\n" if "\n" in text else " "
@@ -1,12 +1,14 @@
 from src.backend.infrastructure.crawler.news_rss import MKNews, HKNews
+from src.backend.infrastructure.crawler.feed_cache import FeedStateCache
 from src.backend.domain.reference_data import NewsSourceType
+from src.config.config import FEED_STATE_PATH
 
 class NewsCrawlerFactory:
     @staticmethod
     def get_port(source_type: NewsSourceType):
+        feed_cache = FeedStateCache(FEED_STATE_PATH)
         if source_type in [NewsSourceType.MK_STOCK]:
-            return MKNews()
+            return MKNews(feed_cache)
         elif source_type in [NewsSourceType.HK_FINANCE]:
-            return HKNews()
+            return HKNews(feed_cache)
         raise ValueError(f"Unsupported news source: {source_type}")
-
@@ -0,0 +1,55 @@
+import os
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+class FeedStateCache:
+    """
+        ETag / Last-Modified of every polled feed in one JSON file, keyed by feed URL.
+
+        The validators are replayed as If-None-Match / If-Modified-Since, so an unchanged feed
+        answers 304 with an empty body. Writes replace the file atomically; when two processes
+        update it at once one of the updates is lost, which only costs one full download.
+    """
+    def __init__(self, path: Union[str, Path]):
+        self._path = Path(path)
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Dict[str, str]]:
+        if not self._path.exists():
+            return {}
+        try:
+            return json.loads(self._path.read_text(encoding="utf-8"))
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable feed state {self._path}: {e}")
+            return {}
+
+    def request_headers(self, url: str) -> Dict[str, str]:
+        state = self._load().get(url, {})
+        headers = {}
+        if state.get("etag"):
+            headers["If-None-Match"] = state["etag"]
+        if state.get("last_modified"):
+            headers["If-Modified-Since"] = state["last_modified"]
+        return headers
+
+    def update(self, url: str, etag: Optional[str], last_modified: Optional[str]):
+        """
+            Records the validators of a feed whose items have all been processed.
+        """
+        with self._lock:
+            states = self._load()
+            if etag or last_modified:
+                states[url] = {"etag": etag, "last_modified": last_modified}
+            elif states.pop(url, None) is None:
+                return
+
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self._path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(states, indent=2), encoding="utf-8")
+            os.replace(tmp, self._path)
@@ -1,83 +1,280 @@
+import asyncio
 import logging
+import aiohttp
 import requests
 import xml.etree.ElementTree as ET
 import hashlib
 from datetime import datetime
 from email.utils import parsedate_to_datetime
-from typing import List, Optional
-from bs4 import BeautifulSoup
+from typing import AsyncIterator, Callable, List, Optional, Set, Tuple
 
 from src.backend.domain.entities import News
 from src.backend.infrastructure.crawler.util import RSS_URLS
+from src.backend.infrastructure.crawler.feed_cache import FeedStateCache
+from src.backend.infrastructure.crawler.extractor import ContentExtractor, ExtractionRule, StreamingExtractor
 from src.backend.application.ports.output import NewsCrawlerOutputPort
 from src.backend.domain.reference_data import NewsSourceType
 
 logger = logging.getLogger(__name__)
 
+# Given the ids of a feed's items, returns those already stored
+KnownIds = Callable[[List[str]], Set[str]]
+
+
+def news_id(link: str) -> str:
+    return hashlib.md5(link.encode()).hexdigest()
+
+
+class _NewsChannel:
+    """
+        Hands news from the crawl to its consumer, holding at most `size` of them including
+        the ones still downloading: a slot is reserved before an article body is fetched and
+        given back when the consumer takes the item.
+    """
+    def __init__(self, size: int):
+        self._slots = asyncio.Semaphore(size)
+        self._queue: asyncio.Queue = asyncio.Queue()
+
+    async def reserve(self):
+        await self._slots.acquire()
+
+    def cancel_reservation(self):
+        self._slots.release()
+
+    def put(self, news: News):
+        self._queue.put_nowait(news)
+
+    def close(self):
+        self._queue.put_nowait(None)
+
+    async def get(self) -> Optional[News]:
+        """
+            The next news item, or None once the crawl is over.
+        """
+        news = await self._queue.get()
+        if news is not None:
+            self._slots.release()
+        return news
+
 
 class BaseRSSCrawler(NewsCrawlerOutputPort):
-    def __init__(self, source_type: NewsSourceType, content_class: str):
+    FEED_TIMEOUT = 10
+    ARTICLE_TIMEOUT = 5
+    # Concurrent connections to one publisher; feeds and articles of a source share a host
+    PER_HOST_LIMIT = 8
+    # News downloading or waiting for the consumer; the crawl pauses while this many are pending
+    QUEUE_SIZE = 32
+
+    def __init__(self, source_type: NewsSourceType, content_class: str, feed_cache: Optional[FeedStateCache] = None,
+                 extractor: Optional[ContentExtractor] = None):
         self.source_type = source_type
         self.content_class = content_class
+        self.feed_cache = feed_cache
+        self.extractor = extractor or StreamingExtractor(ExtractionRule("div", content_class))
         self._rss_urls = RSS_URLS[str(source_type)]
 
-    def fetch_news(self) -> List[News]:
+    def fetch_news(self, known_ids: Optional[KnownIds] = None) -> List[News]:
         all_news = []
         for url in self._rss_urls.values():
             try:
-                batch = self._fetch_single_rss(url)
+                batch = self._fetch_single_rss(url, known_ids)
                 all_news.extend(batch)
             except Exception as e:
                 logger.error(f"Error fetching RSS from {url}: {e}")
         return all_news
 
+    async def fetch_news_async(self, deadline: float = 60, known_ids: Optional[KnownIds] = None) -> List[News]:
+        return [news async for news in self.stream_news(deadline, known_ids)]
+
+    async def stream_news(self, deadline: float = 60, known_ids: Optional[KnownIds] = None) -> AsyncIterator[News]:
+        """
+            Fetches every feed and every article body concurrently over one session and yields
+            each news item as soon as its body arrives.
+
+            At most QUEUE_SIZE items are downloading or waiting to be consumed, so a slow consumer
+            pauses the crawl instead of letting finished items pile up in memory.
+            Articles still in flight when `deadline` seconds have passed are cancelled and left
+            out, as are articles whose body could not be fetched, so the next run collects them
+            instead of storing them without a body.
+            Items whose id `known_ids` reports as stored are skipped before their body is fetched.
+        """
+        channel = _NewsChannel(self.QUEUE_SIZE)
+        connector = aiohttp.TCPConnector(limit_per_host=self.PER_HOST_LIMIT)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            tasks = [
+                asyncio.create_task(self._fetch_single_rss_async(session, url, channel, known_ids))
+                for url in self._rss_urls.values()
+            ]
+
+            async def supervise():
+                pending = set()
+                if tasks:
+                    _, pending = await asyncio.wait(tasks, timeout=deadline)
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                if pending:
+                    logger.warning(f"{len(pending)} {self.source_type} feeds did not finish within {deadline}s.")
+                channel.close()
+
+            supervisor = asyncio.create_task(supervise())
+            try:
+                while (news := await channel.get()) is not None:
+                    yield news
+            finally:
+                # Stops the crawl when the consumer leaves early; after a full crawl nothing is left running
+                for task in (supervisor, *tasks):
+                    task.cancel()
+                await asyncio.gather(supervisor, *tasks, return_exceptions=True)
+
     def _crawl_article(self, url: str) -> Optional[str]:
         try:
-            response = requests.get(url, timeout=5)
+            response = requests.get(url, timeout=self.ARTICLE_TIMEOUT)
             response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-            element = soup.find("div", class_=self.content_class)
-            return element.text.strip() if element else None
+            return self._extract_content(response.text)
+        except Exception as e:
+            logger.warning(f"Failed to crawl content from {url}: {e}")
+            return None
+
+    async def _crawl_article_async(self, session: aiohttp.ClientSession, url: str) -> Optional[str]:
+        try:
+            timeout = aiohttp.ClientTimeout(total=self.ARTICLE_TIMEOUT)
+            async with session.get(url, timeout=timeout) as response:
+                response.raise_for_status()
+                text = await response.text()
+            return self._extract_content(text)
         except Exception as e:
             logger.warning(f"Failed to crawl content from {url}: {e}")
             return None
 
-    def _fetch_single_rss(self, url: str) -> List[News]:
+    def _extract_content(self, html: str) -> Optional[str]:
+        return self.extractor.extract(html)
+
+    def _fetch_single_rss(self, url: str, known_ids: Optional[KnownIds] = None) -> List[News]:
         news_list = []
         try:
-            response = requests.get(url, timeout=10)
+            if self.feed_cache is None:
+                response = requests.get(url, timeout=self.FEED_TIMEOUT)
+            else:
+                response = requests.get(url, timeout=self.FEED_TIMEOUT, headers=self.feed_cache.request_headers(url))
+            if response.status_code == 304:
+                logger.debug(f"RSS {url} not modified.")
+                return []
             if response.status_code != 200:
                 return []
 
-            root = ET.fromstring(response.content)
-            for item in root.findall('./channel/item'):
-                try:
-                    pub_date = parsedate_to_datetime(item.find('pubDate').text)
-                    if datetime.now().date() != pub_date.date():
-                        continue
-
-                    link = item.find('link').text
-                    news = News(
-                        id=hashlib.md5(link.encode()).hexdigest(),
-                        title=item.find('title').text,
-                        content=self._crawl_article(link),
-                        published_at=pub_date,
-                        source=str(self.source_type),
-                        url=link
-                    )
-                    news_list.append(news)
-                except Exception as parse_e:
-                    logger.error(f"Error parsing item in {url}: {parse_e}")
+            items = self._parse_feed(url, response.content)
+            if known_ids is not None:
+                items = self._drop_known(items, known_ids(self._item_ids(items)))
+
+            complete = True
+            for link, title, pub_date in items:
+                body = self._crawl_article(link)
+                # Left out so the next run fetches it again instead of knowing it without a body
+                if body is None:
+                    complete = False
+                    continue
+                news_list.append(self._to_news(link, title, pub_date, body))
+            if complete:
+                self._remember_feed(url, response.headers)
         except Exception as e:
             logger.error(f"Error fetching RSS {url}: {e}")
         return news_list
 
+    async def _fetch_single_rss_async(self, session: aiohttp.ClientSession, url: str, channel: _NewsChannel,
+                                      known_ids: Optional[KnownIds] = None):
+        """
+            Puts the news of one feed on `channel` as soon as each article body arrives.
+            The feed's validators are stored only after every item got its body, so a feed cut
+            off by the deadline or with a failed article is downloaded again instead of answering 304.
+        """
+        try:
+            timeout = aiohttp.ClientTimeout(total=self.FEED_TIMEOUT)
+            headers = self.feed_cache.request_headers(url) if self.feed_cache is not None else None
+            async with session.get(url, timeout=timeout, headers=headers) as response:
+                if response.status == 304:
+                    logger.debug(f"RSS {url} not modified.")
+                    return
+                if response.status != 200:
+                    return
+                content = await response.read()
+                response_headers = response.headers
+        except Exception as e:
+            logger.error(f"Error fetching RSS {url}: {e}")
+            return
+
+        items = self._parse_feed(url, content)
+        if known_ids is not None:
+            known = await asyncio.to_thread(known_ids, self._item_ids(items))
+            items = self._drop_known(items, known)
+
+        async def crawl(link: str, title: str, pub_date: datetime) -> bool:
+            await channel.reserve()
+            try:
+                body = await self._crawl_article_async(session, link)
+            except BaseException:
+                channel.cancel_reservation()
+                raise
+            if body is None:
+                channel.cancel_reservation()
+                return False
+            channel.put(self._to_news(link, title, pub_date, body))
+            return True
+
+        crawled = await asyncio.gather(*(crawl(*item) for item in items))
+        if all(crawled):
+            self._remember_feed(url, response_headers)
+
+    def _remember_feed(self, url: str, headers):
+        if self.feed_cache is not None:
+            self.feed_cache.update(url, headers.get("ETag"), headers.get("Last-Modified"))
+
+    def _parse_feed(self, url: str, content: bytes) -> List[Tuple[str, str, datetime]]:
+        """
+            (link, title, published_at) of today's items in an RSS document.
+        """
+        items = []
+        try:
+            root = ET.fromstring(content)
+        except Exception as e:
+            logger.error(f"Error fetching RSS {url}: {e}")
+            return items
+
+        for item in root.findall('./channel/item'):
+            try:
+                pub_date = parsedate_to_datetime(item.find('pubDate').text)
+                if datetime.now().date() != pub_date.date():
+                    continue
+
+                items.append((item.find('link').text, item.find('title').text, pub_date))
+            except Exception as parse_e:
+                logger.error(f"Error parsing item in {url}: {parse_e}")
+        return items
+
+    @staticmethod
+    def _item_ids(items: List[Tuple[str, str, datetime]]) -> List[str]:
+        return [news_id(link) for link, _, _ in items]
+
+    @staticmethod
+    def _drop_known(items: List[Tuple[str, str, datetime]], known: Set[str]) -> List[Tuple[str, str, datetime]]:
+        return [item for item in items if news_id(item[0]) not in known]
+
+    def _to_news(self, link: str, title: str, pub_date: datetime, content: Optional[str]) -> News:
+        return News(
+            id=news_id(link),
+            title=title,
+            content=content,
+            published_at=pub_date,
+            source=str(self.source_type),
+            url=link
+        )
+
 
 class MKNews(BaseRSSCrawler):
-    def __init__(self):
-        super().__init__(NewsSourceType.MK_STOCK, "news_cnt_detail_wrap")
+    def __init__(self, feed_cache: Optional[FeedStateCache] = None):
+        super().__init__(NewsSourceType.MK_STOCK, "news_cnt_detail_wrap", feed_cache)
 
 
 class HKNews(BaseRSSCrawler):
-    def __init__(self):
-        super().__init__(NewsSourceType.HK_FINANCE, "article-body")
\ No newline at end of file
+    def __init__(self, feed_cache: Optional[FeedStateCache] = None):
+        super().__init__(NewsSourceType.HK_FINANCE, "article-body", feed_cache)
@@ -7,11 +7,18 @@ import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta
 from bs4 import BeautifulSoup
 
+from src.backend.infrastructure.ratelimit.token_bucket import ThrottledError, get_rate_limiter, raise_for_throttle
+
 
 class OpenDartAPI:
-    def __init__(self, openapi_key=None):
+    DEFAULT_REQUESTS_PER_SECOND = 5.0
+    # DART reports an exceeded quota as status "020" inside a 200 response
+    RATE_LIMITED_STATUS = "020"
+
+    def __init__(self, openapi_key=None, rate_limiter=None):
         self._openapi_key = openapi_key
         self._base_url = "https://opendart.fss.or.kr/api"
+        self._rate_limiter = rate_limiter or get_rate_limiter("open_dart", self.DEFAULT_REQUESTS_PER_SECOND)
 
         with open("./corp_codes.json", "r", encoding="utf-8") as f:
             self._corp_code_dict = json.loads(f.read())
@@ -30,7 +37,7 @@ class OpenDartAPI:
             "page_count": 100,
         }
 
-        report_list = requests.get(self._base_url + "/list.json", params=params).json()
+        report_list = self._get("/list.json", params).json()
         latest_report = report_list["list"][0]
         report_nm = latest_report["report_nm"]
 
@@ -60,9 +67,7 @@ class OpenDartAPI:
             # "fs_div": "CFS",
         }
         try:
-            finance_rpt = requests.get(
-                self._base_url + "/fnlttSinglAcnt.json", params=finance_rpt_code
-            )
+            finance_rpt = self._get("/fnlttSinglAcnt.json", finance_rpt_code)
 
             finance_rpt.raise_for_status()
             data = finance_rpt.json()
@@ -76,6 +81,18 @@ class OpenDartAPI:
             print(f"failed to get financial data for {report_code}: {e}")
             return []
 
+    def _get(self, path, params):
+        return self._rate_limiter.call(self._checked_get, self._base_url + path, params)
+
+    def _checked_get(self, url, params):
+        # Checked inside the limiter's call: a throttling status, an HTML block page that fails to
+        # parse or status "020" raise there and are recorded once, as a throttle
+        response = requests.get(url, params=params, timeout=10)
+        raise_for_throttle(response)
+        if response.ok and response.json().get("status") == self.RATE_LIMITED_STATUS:
+            raise ThrottledError(f"DART quota exceeded for {url}", response=response)
+        return response
+
     def processing_financial_data(self, stock_code: str, financial_data_list: list):
         cfs, ofs = dict(), dict()
 
@@ -117,7 +134,7 @@ class OpenDartAPI:
             "reprt_code": report_code,
         }
         try:
-            raw = requests.get(self._base_url + "/alotMatter.json", params=finance_rpt_code)
+            raw = self._get("/alotMatter.json", finance_rpt_code)
             raw.raise_for_status()
             data = raw.json()
             if data.get('status') == '000':
@@ -0,0 +1,210 @@
+import os
+import json
+import datetime
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from src.backend.application.ports.output import CandleArchiveOutputPort, CandleHistoryOutputPort
+from src.backend.domain.reference_data import Interval
+from src.backend.domain.value_objects import CandleMatrix
+
+logger = logging.getLogger(__name__)
+
+
+def archive_dtype(symbol_length: int) -> np.dtype:
+    """
+        One archived candle; partitions are sorted by (symbol, date).
+        The symbol field of each partition is as wide as its longest symbol.
+    """
+    return np.dtype([
+        ('symbol', f'U{max(symbol_length, 1)}'),
+        ('date', 'datetime64[s]'),
+        ('open', np.float64),
+        ('high', np.float64),
+        ('low', np.float64),
+        ('close', np.float64),
+        ('volume', np.float64),
+    ])
+
+_PRICE_FIELDS = {
+    'open': 'open_price',
+    'high': 'high_price',
+    'low': 'low_price',
+    'close': 'close_price',
+    'volume': 'volume',
+}
+
+
+def _month_end(year: int, month: int) -> datetime.date:
+    return datetime.date(year + month // 12, month % 12 + 1, 1) - datetime.timedelta(days=1)
+
+
+class NumpyCandleArchive(CandleArchiveOutputPort):
+    """
+        Closed months of candles as .npy files, one per market/interval/month:
+
+            {root}/{market_type}/{interval}/{year}/{year}-{month}.npy
+
+        Partitions are written once and read through np.load(mmap_mode='r'): a research query
+        skips the months outside its range, copies only the matching rows out of the mapped
+        files and never takes a database lock.
+        manifest.json records the partitions of each interval and how far the archive reaches.
+    """
+    MANIFEST = "manifest.json"
+
+    def __init__(self, root: Union[str, Path]):
+        self._root = Path(root)
+        self._lock = threading.Lock()
+
+    def _load_manifest(self) -> Dict:
+        path = self._root / self.MANIFEST
+        if not path.exists():
+            return {}
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def _save_manifest(self, manifest: Dict):
+        path = self._root / self.MANIFEST
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def archived_until(self, interval: Interval) -> Optional[datetime.date]:
+        until = self._load_manifest().get(str(interval), {}).get("archived_until")
+        return datetime.date.fromisoformat(until) if until else None
+
+    def put_month(self, interval: Interval, year: int, month: int, data: pd.DataFrame):
+        """
+            Archives one month for every market in `data`. Months must be archived oldest first.
+        """
+        partitions = []
+        markets = data['market_type'].fillna("UNKNOWN") if not data.empty else pd.Series(dtype=str)
+        for market_type, rows in data.groupby(markets):
+            symbols = rows['symbol'].astype(str)
+            records = np.empty(len(rows), dtype=archive_dtype(int(symbols.str.len().max())))
+            records['symbol'] = symbols.to_numpy()
+            records['date'] = pd.to_datetime(rows['candle_date_time']).to_numpy().astype('datetime64[s]')
+            for field, column in _PRICE_FIELDS.items():
+                records[field] = pd.to_numeric(rows[column], errors='coerce').to_numpy(dtype=np.float64)
+            records.sort(order=['symbol', 'date'])
+
+            relative = Path(str(market_type)) / str(interval) / str(year) / f"{year}-{month:02d}.npy"
+            path = self._root / relative
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(path.stem + ".tmp.npy")
+            np.save(tmp, records)
+            os.replace(tmp, path)
+            partitions.append({"market_type": str(market_type), "year": year, "month": month,
+                               "path": relative.as_posix(), "rows": len(records)})
+
+        with self._lock:
+            self._root.mkdir(parents=True, exist_ok=True)
+            manifest = self._load_manifest()
+            entry = manifest.setdefault(str(interval), {"archived_until": None, "partitions": []})
+            entry["partitions"] = [
+                p for p in entry["partitions"] if (p["year"], p["month"]) != (year, month)
+            ] + partitions
+            entry["archived_until"] = _month_end(year, month).isoformat()
+            self._save_manifest(manifest)
+        logger.info(f"Archived {sum(p['rows'] for p in partitions)} {interval} candles of {year}-{month:02d}.")
+
+    def get_candle_columns(self, symbols: List[str], interval: Interval,
+                           start_date: datetime.date, end_date: datetime.date) -> np.ndarray:
+        start, end = np.datetime64(start_date, 's'), np.datetime64(end_date + datetime.timedelta(days=1), 's')
+        partitions = [
+            p for p in self._partitions(interval)
+            if datetime.date(p["year"], p["month"], 1) <= end_date and _month_end(p["year"], p["month"]) >= start_date
+        ] if symbols else []
+        return self._read_columns(symbols, partitions, lambda records: (records['date'] >= start) & (records['date'] < end))
+
+    def get_recent_candle_columns(self, symbols: List[str], interval: Interval, count: int) -> np.ndarray:
+        """
+            At least the latest `count` archived candles of every symbol that has that many,
+            reading partitions newest month first and stopping once every symbol has enough.
+        """
+        months: Dict[tuple, List[Dict]] = {}
+        for partition in self._partitions(interval):
+            months.setdefault((partition["year"], partition["month"]), []).append(partition)
+
+        parts, found = [], np.zeros(len(symbols), dtype=np.int64)
+        for month in sorted(months, reverse=True):
+            if not symbols or found.min() >= count:
+                break
+            columns = self._read_columns(symbols, months[month])
+            found += np.bincount(columns['symbol'], minlength=len(symbols))
+            parts.append(columns)
+        return np.concatenate(parts) if parts else np.empty(0, dtype=CandleMatrix.COLUMNS_DTYPE)
+
+    def _partitions(self, interval: Interval) -> List[Dict]:
+        return self._load_manifest().get(str(interval), {}).get("partitions", [])
+
+    def _read_columns(self, symbols: List[str], partitions: List[Dict], row_filter=None) -> np.ndarray:
+        """
+            Rows of `symbols` in the given partitions as CandleMatrix.COLUMNS_DTYPE records.
+        """
+        symbols = [str(s) for s in symbols]
+        order = np.argsort(symbols, kind='stable')
+        wanted = np.array(symbols, dtype=str)[order]
+
+        slices, positions = [], []
+        for partition in partitions if symbols else []:
+            records = np.load(self._root / partition["path"], mmap_mode='r')
+            found = np.minimum(np.searchsorted(wanted, records['symbol']), len(wanted) - 1)
+            mask = wanted[found] == records['symbol']
+            if row_filter is not None:
+                mask &= row_filter(records)
+            slices.append(records[mask])
+            positions.append(order[found[mask]].astype(np.int32))
+
+        columns = np.empty(sum(len(s) for s in slices), dtype=CandleMatrix.COLUMNS_DTYPE)
+        if slices:
+            columns['symbol'] = np.concatenate(positions)
+            for field in ('date', *_PRICE_FIELDS):
+                columns[field] = np.concatenate([s[field] for s in slices])
+        return columns
+
+    def get_candle_matrix(self, symbols: List[str], interval: Interval,
+                          start_date: datetime.date, end_date: datetime.date) -> CandleMatrix:
+        columns = self.get_candle_columns(symbols, interval, start_date, end_date)
+        return CandleMatrix.from_columns(columns, tuple(str(s) for s in symbols))
+
+
+class TieredCandleReader(CandleHistoryOutputPort):
+    """
+        Reads candle history from the archive up to its last archived month and
+        from the live database, so callers see one continuous history.
+
+        Candles backfilled into the database after their month was archived stay there;
+        the database is read over the whole range and its rows win over archived ones.
+    """
+    def __init__(self, database_port: CandleHistoryOutputPort, archive_port: CandleArchiveOutputPort):
+        self.database_port = database_port
+        self.archive_port = archive_port
+
+    def get_candle_columns(self, symbols: List[str], interval: Interval,
+                           start_date: datetime.date, end_date: datetime.date) -> np.ndarray:
+        hot = self.database_port.get_candle_columns(symbols, interval, start_date, end_date)
+        archived_until = self.archive_port.archived_until(interval)
+        if archived_until is None or archived_until < start_date:
+            return hot
+
+        cold = self.archive_port.get_candle_columns(symbols, interval, start_date, min(end_date, archived_until))
+        return latest_per_candle(np.concatenate([cold, hot]))
+
+    def get_candle_matrix(self, symbols: List[str], interval: Interval,
+                          start_date: datetime.date, end_date: datetime.date) -> CandleMatrix:
+        columns = self.get_candle_columns(symbols, interval, start_date, end_date)
+        return CandleMatrix.from_columns(columns, tuple(str(s) for s in symbols))
+
+
+def latest_per_candle(columns: np.ndarray) -> np.ndarray:
+    """
+        Drops repeated (symbol, date) records of COLUMNS_DTYPE, keeping the last one.
+    """
+    reversed_columns = columns[::-1]
+    _, first = np.unique(reversed_columns[['symbol', 'date']], return_index=True)
+    return reversed_columns[first]
@@ -0,0 +1,85 @@
+import json
+import time
+import uuid
+from typing import Optional
+
+import pandas as pd
+
+from src.backend.application.ports.output import CandleBufferOutputPort
+
+
+# Deletes the flush lock only while it still holds our token, so an expired lock
+# that another writer has taken over is left alone
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# Drops the flushed rows and forgets when the buffer started filling once it is empty,
+# atomically with respect to pushes from other workers
+_TRIM_SCRIPT = """
+redis.call('LTRIM', KEYS[1], ARGV[1], -1)
+if redis.call('LLEN', KEYS[1]) == 0 then
+    redis.call('DEL', KEYS[2])
+end
+return 0
+"""
+
+
+def _serializable(data: pd.DataFrame) -> pd.DataFrame:
+    return data.astype({'candle_date_time': str})
+
+
+class RedisCandleBuffer(CandleBufferOutputPort):
+    """
+        Buffer in a Redis list, so rows pushed by every Celery worker are flushed by one writer.
+    """
+    def __init__(self, redis_url: str, key: str = "candle_buffer"):
+        try:
+            import redis
+        except ImportError as e:
+            raise ImportError("A shared candle buffer requires the 'redis' package.") from e
+
+        self._client = redis.Redis.from_url(redis_url)
+        self._key = key
+        self._since_key = f"{key}:since"
+        self._lock_key = f"{key}:flush_lock"
+        self._lock_token: Optional[str] = None
+
+    def push(self, data: pd.DataFrame):
+        if data.empty:
+            return
+        rows = [json.dumps(r, ensure_ascii=False) for r in _serializable(data).to_dict(orient='records')]
+        pipe = self._client.pipeline()
+        pipe.rpush(self._key, *rows)
+        pipe.set(self._since_key, time.time(), nx=True)
+        pipe.execute()
+
+    def peek(self, max_rows: int) -> pd.DataFrame:
+        rows = self._client.lrange(self._key, 0, max_rows - 1)
+        return pd.DataFrame([json.loads(r) for r in rows])
+
+    def trim(self, rows: int):
+        # Only the flush lock holder trims and pushes only append, so the head is still the peeked rows
+        self._client.eval(_TRIM_SCRIPT, 2, self._key, self._since_key, rows)
+
+    def size(self) -> int:
+        return self._client.llen(self._key)
+
+    def age(self) -> float:
+        since = self._client.get(self._since_key)
+        return time.time() - float(since) if since is not None else 0.0
+
+    def acquire_flush_lock(self, ttl: float) -> bool:
+        token = uuid.uuid4().hex
+        if self._client.set(self._lock_key, token, nx=True, px=int(ttl * 1000)):
+            self._lock_token = token
+            return True
+        return False
+
+    def release_flush_lock(self):
+        if self._lock_token is not None:
+            self._client.eval(_RELEASE_LOCK_SCRIPT, 1, self._lock_key, self._lock_token)
+            self._lock_token = None
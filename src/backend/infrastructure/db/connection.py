@@ -0,0 +1,120 @@
+import os
+import queue
+import atexit
+import sqlite3
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Callable, Dict, Tuple, TypeVar, Union
+
+T = TypeVar("T")
+
+_STOP = object()
+
+
+class SQLiteConnectionManager:
+    """
+        Reuses SQLite connections per process and per thread, and funnels every write
+        through a single writer thread.
+
+        Readers get a thread-local connection that is configured once (WAL, synchronous=NORMAL,
+        mmap, busy timeout) and kept open. Writers submit a function that receives the writer
+        connection; it runs inside BEGIN IMMEDIATE on the writer thread, so writes from one
+        process never compete for the lock. The queue is bounded, so bursts of writers block
+        instead of failing with "database is locked". Other processes are handled by the
+        busy timeout.
+    """
+    MMAP_SIZE = 256 * 1024 * 1024
+    BUSY_TIMEOUT_MS = 30_000
+    WRITE_QUEUE_SIZE = 256
+
+    _managers: Dict[Tuple[int, str], "SQLiteConnectionManager"] = {}
+    _managers_lock = threading.Lock()
+
+    def __init__(self, path: Union[str, Path]):
+        self._path = str(path)
+        self._local = threading.local()
+        self._writes: "queue.Queue" = queue.Queue(maxsize=self.WRITE_QUEUE_SIZE)
+        self._writer = threading.Thread(target=self._write_loop, name=f"sqlite-writer:{self._path}", daemon=True)
+        self._writer.start()
+
+    @classmethod
+    def for_path(cls, path: Union[str, Path]) -> "SQLiteConnectionManager":
+        """
+            Returns the manager of the current process for `path`.
+            Forked workers get their own, because connections and threads don't survive a fork.
+        """
+        key = (os.getpid(), str(path))
+        with cls._managers_lock:
+            if key not in cls._managers:
+                cls._managers[key] = cls(path)
+            return cls._managers[key]
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._path, timeout=self.BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA mmap_size={self.MMAP_SIZE}")
+        conn.execute(f"PRAGMA busy_timeout={self.BUSY_TIMEOUT_MS}")
+        return conn
+
+    def connection(self) -> sqlite3.Connection:
+        """
+            Connection of the calling thread, for reads.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._open()
+        return conn
+
+    def submit(self, work: Callable[[sqlite3.Connection], T]) -> "Future[T]":
+        future: "Future[T]" = Future()
+        self._writes.put((work, future))
+        return future
+
+    def write(self, work: Callable[[sqlite3.Connection], T]) -> T:
+        """
+            Runs `work` in a write transaction on the writer thread and waits for the commit.
+            Exceptions raised by `work` roll the transaction back and are re-raised here.
+            A returned cursor is closed on the writer thread and replaced by its rowcount.
+        """
+        return self.submit(work).result()
+
+    def close(self):
+        with self._managers_lock:
+            self._managers.pop((os.getpid(), self._path), None)
+        if self._writer.is_alive():
+            self._writes.put((_STOP, None))
+            self._writer.join()
+
+    def _write_loop(self):
+        conn = self._open()
+        while True:
+            work, future = self._writes.get()
+            if work is _STOP:
+                conn.close()
+                return
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                result = work(conn)
+                if isinstance(result, sqlite3.Cursor):
+                    # A cursor finalized on another thread races with this connection
+                    rowcount = result.rowcount
+                    result.close()
+                    result = rowcount
+                conn.execute("COMMIT")
+            except BaseException as e:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+
+@atexit.register
+def _close_managers():
+    managers = [m for (pid, _), m in list(SQLiteConnectionManager._managers.items()) if pid == os.getpid()]
+    for manager in managers:
+        manager.close()
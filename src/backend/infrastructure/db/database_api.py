@@ -1,62 +1,82 @@
+import time
 import datetime
-import sqlite3
+import numpy as np
 import pandas as pd
 import json
 import logging
 
-from typing import List, Optional
+from typing import Dict, List, Optional, Set
 from src.backend.application.ports.output import DatabaseOutputPort
-from src.backend.domain.entities import News, MarketAnalysis
+from src.backend.domain.entities import News, MarketAnalysis, IndicatorState, TradeStrategy
+from src.backend.domain.reference_data import Interval
+from src.backend.domain.value_objects import CandleMatrix, DataOHLCV
+from src.backend.infrastructure.db.connection import SQLiteConnectionManager
+from src.backend.infrastructure.db.rows import (
+    CandleColumns, iter_rows, analysis_to_record, analysis_from_record, strategy_to_record, strategy_from_record
+)
 from src.config.config import SQLITE_DB_FOLDER_PATH
 
 
 logger = logging.getLogger(__name__)
 
 
+def _epoch(date: datetime.date) -> int:
+    """
+        Candle times are stored as epoch seconds of their wall-clock time read as UTC.
+    """
+    return int(np.datetime64(date, 's').astype(np.int64))
+
+
 class SQLiteDatabase(DatabaseOutputPort):
     SQLITE_PATH = SQLITE_DB_FOLDER_PATH / "main.db"
+    # News search ranking: title matches count double, relevance halves every 3 days of age
+    TITLE_WEIGHT = 2.0
+    RECENCY_HALF_LIFE_DAYS = 3.0
 
     def _connect(self):
-        conn = sqlite3.connect(self.SQLITE_PATH)
-        cursor = conn.cursor()
-        return conn, cursor
+        """
+            Reused connection of the calling thread. Only for reads; writes go through `_write`.
+        """
+        conn = SQLiteConnectionManager.for_path(self.SQLITE_PATH).connection()
+        return conn, conn.cursor()
+
+    def _write(self, work):
+        return SQLiteConnectionManager.for_path(self.SQLITE_PATH).write(work)
 
     def put_ohlcv_to_database(self, data: pd.DataFrame):
-        if data.empty:
-            return
+        columns = CandleColumns.from_frame(data)
+        if columns is not None:
+            self._put_candle_columns(columns)
 
-        for col in ['candle_date_time', 'symbol', 'market_type', 'interval']:
-            if col in data.columns:
-                data[col] = data[col].astype(str)
+    def put_candles(self, symbol: str, interval: Interval, candles: List[DataOHLCV],
+                    market_type: Optional[str] = None):
+        if candles:
+            self._put_candle_columns(CandleColumns.from_candles(symbol, interval, candles, market_type))
 
-        db_columns = [
-            'symbol', 'market_type', 'interval', 'candle_date_time',
-            'open_price', 'high_price', 'low_price', 'close_price', 'volume'
-        ]
-        # Select only columns present in the DataFrame
-        columns_to_insert = [c for c in db_columns if c in data.columns]
+    def _put_candle_columns(self, columns: CandleColumns):
+        # Symbol ids are resolved once per distinct symbol, so the candle rows are plain
+        # numbers bound straight from the column arrays
+        codes, symbols = pd.factorize(columns.symbol)
+        market_types = columns.market_types()
 
-        if not columns_to_insert:
-            return
+        def _insert(conn):
+            conn.executemany("""
+                INSERT INTO symbols (symbol, market_type) VALUES (?, ?)
+                ON CONFLICT (symbol) DO UPDATE SET market_type = COALESCE(excluded.market_type, market_type)
+            """, market_types.items())
+            ids = dict(conn.execute(
+                "SELECT symbol, symbol_id FROM symbols WHERE symbol IN (SELECT value FROM json_each(?))",
+                (json.dumps(symbols.tolist()),)
+            ).fetchall())
+            symbol_ids = np.array([ids[s] for s in symbols], dtype=np.int64)[codes]
+            # INSERT OR REPLACE handles the primary key (symbol_id, interval, candle_ts)
+            conn.executemany("""
+                INSERT OR REPLACE INTO candles (
+                    symbol_id, interval, candle_ts, open_price, high_price, low_price, close_price, volume
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, iter_rows(symbol_ids, columns.interval, columns.timestamp, *columns.prices))
 
-        conn, cursor = self._connect()
-        try:
-            placeholders = ', '.join(['?'] * len(columns_to_insert))
-            columns_str = ', '.join(columns_to_insert)
-            
-            # INSERT OR REPLACE handles the Primary Key constraint (stock_code, interval, candle_date_time)
-            sql = f"INSERT OR REPLACE INTO ohlcv_candles ({columns_str}) VALUES ({placeholders})"
-            
-            # Convert DataFrame to list of tuples ensuring column order
-            values = [tuple(x) for x in data[columns_to_insert].to_numpy()]
-            
-            cursor.executemany(sql, values)
-            conn.commit()
-        except Exception as e:
-            print(f"Failed to insert OHLCV data: {e}")
-            conn.rollback()
-        finally:
-            conn.close()
+        self._write(_insert)
 
     def put_news(self, news_list: List[News]):
         """
@@ -65,8 +85,6 @@ class SQLiteDatabase(DatabaseOutputPort):
         if not news_list:
             return
 
-        conn, cursor = self._connect()
-
         try:
             data_to_insert = []
             for n in news_list:
@@ -77,7 +95,9 @@ class SQLiteDatabase(DatabaseOutputPort):
                     n.id,
                     n.title,
                     n.content,
-                    n.published_at,
+                    n.published_at.isoformat(sep=" "),
+                    n.published_at.date().isoformat(),
+                    int(n.published_at.timestamp()),
                     n.source,
                     n.url,
                     stocks_str,
@@ -85,65 +105,334 @@ class SQLiteDatabase(DatabaseOutputPort):
                     n.sentiment_score
                 ))
 
-            cursor.executemany('''
+            self._write(lambda conn: conn.executemany('''
                 INSERT OR IGNORE INTO news (
-                    id, title, content, published_at, source, url, 
+                    id, title, content, published_at, published_date, published_ts, source, url,
                     related_stocks, related_sectors, sentiment_score
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', data_to_insert)
-
-            conn.commit()
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', data_to_insert))
 
         except Exception as e:
             print(f"Failed to insert news: {e}")
-            conn.rollback()
-        finally:
-            conn.close()
 
-    def get_news_by_date(self, target_date: datetime.date) -> Optional[List[News]]:
+    @staticmethod
+    def _row_to_news(row) -> News:
+        return News(
+            id=row[0],
+            title=row[1],
+            content=row[2],
+            published_at=datetime.datetime.fromisoformat(row[3]),
+            source=row[4],
+            url=row[5],
+            related_stocks=json.loads(row[6]),
+            related_sectors=json.loads(row[7]),
+            sentiment_score=row[8]
+        )
+
+    def get_news_by_date(self, target_date: datetime.date, source: Optional[str] = None) -> Optional[List[News]]:
         conn, cursor = self._connect()
-        date_str = target_date.strftime("%Y-%m-%d")
         query = """SELECT id, title, content, published_at, source, url, 
                           related_stocks, related_sectors, sentiment_score 
                    FROM news 
-                   WHERE published_at LIKE ?
+                   WHERE published_date = ?
                 """
+        params = [target_date.strftime("%Y-%m-%d")]
+        if source is not None:
+            query += " AND source = ?"
+            params.append(source)
         try:
-            cursor.execute(query, (f"{date_str}%",))
-            rows = cursor.fetchall()
-            news_list = []
-            for row in rows:
-                news = News(
-                    id=row[0],
-                    title=row[1],
-                    content=row[2],
-                    published_at=row[3],
-                    source=row[4],
-                    url=row[5],
-                    related_stocks=json.loads(row[6]),
-                    related_sectors=json.loads(row[7]),
-                    sentiment_score=row[8]
-                )
-                news_list.append(news)
-            return news_list
+            cursor.execute(query, params)
+            return [self._row_to_news(row) for row in cursor.fetchall()]
 
         except Exception as ex:
             logger.error(f"Failed to get news data: {ex}")
             return []
-        finally:
-            conn.close()
+
+    def get_known_news_ids(self, ids: List[str]) -> Set[str]:
+        if not ids:
+            return set()
+
+        conn, cursor = self._connect()
+        try:
+            cursor.execute("SELECT id FROM news WHERE id IN (SELECT value FROM json_each(?))", (json.dumps(list(ids)),))
+            return {row[0] for row in cursor.fetchall()}
+
+        except Exception as ex:
+            logger.error(f"Failed to get known news ids: {ex}")
+            return set()
+
+    @staticmethod
+    def _match_expression(query: str) -> Optional[str]:
+        """
+            Turns free text into an FTS5 OR-query of quoted terms.
+            The trigram index can't match terms shorter than 3 characters, so those are dropped.
+        """
+        terms = [t for t in query.split() if len(t) >= 3]
+        if not terms:
+            return None
+        return " OR ".join('"' + t.replace('"', '""') + '"' for t in terms)
+
+    def search_news(self, query: Optional[str] = None, related_stocks: Optional[List[str]] = None,
+                    related_sectors: Optional[List[str]] = None, since: Optional[datetime.date] = None,
+                    limit: int = 10) -> List[News]:
+        conn, cursor = self._connect()
+        conditions, params = [], []
+        if since is not None:
+            conditions.append("n.published_date >= ?")
+            params.append(since.strftime("%Y-%m-%d"))
+        if related_stocks:
+            conditions.append("EXISTS (SELECT 1 FROM json_each(n.related_stocks) AS s "
+                              "WHERE s.value IN (SELECT value FROM json_each(?)))")
+            params.append(json.dumps([str(s) for s in related_stocks]))
+        if related_sectors:
+            conditions.append("EXISTS (SELECT 1 FROM json_each(n.related_sectors) AS s "
+                              "WHERE s.value IN (SELECT value FROM json_each(?)))")
+            params.append(json.dumps(related_sectors))
+
+        columns = """n.id, n.title, n.content, n.published_at, n.source, n.url,
+                     n.related_stocks, n.related_sectors, n.sentiment_score"""
+        if query:
+            match = self._match_expression(query)
+            if match is None:
+                return []
+            # bm25 is negative (lower is better); the score halves every RECENCY_HALF_LIFE_DAYS of age
+            sql = f"""SELECT {columns}
+                      FROM news_fts JOIN news AS n ON n.news_no = news_fts.rowid
+                      WHERE news_fts MATCH ? {''.join(f' AND {c}' for c in conditions)}
+                      ORDER BY bm25(news_fts, {self.TITLE_WEIGHT}, 1.0)
+                               / (1.0 + MAX(0, ? - n.published_ts) / 86400.0 / {self.RECENCY_HALF_LIFE_DAYS})
+                      LIMIT ?
+                   """
+            params = [match, *params, int(time.time()), limit]
+        else:
+            sql = f"""SELECT {columns}
+                      FROM news AS n
+                      {'WHERE ' + ' AND '.join(conditions) if conditions else ''}
+                      ORDER BY n.published_ts DESC
+                      LIMIT ?
+                   """
+            params = [*params, limit]
+
+        try:
+            cursor.execute(sql, params)
+            return [self._row_to_news(row) for row in cursor.fetchall()]
+
+        except Exception as ex:
+            logger.error(f"Failed to search news: {ex}")
+            return []
 
     def save_market_analysis(self, analysis: MarketAnalysis):
-        ...
+        try:
+            self._write(lambda conn: conn.execute("""
+                INSERT OR REPLACE INTO market_analyses (
+                    analysis_date, sentiment_score, summary, primary_sectors, reasons,
+                    market_sentiment, trading_strategy, thought_process, cited_news_ids
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, analysis_to_record(analysis)))
+        except Exception as e:
+            print(f"Failed to insert market analysis: {e}")
+
+    def get_market_analyses(self, start_date: datetime.date, end_date: datetime.date) -> List[MarketAnalysis]:
+        conn, cursor = self._connect()
+        try:
+            cursor.execute("""
+                SELECT analysis_date, sentiment_score, summary, primary_sectors, reasons,
+                       market_sentiment, trading_strategy, thought_process, cited_news_ids
+                FROM market_analyses
+                WHERE analysis_date BETWEEN ? AND ?
+                ORDER BY analysis_date
+            """, (start_date.isoformat(), end_date.isoformat()))
+            return [analysis_from_record(row) for row in cursor.fetchall()]
+        except Exception as ex:
+            logger.error(f"Failed to get market analyses: {ex}")
+            return []
+
+    def save_trade_strategies(self, strategy_date: datetime.date, strategies: List[TradeStrategy]):
+        if not strategies:
+            return
+
+        rows = [strategy_to_record(strategy_date, s) for s in strategies]
+
+        def _replace(conn):
+            conn.execute("DELETE FROM trade_strategies WHERE strategy_date = ?", (strategy_date.isoformat(),))
+            conn.executemany("""
+                INSERT OR REPLACE INTO trade_strategies (
+                    strategy_date, symbol, action, confidence_score, entry_price, take_profit,
+                    stop_loss, reasoning, valid_until
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+
+        try:
+            self._write(_replace)
+        except Exception as e:
+            print(f"Failed to insert trade strategies: {e}")
+
+    def get_trade_strategies(self, start_date: datetime.date, end_date: datetime.date,
+                             symbol: Optional[str] = None) -> Dict[datetime.date, List[TradeStrategy]]:
+        query = """SELECT strategy_date, symbol, action, confidence_score, entry_price, take_profit,
+                          stop_loss, reasoning, valid_until
+                   FROM trade_strategies
+                   WHERE strategy_date BETWEEN ? AND ?
+                """
+        params = [start_date.isoformat(), end_date.isoformat()]
+        if symbol is not None:
+            query += " AND symbol = ?"
+            params.append(str(symbol))
+        query += " ORDER BY strategy_date, symbol"
+
+        conn, cursor = self._connect()
+        try:
+            cursor.execute(query, params)
+            strategies: Dict[datetime.date, List[TradeStrategy]] = {}
+            for row in cursor.fetchall():
+                strategy_date, strategy = strategy_from_record(row)
+                strategies.setdefault(strategy_date, []).append(strategy)
+            return strategies
+        except Exception as ex:
+            logger.error(f"Failed to get trade strategies: {ex}")
+            return {}
 
     def get_all_symbols(self) -> List[str]:
         conn, cursor = self._connect()
         try:
-            cursor.execute("SELECT DISTINCT symbol FROM ohlcv_candles")
+            cursor.execute("""
+                SELECT s.symbol FROM symbols AS s
+                WHERE EXISTS (SELECT 1 FROM candles AS c WHERE c.symbol_id = s.symbol_id)
+            """)
             rows = cursor.fetchall()
             return [str(row[0]) for row in rows]
         except Exception as ex:
             logger.error(f"Failed to get symbols: {ex}")
             return []
-        finally:
-            conn.close()
+
+
+    def get_last_candle_date(self, symbol: str, interval: Interval) -> Optional[datetime.date]:
+        conn, cursor = self._connect()
+        try:
+            cursor.execute(
+                """SELECT date(MAX(c.candle_ts), 'unixepoch')
+                   FROM symbols AS s JOIN candles AS c ON c.symbol_id = s.symbol_id
+                   WHERE s.symbol = ? AND c.interval = ?""",
+                (str(symbol), str(interval))
+            )
+            row = cursor.fetchone()
+            return datetime.date.fromisoformat(row[0]) if row and row[0] else None
+        except Exception as ex:
+            logger.error(f"Failed to get last candle date of {symbol}: {ex}")
+            return None
+
+    def get_first_candle_date(self, interval: Interval) -> Optional[datetime.date]:
+        conn, cursor = self._connect()
+        try:
+            cursor.execute("SELECT date(MIN(candle_ts), 'unixepoch') FROM candles WHERE interval = ?", (str(interval),))
+            row = cursor.fetchone()
+            return datetime.date.fromisoformat(row[0]) if row and row[0] else None
+        except Exception as ex:
+            logger.error(f"Failed to get first candle date: {ex}")
+            return None
+
+    def get_month_candles(self, interval: Interval, year: int, month: int) -> pd.DataFrame:
+        start = datetime.date(year, month, 1)
+        end = datetime.date(year + month // 12, month % 12 + 1, 1)
+        query = """SELECT s.symbol, s.market_type, c.candle_ts AS candle_date_time,
+                          c.open_price, c.high_price, c.low_price, c.close_price, c.volume
+                   FROM candles AS c JOIN symbols AS s ON s.symbol_id = c.symbol_id
+                   WHERE c.interval = ? AND c.candle_ts >= ? AND c.candle_ts < ?
+                """
+        conn, cursor = self._connect()
+        df = pd.read_sql_query(query, conn, params=(str(interval), _epoch(start), _epoch(end)))
+        df['candle_date_time'] = pd.to_datetime(df['candle_date_time'], unit='s')
+        return df
+
+    def delete_candles_between(self, interval: Interval, start_date: datetime.date, before_date: datetime.date):
+        self._write(lambda conn: conn.execute(
+            "DELETE FROM candles WHERE interval = ? AND candle_ts >= ? AND candle_ts < ?",
+            (str(interval), _epoch(start_date), _epoch(before_date))
+        ))
+
+    def get_recent_candles(self, interval: Interval, count: int) -> pd.DataFrame:
+        query = """SELECT r.candle_ts AS candle_date_time, r.open_price, r.high_price, r.low_price,
+                          r.close_price, r.volume, s.market_type, r.interval, s.symbol
+                   FROM (
+                       SELECT *, ROW_NUMBER() OVER (
+                           PARTITION BY symbol_id ORDER BY candle_ts DESC
+                       ) AS recency
+                       FROM candles
+                       WHERE interval = ?
+                   ) AS r
+                   JOIN symbols AS s ON s.symbol_id = r.symbol_id
+                   WHERE r.recency <= ?
+                   ORDER BY s.symbol, r.candle_ts DESC
+                """
+        conn, cursor = self._connect()
+        try:
+            df = pd.read_sql_query(query, conn, params=(str(interval), count))
+            df['candle_date_time'] = pd.to_datetime(df['candle_date_time'], unit='s')
+            return df
+        except Exception as ex:
+            logger.error(f"Failed to get recent candles: {ex}")
+            return pd.DataFrame()
+
+    def get_candle_columns(self, symbols: List[str], interval: Interval,
+                           start_date: datetime.date, end_date: datetime.date) -> np.ndarray:
+        # json_each drives the join, so each symbol is one range seek on the
+        # (symbol_id, interval, candle_ts) primary key; its key is the symbol's position.
+        # Rows go from the cursor straight into the structured array; epoch seconds are
+        # datetime64[s] as they are and NULL prices become NaN.
+        query = """SELECT w.key, c.candle_ts,
+                          IFNULL(c.open_price, 'nan'), IFNULL(c.high_price, 'nan'), IFNULL(c.low_price, 'nan'),
+                          IFNULL(c.close_price, 'nan'), IFNULL(c.volume, 'nan')
+                   FROM json_each(?) AS w
+                   CROSS JOIN symbols AS s
+                   CROSS JOIN candles AS c
+                   WHERE s.symbol = w.value AND c.symbol_id = s.symbol_id AND c.interval = ?
+                     AND c.candle_ts >= ? AND c.candle_ts < ?
+                """
+        params = (json.dumps([str(s) for s in symbols]), str(interval), _epoch(start_date),
+                  _epoch(end_date + datetime.timedelta(days=1)))
+
+        conn, cursor = self._connect()
+        return np.fromiter(cursor.execute(query, params), dtype=CandleMatrix.COLUMNS_DTYPE)
+
+    def get_candle_matrix(self, symbols: List[str], interval: Interval,
+                          start_date: datetime.date, end_date: datetime.date) -> CandleMatrix:
+        columns = self.get_candle_columns(symbols, interval, start_date, end_date)
+        return CandleMatrix.from_columns(columns, tuple(str(s) for s in symbols))
+
+    def get_indicator_state(self, symbol: str, interval: Interval) -> Optional[IndicatorState]:
+        conn, cursor = self._connect()
+        try:
+            cursor.execute(
+                "SELECT state FROM indicator_states WHERE symbol = ? AND interval = ?",
+                (str(symbol), str(interval))
+            )
+            row = cursor.fetchone()
+            return IndicatorState.from_dict(json.loads(row[0])) if row else None
+        except Exception as ex:
+            logger.error(f"Failed to get indicator state of {symbol}: {ex}")
+            return None
+
+    def get_indicator_states(self, interval: Interval) -> List[IndicatorState]:
+        conn, cursor = self._connect()
+        try:
+            cursor.execute("SELECT state FROM indicator_states WHERE interval = ?", (str(interval),))
+            return [IndicatorState.from_dict(json.loads(row[0])) for row in cursor.fetchall()]
+        except Exception as ex:
+            logger.error(f"Failed to get indicator states: {ex}")
+            return []
+
+    def put_indicator_state(self, state: IndicatorState):
+        self.put_indicator_states([state])
+
+    def put_indicator_states(self, states: List[IndicatorState]):
+        if not states:
+            return
+
+        rows = [(s.symbol, s.interval, s.last_timestamp, json.dumps(s.to_dict())) for s in states]
+        self._write(lambda conn: conn.executemany(
+            """
+            INSERT OR REPLACE INTO indicator_states (symbol, interval, last_timestamp, state)
+            VALUES (?, ?, ?, ?)
+            """,
+            rows
+        ))
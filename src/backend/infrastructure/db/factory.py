@@ -0,0 +1,44 @@
+from src.backend.application.ports.output import DatabaseOutputPort, CandleArchiveOutputPort, CandleHistoryOutputPort
+from src.backend.infrastructure.db.candle_archive import NumpyCandleArchive, TieredCandleReader
+from src.backend.infrastructure.db.database_api import SQLiteDatabase
+from src.backend.infrastructure.db.migrations import apply_migrations
+from src.config.config import settings, ARCHIVE_FOLDER_PATH
+
+
+class DatabaseFactory:
+    @staticmethod
+    def get_port() -> DatabaseOutputPort:
+        if settings.database_backend == "sqlite":
+            return SQLiteDatabase()
+        elif settings.database_backend == "postgres":
+            from src.backend.infrastructure.db.postgres_api import PostgresDatabase
+            return PostgresDatabase(DatabaseFactory.postgres_dsn(), max_size=settings.db_pool_size)
+        raise ValueError(f"Unsupported database backend: {settings.database_backend}")
+
+    @staticmethod
+    def get_archive_port() -> CandleArchiveOutputPort:
+        return NumpyCandleArchive(ARCHIVE_FOLDER_PATH)
+
+    @staticmethod
+    def get_history_port() -> CandleHistoryOutputPort:
+        """
+            Candle history across the archive and the live database, for backtests and sweeps.
+        """
+        return TieredCandleReader(DatabaseFactory.get_port(), DatabaseFactory.get_archive_port())
+
+    @staticmethod
+    def postgres_dsn() -> str:
+        return (
+            f"postgresql://{settings.db_user}:{settings.db_password.get_secret_value()}"
+            f"@{settings.db_host}:{settings.db_port}/{settings.db_name}"
+        )
+
+    @staticmethod
+    def migrate():
+        """
+            Brings the schema of the configured backend up to date.
+        """
+        if settings.database_backend == "postgres":
+            DatabaseFactory.get_port().migrate()
+        else:
+            apply_migrations(SQLiteDatabase.SQLITE_PATH)
@@ -0,0 +1,174 @@
+import datetime
+import logging
+import threading
+import pandas as pd
+from typing import List, Dict, Optional, Tuple
+
+from src.backend.application.ports.output import MarketOutputPort, DatabaseOutputPort, CandleArchiveOutputPort
+from src.backend.domain.value_objects import Symbol
+from src.backend.domain.reference_data import Interval, StockMarketType
+
+logger = logging.getLogger(__name__)
+
+
+class LocalMarketAPI(MarketOutputPort):
+    """
+        Serves candle history from the local ohlcv_candles store.
+        The first request for an (interval, count) loads every stored symbol in one bulk query.
+        Symbols whose older candles were moved to the archive tier are completed from it.
+
+        With a fallback port, only the candles the store lacks are fetched and written back:
+        the days after the last stored candle when it is older than the latest trading day, and
+        the days of the requested window before the first stored candle when fewer than `count`
+        are stored. Without a trading calendar a short history is fetched in full.
+    """
+
+    def __init__(self, database_port: DatabaseOutputPort, fallback_port: Optional[MarketOutputPort] = None,
+                 archive_port: Optional[CandleArchiveOutputPort] = None):
+        self._database_port = database_port
+        self._fallback_port = fallback_port
+        self._archive_port = archive_port
+        self._histories: Dict[Tuple[str, int], Dict[str, pd.DataFrame]] = {}
+        self._latest_trading_days: Dict[str, Optional[datetime.date]] = {}
+        self._lock = threading.Lock()
+
+    def get_candle_history(self, target: Symbol, interval: Interval, count: int = 1) -> pd.DataFrame:
+        stored = self._stored_histories(interval, count).get(str(target))
+        if self._fallback_port is None:
+            return stored if stored is not None else pd.DataFrame()
+
+        if stored is None or stored.empty:
+            logger.info(f"No candles stored for {target}, fetching {count} from the fallback port.")
+            history = self._fetch_and_store(self._fallback_port.get_candle_history(target, interval, count))
+        else:
+            history = self._with_missing_candles(target, interval, count, stored)
+
+        self._histories[(str(interval), count)][str(target)] = history
+        return history
+
+    def _with_missing_candles(self, target: Symbol, interval: Interval, count: int,
+                              stored: pd.DataFrame) -> pd.DataFrame:
+        latest = self._latest_trading_day(interval)
+        last_stored = stored['candle_date_time'].max().date()
+        parts = [stored]
+        if latest is None or last_stored < latest:
+            parts.append(self._fetch_and_store(self._fallback_port.get_candle_history_since(target, interval, last_stored)))
+
+        if len(pd.concat(parts)) < count:
+            window_start = self._fallback_port.get_window_start(interval, count, latest or datetime.date.today())
+            if window_start is None:
+                logger.info(f"Only {len(stored)}/{count} candles stored for {target}, fetching all from the fallback port.")
+                parts.append(self._fetch_and_store(self._fallback_port.get_candle_history(target, interval, count)))
+            else:
+                first_stored = stored['candle_date_time'].min().date()
+                older = self._fallback_port.get_candle_history_between(
+                    target, interval, window_start, first_stored - datetime.timedelta(days=1)
+                )
+                parts.append(self._fetch_and_store(older))
+
+        if len(parts) == 1:
+            return stored
+        history = pd.concat([p for p in parts if not p.empty], ignore_index=True)
+        history = history.drop_duplicates('candle_date_time', keep='last')
+        return history.sort_values('candle_date_time', ascending=False).head(count).reset_index(drop=True)
+
+    def _fetch_and_store(self, fetched: pd.DataFrame) -> pd.DataFrame:
+        if not fetched.empty:
+            self._database_port.put_ohlcv_to_database(fetched)
+        return fetched
+
+    def _latest_trading_day(self, interval: Interval) -> Optional[datetime.date]:
+        with self._lock:
+            if str(interval) not in self._latest_trading_days:
+                self._latest_trading_days[str(interval)] = self._fallback_port.get_window_start(
+                    interval, 1, datetime.date.today()
+                )
+            return self._latest_trading_days[str(interval)]
+
+    def get_candle_history_since(self, target: Symbol, interval: Interval, since: datetime.date) -> pd.DataFrame:
+        if self._fallback_port is None:
+            return pd.DataFrame()
+        return self._fallback_port.get_candle_history_since(target, interval, since)
+
+    def get_candle_history_between(self, target: Symbol, interval: Interval,
+                                   start_date: datetime.date, end_date: datetime.date) -> pd.DataFrame:
+        if self._fallback_port is None:
+            return pd.DataFrame()
+        return self._fallback_port.get_candle_history_between(target, interval, start_date, end_date)
+
+    def get_window_start(self, interval: Interval, count: int, until: datetime.date) -> Optional[datetime.date]:
+        if self._fallback_port is None:
+            return None
+        return self._fallback_port.get_window_start(interval, count, until)
+
+    def get_candles_history(self, targets: List[Symbol], interval: Interval, count: int = 1) -> pd.DataFrame:
+        results = []
+        for target in targets:
+            try:
+                df = self.get_candle_history(target, interval, count)
+                if not df.empty:
+                    results.append(df)
+            except Exception as e:
+                logger.error(f"Failed to fetch {target}: {e}")
+
+        if not results:
+            return pd.DataFrame()
+
+        return pd.concat(results, ignore_index=True)
+
+    def get_market_snapshot(self, market_type: StockMarketType, target_date: datetime.date) -> pd.DataFrame:
+        if self._fallback_port is None:
+            return pd.DataFrame()
+        return self._fallback_port.get_market_snapshot(market_type, target_date)
+
+    def get_all_symbols(self, market_type: StockMarketType):
+        if self._fallback_port is None:
+            return None
+        return self._fallback_port.get_all_symbols(market_type)
+
+    def get_symbol_name(self, target: Symbol) -> Optional[str]:
+        if self._fallback_port is None:
+            return None
+        return self._fallback_port.get_symbol_name(target)
+
+    def _stored_histories(self, interval: Interval, count: int) -> Dict[str, pd.DataFrame]:
+        key = (str(interval), count)
+        with self._lock:
+            if key not in self._histories:
+                candles = self._database_port.get_recent_candles(interval, count)
+                histories = {
+                    symbol: df.reset_index(drop=True)
+                    for symbol, df in candles.groupby('symbol', sort=False)
+                } if not candles.empty else {}
+                logger.info(f"Loaded stored candles of {len(histories)} symbols in one query.")
+                self._histories[key] = self._with_archived_candles(histories, interval, count)
+            return self._histories[key]
+
+    def _with_archived_candles(self, histories: Dict[str, pd.DataFrame], interval: Interval,
+                               count: int) -> Dict[str, pd.DataFrame]:
+        """
+            Completes the histories shorter than `count` with the symbol's archived candles.
+        """
+        short = [symbol for symbol, df in histories.items() if len(df) < count]
+        if self._archive_port is None or not short:
+            return histories
+
+        columns = self._archive_port.get_recent_candle_columns(short, interval, count)
+        for position, symbol in enumerate(short):
+            rows = columns[columns['symbol'] == position]
+            if not len(rows):
+                continue
+            stored = histories[symbol]
+            archived = pd.DataFrame({
+                'candle_date_time': pd.to_datetime(rows['date']),
+                **{f'{field}_price': rows[field] for field in ('open', 'high', 'low', 'close')},
+                'volume': rows['volume'],
+                'market_type': stored['market_type'].iloc[0] if 'market_type' in stored else None,
+                'interval': str(interval),
+                'symbol': symbol,
+            })
+            # Stored rows win over archived ones of the same date
+            archived = archived[~archived['candle_date_time'].isin(stored['candle_date_time'])]
+            merged = pd.concat([stored, archived], ignore_index=True)
+            histories[symbol] = merged.sort_values('candle_date_time', ascending=False).head(count).reset_index(drop=True)
+        return histories
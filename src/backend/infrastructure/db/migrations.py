@@ -0,0 +1,301 @@
+import sqlite3
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, List, Union
+
+from src.backend.infrastructure.db.connection import SQLiteConnectionManager
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    apply: Callable[[sqlite3.Connection], None]
+
+
+def _columns(conn: sqlite3.Connection, table: str) -> set:
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def _baseline(conn: sqlite3.Connection):
+    """
+        The schema the hand-run setup scripts used to create. Every statement tolerates
+        existing objects, so databases set up by those scripts are adopted as they are.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS news (
+            id TEXT PRIMARY KEY,
+            title TEXT,
+            content TEXT,
+            published_at TEXT,
+            source TEXT,
+            url TEXT,
+            related_stocks TEXT,   -- JSON array
+            related_sectors TEXT,  -- JSON array
+            sentiment_score REAL DEFAULT 0.0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    # Publish date in the publisher's local time and UTC epoch, for indexed daily lookups
+    news_columns = _columns(conn, "news")
+    if "published_date" not in news_columns:
+        conn.execute("ALTER TABLE news ADD COLUMN published_date TEXT")
+    if "published_ts" not in news_columns:
+        conn.execute("ALTER TABLE news ADD COLUMN published_ts INTEGER")
+    conn.execute("""
+        UPDATE news
+        SET published_date = substr(published_at, 1, 10),
+            published_ts = CAST(strftime('%s', published_at) AS INTEGER)
+        WHERE published_date IS NULL AND published_at IS NOT NULL
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_news_published_date ON news (published_date)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_news_source_date ON news (source, published_date)")
+
+    # Full-text index over title and content. It stores no text of its own and points at news.rowid;
+    # trigram tokens match Korean words regardless of the particles attached to them
+    conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS news_fts USING fts5(
+            title, content,
+            content='news', content_rowid='rowid',
+            tokenize='trigram'
+        )
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS news_fts_insert AFTER INSERT ON news BEGIN
+            INSERT INTO news_fts (rowid, title, content) VALUES (new.rowid, new.title, new.content);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS news_fts_delete AFTER DELETE ON news BEGIN
+            INSERT INTO news_fts (news_fts, rowid, title, content) VALUES ('delete', old.rowid, old.title, old.content);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS news_fts_update AFTER UPDATE OF title, content ON news BEGIN
+            INSERT INTO news_fts (news_fts, rowid, title, content) VALUES ('delete', old.rowid, old.title, old.content);
+            INSERT INTO news_fts (rowid, title, content) VALUES (new.rowid, new.title, new.content);
+        END
+    """)
+    conn.execute("INSERT INTO news_fts (news_fts) VALUES ('rebuild')")
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS ohlcv_candles (
+            symbol TEXT NOT NULL,
+            market_type TEXT,
+            interval TEXT NOT NULL,
+            candle_date_time TEXT NOT NULL,
+            open_price REAL,
+            high_price REAL,
+            low_price REAL,
+            close_price REAL,
+            volume INTEGER,
+            rsi REAL,
+            ema REAL,
+            sma REAL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (symbol, interval, candle_date_time)
+        )
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS indicator_states (
+            symbol TEXT NOT NULL,
+            interval TEXT NOT NULL,
+            last_timestamp INTEGER,             -- epoch seconds of the last applied candle
+            state TEXT NOT NULL,                -- IndicatorState JSON
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (symbol, interval)
+        )
+    """)
+
+
+def _normalize_candles(conn: sqlite3.Connection):
+    """
+        Moves ohlcv_candles into `symbols` + `candles`.
+
+        market_type is kept once per symbol instead of on every row, the never-written
+        rsi/ema/sma/created_at columns are dropped, and candle times become epoch seconds
+        (the stored wall-clock time read as UTC, like numpy's datetime64). The table is
+        WITHOUT ROWID, so rows live in the primary key b-tree itself and a range scan of one
+        symbol reads consecutive pages; no separate symbol/date index is needed.
+    """
+    conn.execute("""
+        CREATE TABLE symbols (
+            symbol_id INTEGER PRIMARY KEY,
+            symbol TEXT NOT NULL UNIQUE,
+            market_type TEXT
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE candles (
+            symbol_id INTEGER NOT NULL REFERENCES symbols (symbol_id),
+            interval TEXT NOT NULL,
+            candle_ts INTEGER NOT NULL,         -- epoch seconds
+            open_price REAL,
+            high_price REAL,
+            low_price REAL,
+            close_price REAL,
+            volume INTEGER,
+            PRIMARY KEY (symbol_id, interval, candle_ts)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("""
+        INSERT INTO symbols (symbol, market_type)
+        SELECT symbol, MAX(market_type) FROM ohlcv_candles GROUP BY symbol ORDER BY symbol
+    """)
+    conn.execute("""
+        INSERT OR REPLACE INTO candles (
+            symbol_id, interval, candle_ts, open_price, high_price, low_price, close_price, volume
+        )
+        SELECT s.symbol_id, c.interval, CAST(strftime('%s', c.candle_date_time) AS INTEGER),
+               c.open_price, c.high_price, c.low_price, c.close_price, c.volume
+        FROM ohlcv_candles AS c
+        JOIN symbols AS s ON s.symbol = c.symbol
+        WHERE strftime('%s', c.candle_date_time) IS NOT NULL
+    """)
+    conn.execute("DROP TABLE ohlcv_candles")
+
+
+def _analysis_history(conn: sqlite3.Connection):
+    """
+        LLM results kept by date, so consumers read them instead of re-running the pipeline.
+        One market analysis per day and one strategy per symbol and day; a re-run replaces them.
+    """
+    conn.execute("""
+        CREATE TABLE market_analyses (
+            analysis_date TEXT PRIMARY KEY,     -- YYYY-MM-DD
+            sentiment_score REAL,
+            summary TEXT,
+            primary_sectors TEXT,               -- JSON array
+            reasons TEXT,
+            market_sentiment TEXT,
+            trading_strategy TEXT,
+            thought_process TEXT,
+            cited_news_ids TEXT,                -- JSON array
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE trade_strategies (
+            strategy_date TEXT NOT NULL,        -- YYYY-MM-DD
+            symbol TEXT NOT NULL,
+            action TEXT NOT NULL,
+            confidence_score REAL,
+            entry_price REAL,
+            take_profit REAL,
+            stop_loss REAL,
+            reasoning TEXT,
+            valid_until TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (strategy_date, symbol)
+        )
+    """)
+    # Date ranges use the primary key; this one serves the history of a single symbol
+    conn.execute("CREATE INDEX idx_trade_strategies_symbol_date ON trade_strategies (symbol, strategy_date)")
+
+
+def _news_integer_key(conn: sqlite3.Connection):
+    """
+        Gives news an explicit INTEGER PRIMARY KEY for news_fts to point at. The index referred
+        to the implicit rowid of a table keyed by TEXT, which VACUUM is free to renumber.
+    """
+    for trigger in ("news_fts_insert", "news_fts_delete", "news_fts_update"):
+        conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    conn.execute("DROP TABLE IF EXISTS news_fts")
+
+    conn.execute("""
+        CREATE TABLE news_keyed (
+            news_no INTEGER PRIMARY KEY,
+            id TEXT NOT NULL UNIQUE,
+            title TEXT,
+            content TEXT,
+            published_at TEXT,
+            published_date TEXT,
+            published_ts INTEGER,
+            source TEXT,
+            url TEXT,
+            related_stocks TEXT,   -- JSON array
+            related_sectors TEXT,  -- JSON array
+            sentiment_score REAL DEFAULT 0.0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    # Databases adopted from the setup scripts may lack some of the columns
+    columns = ", ".join(sorted(_columns(conn, "news") & _columns(conn, "news_keyed")))
+    conn.execute(f"INSERT INTO news_keyed ({columns}) SELECT {columns} FROM news ORDER BY rowid")
+    conn.execute("DROP TABLE news")
+    conn.execute("ALTER TABLE news_keyed RENAME TO news")
+    conn.execute("CREATE INDEX idx_news_published_date ON news (published_date)")
+    conn.execute("CREATE INDEX idx_news_source_date ON news (source, published_date)")
+
+    conn.execute("""
+        CREATE VIRTUAL TABLE news_fts USING fts5(
+            title, content,
+            content='news', content_rowid='news_no',
+            tokenize='trigram'
+        )
+    """)
+    conn.execute("""
+        CREATE TRIGGER news_fts_insert AFTER INSERT ON news BEGIN
+            INSERT INTO news_fts (rowid, title, content) VALUES (new.news_no, new.title, new.content);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER news_fts_delete AFTER DELETE ON news BEGIN
+            INSERT INTO news_fts (news_fts, rowid, title, content) VALUES ('delete', old.news_no, old.title, old.content);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER news_fts_update AFTER UPDATE OF title, content ON news BEGIN
+            INSERT INTO news_fts (news_fts, rowid, title, content) VALUES ('delete', old.news_no, old.title, old.content);
+            INSERT INTO news_fts (rowid, title, content) VALUES (new.news_no, new.title, new.content);
+        END
+    """)
+    conn.execute("INSERT INTO news_fts (news_fts) VALUES ('rebuild')")
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "baseline schema", _baseline),
+    Migration(2, "normalized candle storage", _normalize_candles),
+    Migration(3, "market analysis and strategy history", _analysis_history),
+    Migration(4, "integer key for the news full-text index", _news_integer_key),
+]
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def apply_migrations(path: Union[str, Path], migrations: List[Migration] = MIGRATIONS) -> int:
+    """
+        Brings the database at `path` up to the latest schema version and returns it.
+
+        The version lives in PRAGMA user_version. Each migration runs in its own write
+        transaction together with the version bump, so a failed migration leaves the
+        database at the previous version, and processes starting at the same time apply
+        each migration once.
+    """
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), timeout=SQLiteConnectionManager.BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+    try:
+        for migration in sorted(migrations, key=lambda m: m.version):
+            if schema_version(conn) >= migration.version:
+                continue
+
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Another process may have applied it while we waited for the lock
+                if schema_version(conn) < migration.version:
+                    migration.apply(conn)
+                    conn.execute(f"PRAGMA user_version = {migration.version}")
+                    logger.info(f"Applied migration {migration.version} ({migration.name}) to {path}")
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return schema_version(conn)
+    finally:
+        conn.close()
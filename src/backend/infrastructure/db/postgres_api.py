@@ -0,0 +1,604 @@
+import os
+import json
+import asyncio
+import datetime
+import logging
+import threading
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple, TypeVar
+
+import numpy as np
+import pandas as pd
+
+from src.backend.application.ports.output import DatabaseOutputPort
+from src.backend.domain.entities import News, MarketAnalysis, IndicatorState, TradeStrategy
+from src.backend.domain.reference_data import Interval
+from src.backend.domain.value_objects import CandleMatrix, DataOHLCV
+from src.backend.infrastructure.db.rows import (
+    CandleColumns, iter_rows, analysis_to_record, analysis_from_record, strategy_to_record, strategy_from_record
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+# Versioned like the SQLite migrations; applied under an advisory lock so concurrent workers apply each once
+POSTGRES_MIGRATIONS: List[Tuple[int, List[str]]] = [
+    (1, [
+        """
+        CREATE TABLE IF NOT EXISTS symbols (
+            symbol_id SERIAL PRIMARY KEY,
+            symbol TEXT NOT NULL UNIQUE,
+            market_type TEXT
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS candles (
+            symbol_id INTEGER NOT NULL REFERENCES symbols (symbol_id),
+            interval TEXT NOT NULL,
+            candle_ts BIGINT NOT NULL,
+            open_price DOUBLE PRECISION,
+            high_price DOUBLE PRECISION,
+            low_price DOUBLE PRECISION,
+            close_price DOUBLE PRECISION,
+            volume BIGINT,
+            PRIMARY KEY (symbol_id, interval, candle_ts)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS news (
+            id TEXT PRIMARY KEY,
+            title TEXT,
+            content TEXT,
+            published_at TIMESTAMPTZ,
+            published_date DATE,
+            source TEXT,
+            url TEXT,
+            related_stocks JSONB NOT NULL DEFAULT '[]',
+            related_sectors JSONB NOT NULL DEFAULT '[]',
+            sentiment_score DOUBLE PRECISION DEFAULT 0.0,
+            created_at TIMESTAMPTZ DEFAULT now(),
+            search TSVECTOR GENERATED ALWAYS AS (
+                setweight(to_tsvector('simple', coalesce(title, '')), 'A')
+                || setweight(to_tsvector('simple', coalesce(content, '')), 'B')
+            ) STORED
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_news_published_date ON news (published_date)",
+        "CREATE INDEX IF NOT EXISTS idx_news_source_date ON news (source, published_date)",
+        "CREATE INDEX IF NOT EXISTS idx_news_search ON news USING GIN (search)",
+        """
+        CREATE TABLE IF NOT EXISTS indicator_states (
+            symbol TEXT NOT NULL,
+            interval TEXT NOT NULL,
+            last_timestamp BIGINT,
+            state JSONB NOT NULL,
+            updated_at TIMESTAMPTZ DEFAULT now(),
+            PRIMARY KEY (symbol, interval)
+        )
+        """,
+    ]),
+    (2, [
+        """
+        CREATE TABLE IF NOT EXISTS market_analyses (
+            analysis_date DATE PRIMARY KEY,
+            sentiment_score DOUBLE PRECISION,
+            summary TEXT,
+            primary_sectors TEXT,
+            reasons TEXT,
+            market_sentiment TEXT,
+            trading_strategy TEXT,
+            thought_process TEXT,
+            cited_news_ids TEXT,
+            created_at TIMESTAMPTZ DEFAULT now()
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS trade_strategies (
+            strategy_date DATE NOT NULL,
+            symbol TEXT NOT NULL,
+            action TEXT NOT NULL,
+            confidence_score DOUBLE PRECISION,
+            entry_price DOUBLE PRECISION,
+            take_profit DOUBLE PRECISION,
+            stop_loss DOUBLE PRECISION,
+            reasoning TEXT,
+            valid_until TIMESTAMPTZ,
+            created_at TIMESTAMPTZ DEFAULT now(),
+            PRIMARY KEY (strategy_date, symbol)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_trade_strategies_symbol_date ON trade_strategies (symbol, strategy_date)",
+    ]),
+]
+
+_MIGRATION_LOCK_ID = 0x54524144  # arbitrary advisory lock key
+
+
+class PostgresPool:
+    """
+        One asyncpg pool per process and DSN, driven by an event loop on its own thread.
+
+        The output ports are synchronous, so callers hand a coroutine function that receives a
+        pooled connection and block on its result. Celery tasks and the asyncio services share
+        the pool without each opening their own connections.
+    """
+    _pools: Dict[Tuple[int, str], "PostgresPool"] = {}
+    _pools_lock = threading.Lock()
+
+    def __init__(self, dsn: str, min_size: int = 1, max_size: int = 10):
+        try:
+            import asyncpg
+        except ImportError as e:
+            raise ImportError("The PostgreSQL backend requires the 'asyncpg' package.") from e
+
+        self._dsn = dsn
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="postgres-pool", daemon=True)
+        self._thread.start()
+        self._pool = self._submit(asyncpg.create_pool(dsn, min_size=min_size, max_size=max_size))
+
+    @classmethod
+    def for_dsn(cls, dsn: str, **kwargs) -> "PostgresPool":
+        key = (os.getpid(), dsn)
+        with cls._pools_lock:
+            if key not in cls._pools:
+                cls._pools[key] = cls(dsn, **kwargs)
+            return cls._pools[key]
+
+    def _submit(self, coro: Awaitable[T]) -> T:
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def run(self, work: Callable[..., Awaitable[T]]) -> T:
+        """
+            Runs `work(conn)` on a pooled connection and waits for its result.
+        """
+        async def _acquire_and_run():
+            async with self._pool.acquire() as conn:
+                return await work(conn)
+        return self._submit(_acquire_and_run())
+
+    def close(self):
+        with self._pools_lock:
+            self._pools.pop((os.getpid(), self._dsn), None)
+        self._submit(self._pool.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+
+async def _migrate(conn) -> int:
+    async with conn.transaction():
+        await conn.execute("SELECT pg_advisory_xact_lock($1)", _MIGRATION_LOCK_ID)
+        await conn.execute("CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)")
+        version = await conn.fetchval("SELECT MAX(version) FROM schema_version") or 0
+        for target, statements in POSTGRES_MIGRATIONS:
+            if target <= version:
+                continue
+            for statement in statements:
+                await conn.execute(statement)
+            await conn.execute("INSERT INTO schema_version (version) VALUES ($1)", target)
+            logger.info(f"Applied PostgreSQL migration {target}")
+            version = target
+        return version
+
+
+class PostgresDatabase(DatabaseOutputPort):
+    """
+        DatabaseOutputPort on a PostgreSQL server, for collection workers spread over several hosts.
+
+        Bulk writes COPY the rows into a temporary staging table and merge them with one
+        INSERT ... ON CONFLICT, so a batch is a single round trip of binary data instead of
+        one statement per row, and concurrent writers only contend on the rows they share.
+    """
+    # News search ranking, the same as the SQLite backend: title matches count double, relevance halves every 3 days
+    RANK_WEIGHTS = "{0.1, 0.2, 0.5, 1.0}"  # D, C, B (content), A (title)
+    RECENCY_HALF_LIFE_DAYS = 3.0
+
+    def __init__(self, dsn: str, min_size: int = 1, max_size: int = 10):
+        self._pool = PostgresPool.for_dsn(dsn, min_size=min_size, max_size=max_size)
+
+    def migrate(self) -> int:
+        return self._pool.run(_migrate)
+
+    def put_ohlcv_to_database(self, data: pd.DataFrame):
+        columns = CandleColumns.from_frame(data)
+        if columns is not None:
+            self._put_candle_columns(columns)
+
+    def put_candles(self, symbol: str, interval: Interval, candles: List[DataOHLCV],
+                    market_type: Optional[str] = None):
+        if candles:
+            self._put_candle_columns(CandleColumns.from_candles(symbol, interval, candles, market_type))
+
+    def _put_candle_columns(self, columns: CandleColumns):
+        records = iter_rows(
+            np.arange(len(columns)), columns.symbol, columns.market_type, columns.interval, columns.timestamp,
+            *columns.prices
+        )
+
+        async def _copy(conn):
+            async with conn.transaction():
+                await conn.execute("""
+                    CREATE TEMP TABLE candle_stage (
+                        seq INTEGER, symbol TEXT, market_type TEXT, interval TEXT, candle_ts BIGINT,
+                        open_price DOUBLE PRECISION, high_price DOUBLE PRECISION, low_price DOUBLE PRECISION,
+                        close_price DOUBLE PRECISION, volume DOUBLE PRECISION
+                    ) ON COMMIT DROP
+                """)
+                await conn.copy_records_to_table('candle_stage', records=records)
+                await conn.execute("""
+                    INSERT INTO symbols (symbol, market_type)
+                    SELECT DISTINCT ON (symbol) symbol, market_type FROM candle_stage
+                    ORDER BY symbol, (market_type IS NULL), seq DESC
+                    ON CONFLICT (symbol) DO UPDATE SET market_type = COALESCE(EXCLUDED.market_type, symbols.market_type)
+                """)
+                # The last row of a duplicated key wins, like INSERT OR REPLACE; NaN is stored as NULL
+                await conn.execute("""
+                    INSERT INTO candles (
+                        symbol_id, interval, candle_ts, open_price, high_price, low_price, close_price, volume
+                    )
+                    SELECT DISTINCT ON (s.symbol_id, st.interval, st.candle_ts)
+                           s.symbol_id, st.interval, st.candle_ts,
+                           NULLIF(st.open_price, 'NaN'), NULLIF(st.high_price, 'NaN'), NULLIF(st.low_price, 'NaN'),
+                           NULLIF(st.close_price, 'NaN'), NULLIF(st.volume, 'NaN')::BIGINT
+                    FROM candle_stage AS st JOIN symbols AS s ON s.symbol = st.symbol
+                    ORDER BY s.symbol_id, st.interval, st.candle_ts, st.seq DESC
+                    ON CONFLICT (symbol_id, interval, candle_ts) DO UPDATE SET
+                        open_price = EXCLUDED.open_price, high_price = EXCLUDED.high_price,
+                        low_price = EXCLUDED.low_price, close_price = EXCLUDED.close_price,
+                        volume = EXCLUDED.volume
+                """)
+
+        self._pool.run(_copy)
+
+    def put_news(self, news_list: List[News]):
+        """
+            뉴스 리스트를 DB에 저장 (중복 ID는 무시)
+        """
+        if not news_list:
+            return
+
+        records = [(
+            n.id,
+            n.title,
+            n.content,
+            n.published_at,
+            n.published_at.date(),
+            n.source,
+            n.url,
+            json.dumps([str(s) for s in n.related_stocks]) if n.related_stocks else "[]",
+            json.dumps(n.related_sectors) if n.related_sectors else "[]",
+            n.sentiment_score,
+        ) for n in news_list]
+
+        async def _copy(conn):
+            async with conn.transaction():
+                await conn.execute("""
+                    CREATE TEMP TABLE news_stage (
+                        id TEXT, title TEXT, content TEXT, published_at TIMESTAMPTZ, published_date DATE,
+                        source TEXT, url TEXT, related_stocks TEXT, related_sectors TEXT,
+                        sentiment_score DOUBLE PRECISION
+                    ) ON COMMIT DROP
+                """)
+                await conn.copy_records_to_table('news_stage', records=records)
+                await conn.execute("""
+                    INSERT INTO news (
+                        id, title, content, published_at, published_date, source, url,
+                        related_stocks, related_sectors, sentiment_score
+                    )
+                    SELECT id, title, content, published_at, published_date, source, url,
+                           related_stocks::jsonb, related_sectors::jsonb, sentiment_score
+                    FROM news_stage
+                    ON CONFLICT (id) DO NOTHING
+                """)
+
+        try:
+            self._pool.run(_copy)
+        except Exception as e:
+            print(f"Failed to insert news: {e}")
+
+    _NEWS_COLUMNS = """n.id, n.title, n.content, n.published_at, n.source, n.url,
+                       n.related_stocks, n.related_sectors, n.sentiment_score"""
+
+    @staticmethod
+    def _row_to_news(row) -> News:
+        return News(
+            id=row['id'],
+            title=row['title'],
+            content=row['content'],
+            published_at=row['published_at'],
+            source=row['source'],
+            url=row['url'],
+            related_stocks=json.loads(row['related_stocks']),
+            related_sectors=json.loads(row['related_sectors']),
+            sentiment_score=row['sentiment_score']
+        )
+
+    def _fetch(self, query: str, *args) -> list:
+        return self._pool.run(lambda conn: conn.fetch(query, *args))
+
+    def get_news_by_date(self, target_date: datetime.date, source: Optional[str] = None) -> Optional[List[News]]:
+        query = f"SELECT {self._NEWS_COLUMNS} FROM news AS n WHERE n.published_date = $1"
+        args = [target_date]
+        if source is not None:
+            query += " AND n.source = $2"
+            args.append(source)
+        try:
+            return [self._row_to_news(row) for row in self._fetch(query, *args)]
+        except Exception as ex:
+            logger.error(f"Failed to get news data: {ex}")
+            return []
+
+    def get_known_news_ids(self, ids: List[str]) -> Set[str]:
+        if not ids:
+            return set()
+        try:
+            return {row[0] for row in self._fetch("SELECT id FROM news WHERE id = ANY($1::text[])", list(ids))}
+        except Exception as ex:
+            logger.error(f"Failed to get known news ids: {ex}")
+            return set()
+
+    def search_news(self, query: Optional[str] = None, related_stocks: Optional[List[str]] = None,
+                    related_sectors: Optional[List[str]] = None, since: Optional[datetime.date] = None,
+                    limit: int = 10) -> List[News]:
+        conditions, args = [], []
+        if since is not None:
+            args.append(since)
+            conditions.append(f"n.published_date >= ${len(args)}")
+        if related_stocks:
+            args.append([str(s) for s in related_stocks])
+            conditions.append(f"n.related_stocks ?| ${len(args)}::text[]")
+        if related_sectors:
+            args.append(list(related_sectors))
+            conditions.append(f"n.related_sectors ?| ${len(args)}::text[]")
+
+        if query:
+            terms = query.split()
+            if not terms:
+                return []
+            # websearch syntax never fails to parse; any of the terms may match, like the SQLite backend
+            args.append(" or ".join(terms))
+            conditions.append(f"n.search @@ websearch_to_tsquery('simple', ${len(args)})")
+            order = (f"ts_rank('{self.RANK_WEIGHTS}', n.search, websearch_to_tsquery('simple', ${len(args)}))"
+                     f" / (1 + GREATEST(0, EXTRACT(EPOCH FROM now() - n.published_at)) / 86400.0"
+                     f" / {self.RECENCY_HALF_LIFE_DAYS}) DESC")
+        else:
+            order = "n.published_at DESC"
+
+        args.append(limit)
+        sql = f"""SELECT {self._NEWS_COLUMNS}
+                  FROM news AS n
+                  {'WHERE ' + ' AND '.join(conditions) if conditions else ''}
+                  ORDER BY {order}
+                  LIMIT ${len(args)}
+               """
+        try:
+            return [self._row_to_news(row) for row in self._fetch(sql, *args)]
+        except Exception as ex:
+            logger.error(f"Failed to search news: {ex}")
+            return []
+
+    def save_market_analysis(self, analysis: MarketAnalysis):
+        try:
+            self._pool.run(lambda conn: conn.execute("""
+                INSERT INTO market_analyses (
+                    analysis_date, sentiment_score, summary, primary_sectors, reasons,
+                    market_sentiment, trading_strategy, thought_process, cited_news_ids
+                ) VALUES ($1::text::date, $2, $3, $4, $5, $6, $7, $8, $9)
+                ON CONFLICT (analysis_date) DO UPDATE SET
+                    sentiment_score = EXCLUDED.sentiment_score, summary = EXCLUDED.summary,
+                    primary_sectors = EXCLUDED.primary_sectors, reasons = EXCLUDED.reasons,
+                    market_sentiment = EXCLUDED.market_sentiment, trading_strategy = EXCLUDED.trading_strategy,
+                    thought_process = EXCLUDED.thought_process, cited_news_ids = EXCLUDED.cited_news_ids,
+                    created_at = now()
+            """, *analysis_to_record(analysis)))
+        except Exception as e:
+            print(f"Failed to insert market analysis: {e}")
+
+    def get_market_analyses(self, start_date: datetime.date, end_date: datetime.date) -> List[MarketAnalysis]:
+        try:
+            rows = self._fetch("""
+                SELECT analysis_date, sentiment_score, summary, primary_sectors, reasons,
+                       market_sentiment, trading_strategy, thought_process, cited_news_ids
+                FROM market_analyses
+                WHERE analysis_date BETWEEN $1 AND $2
+                ORDER BY analysis_date
+            """, start_date, end_date)
+            return [analysis_from_record(row) for row in rows]
+        except Exception as ex:
+            logger.error(f"Failed to get market analyses: {ex}")
+            return []
+
+    def save_trade_strategies(self, strategy_date: datetime.date, strategies: List[TradeStrategy]):
+        if not strategies:
+            return
+
+        rows = [strategy_to_record(strategy_date, s) for s in strategies]
+
+        async def _replace(conn):
+            async with conn.transaction():
+                await conn.execute("DELETE FROM trade_strategies WHERE strategy_date = $1", strategy_date)
+                await conn.executemany("""
+                    INSERT INTO trade_strategies (
+                        strategy_date, symbol, action, confidence_score, entry_price, take_profit,
+                        stop_loss, reasoning, valid_until
+                    ) VALUES ($1::text::date, $2, $3, $4, $5, $6, $7, $8, $9::text::timestamptz)
+                    ON CONFLICT (strategy_date, symbol) DO UPDATE SET
+                        action = EXCLUDED.action, confidence_score = EXCLUDED.confidence_score,
+                        entry_price = EXCLUDED.entry_price, take_profit = EXCLUDED.take_profit,
+                        stop_loss = EXCLUDED.stop_loss, reasoning = EXCLUDED.reasoning,
+                        valid_until = EXCLUDED.valid_until, created_at = now()
+                """, rows)
+
+        try:
+            self._pool.run(_replace)
+        except Exception as e:
+            print(f"Failed to insert trade strategies: {e}")
+
+    def get_trade_strategies(self, start_date: datetime.date, end_date: datetime.date,
+                             symbol: Optional[str] = None) -> Dict[datetime.date, List[TradeStrategy]]:
+        query = """SELECT strategy_date, symbol, action, confidence_score, entry_price, take_profit,
+                          stop_loss, reasoning, valid_until
+                   FROM trade_strategies
+                   WHERE strategy_date BETWEEN $1 AND $2
+                """
+        args = [start_date, end_date]
+        if symbol is not None:
+            query += " AND symbol = $3"
+            args.append(str(symbol))
+        query += " ORDER BY strategy_date, symbol"
+
+        try:
+            strategies: Dict[datetime.date, List[TradeStrategy]] = {}
+            for row in self._fetch(query, *args):
+                strategy_date, strategy = strategy_from_record(row)
+                strategies.setdefault(strategy_date, []).append(strategy)
+            return strategies
+        except Exception as ex:
+            logger.error(f"Failed to get trade strategies: {ex}")
+            return {}
+
+    def get_all_symbols(self) -> List[str]:
+        try:
+            rows = self._fetch("""
+                SELECT s.symbol FROM symbols AS s
+                WHERE EXISTS (SELECT 1 FROM candles AS c WHERE c.symbol_id = s.symbol_id)
+            """)
+            return [row['symbol'] for row in rows]
+        except Exception as ex:
+            logger.error(f"Failed to get symbols: {ex}")
+            return []
+
+    def get_last_candle_date(self, symbol: str, interval: Interval) -> Optional[datetime.date]:
+        try:
+            rows = self._fetch(
+                """SELECT MAX(c.candle_ts) AS ts
+                   FROM symbols AS s JOIN candles AS c ON c.symbol_id = s.symbol_id
+                   WHERE s.symbol = $1 AND c.interval = $2""",
+                str(symbol), str(interval)
+            )
+            return _epoch_date(rows[0]['ts'])
+        except Exception as ex:
+            logger.error(f"Failed to get last candle date of {symbol}: {ex}")
+            return None
+
+    def get_first_candle_date(self, interval: Interval) -> Optional[datetime.date]:
+        try:
+            rows = self._fetch("SELECT MIN(candle_ts) AS ts FROM candles WHERE interval = $1", str(interval))
+            return _epoch_date(rows[0]['ts'])
+        except Exception as ex:
+            logger.error(f"Failed to get first candle date: {ex}")
+            return None
+
+    def get_month_candles(self, interval: Interval, year: int, month: int) -> pd.DataFrame:
+        start = datetime.date(year, month, 1)
+        end = datetime.date(year + month // 12, month % 12 + 1, 1)
+        rows = self._fetch(
+            """SELECT s.symbol, s.market_type, c.candle_ts AS candle_date_time,
+                      c.open_price, c.high_price, c.low_price, c.close_price, c.volume
+               FROM candles AS c JOIN symbols AS s ON s.symbol_id = c.symbol_id
+               WHERE c.interval = $1 AND c.candle_ts >= $2 AND c.candle_ts < $3""",
+            str(interval), _epoch(start), _epoch(end)
+        )
+        df = pd.DataFrame([dict(r) for r in rows], columns=[
+            'symbol', 'market_type', 'candle_date_time',
+            'open_price', 'high_price', 'low_price', 'close_price', 'volume'
+        ])
+        df['candle_date_time'] = pd.to_datetime(df['candle_date_time'], unit='s')
+        return df
+
+    def delete_candles_between(self, interval: Interval, start_date: datetime.date, before_date: datetime.date):
+        self._pool.run(lambda conn: conn.execute(
+            "DELETE FROM candles WHERE interval = $1 AND candle_ts >= $2 AND candle_ts < $3",
+            str(interval), _epoch(start_date), _epoch(before_date)
+        ))
+
+    def get_recent_candles(self, interval: Interval, count: int) -> pd.DataFrame:
+        query = """SELECT r.candle_ts AS candle_date_time, r.open_price, r.high_price, r.low_price,
+                          r.close_price, r.volume, s.market_type, r.interval, s.symbol
+                   FROM (
+                       SELECT *, ROW_NUMBER() OVER (
+                           PARTITION BY symbol_id ORDER BY candle_ts DESC
+                       ) AS recency
+                       FROM candles
+                       WHERE interval = $1
+                   ) AS r
+                   JOIN symbols AS s ON s.symbol_id = r.symbol_id
+                   WHERE r.recency <= $2
+                   ORDER BY s.symbol, r.candle_ts DESC
+                """
+        try:
+            rows = self._fetch(query, str(interval), count)
+            df = pd.DataFrame([dict(r) for r in rows], columns=[
+                'candle_date_time', 'open_price', 'high_price', 'low_price', 'close_price', 'volume',
+                'market_type', 'interval', 'symbol'
+            ])
+            df['candle_date_time'] = pd.to_datetime(df['candle_date_time'], unit='s')
+            return df
+        except Exception as ex:
+            logger.error(f"Failed to get recent candles: {ex}")
+            return pd.DataFrame()
+
+    def get_candle_columns(self, symbols: List[str], interval: Interval,
+                           start_date: datetime.date, end_date: datetime.date) -> np.ndarray:
+        # The ordinality of the unnested symbol array is the symbol's position in `symbols`
+        query = """SELECT w.ord - 1, c.candle_ts,
+                          COALESCE(c.open_price, 'NaN'), COALESCE(c.high_price, 'NaN'), COALESCE(c.low_price, 'NaN'),
+                          COALESCE(c.close_price, 'NaN'), COALESCE(c.volume::DOUBLE PRECISION, 'NaN')
+                   FROM unnest($1::text[]) WITH ORDINALITY AS w (symbol, ord)
+                   JOIN symbols AS s ON s.symbol = w.symbol
+                   JOIN candles AS c ON c.symbol_id = s.symbol_id
+                   WHERE c.interval = $2 AND c.candle_ts >= $3 AND c.candle_ts < $4
+                """
+        rows = self._fetch(query, [str(s) for s in symbols], str(interval), _epoch(start_date),
+                           _epoch(end_date + datetime.timedelta(days=1)))
+        return np.fromiter((tuple(r) for r in rows), dtype=CandleMatrix.COLUMNS_DTYPE, count=len(rows))
+
+    def get_candle_matrix(self, symbols: List[str], interval: Interval,
+                          start_date: datetime.date, end_date: datetime.date) -> CandleMatrix:
+        columns = self.get_candle_columns(symbols, interval, start_date, end_date)
+        return CandleMatrix.from_columns(columns, tuple(str(s) for s in symbols))
+
+    def get_indicator_state(self, symbol: str, interval: Interval) -> Optional[IndicatorState]:
+        try:
+            rows = self._fetch(
+                "SELECT state FROM indicator_states WHERE symbol = $1 AND interval = $2", str(symbol), str(interval)
+            )
+            return IndicatorState.from_dict(json.loads(rows[0]['state'])) if rows else None
+        except Exception as ex:
+            logger.error(f"Failed to get indicator state of {symbol}: {ex}")
+            return None
+
+    def get_indicator_states(self, interval: Interval) -> List[IndicatorState]:
+        try:
+            rows = self._fetch("SELECT state FROM indicator_states WHERE interval = $1", str(interval))
+            return [IndicatorState.from_dict(json.loads(row['state'])) for row in rows]
+        except Exception as ex:
+            logger.error(f"Failed to get indicator states: {ex}")
+            return []
+
+    def put_indicator_state(self, state: IndicatorState):
+        self.put_indicator_states([state])
+
+    def put_indicator_states(self, states: List[IndicatorState]):
+        if not states:
+            return
+
+        rows = [(s.symbol, s.interval, s.last_timestamp, json.dumps(s.to_dict())) for s in states]
+        self._pool.run(lambda conn: conn.executemany(
+            """
+            INSERT INTO indicator_states (symbol, interval, last_timestamp, state, updated_at)
+            VALUES ($1, $2, $3, $4::jsonb, now())
+            ON CONFLICT (symbol, interval) DO UPDATE SET
+                last_timestamp = EXCLUDED.last_timestamp, state = EXCLUDED.state, updated_at = now()
+            """,
+            rows
+        ))
+
+
+def _epoch(date: datetime.date) -> int:
+    return int(np.datetime64(date, 's').astype(np.int64))
+
+
+def _epoch_date(ts: Optional[int]) -> Optional[datetime.date]:
+    return None if ts is None else np.datetime64(ts, 's').astype('datetime64[D]').item()
@@ -0,0 +1,175 @@
+import json
+import datetime
+from enum import Enum
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.backend.domain.entities import MarketAnalysis, TradeStrategy
+from src.backend.domain.reference_data import MarketSentiment, TradingStrategy
+from src.backend.domain.value_objects import DataOHLCV
+
+
+PRICE_COLUMNS = ('open_price', 'high_price', 'low_price', 'close_price', 'volume')
+
+
+def iter_rows(*columns: np.ndarray) -> Iterator[tuple]:
+    """
+        Rows of equally long column arrays, for executemany / COPY.
+
+        Each column is turned into Python scalars by one C-level tolist() and the rows are
+        zipped lazily, so no object array and no list of row tuples is ever built; the driver
+        consumes the tuples as it binds them.
+    """
+    return zip(*(column.tolist() for column in columns))
+
+
+@dataclass
+class CandleColumns:
+    """
+        A batch of candles as typed column arrays: epoch seconds in int64, prices in float64
+        with NaN for missing values, labels as object arrays.
+    """
+    symbol: np.ndarray
+    market_type: np.ndarray
+    interval: np.ndarray
+    timestamp: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self):
+        return len(self.timestamp)
+
+    @property
+    def prices(self) -> List[np.ndarray]:
+        return [self.open, self.high, self.low, self.close, self.volume]
+
+    @classmethod
+    def from_frame(cls, data: pd.DataFrame) -> Optional["CandleColumns"]:
+        """
+            Reads an OHLCV DataFrame without modifying it. None when the key columns are missing.
+        """
+        if data.empty or not {'symbol', 'interval', 'candle_date_time'}.issubset(data.columns):
+            return None
+
+        size = len(data)
+        prices = [
+            pd.to_numeric(data[c], errors='coerce').to_numpy(np.float64) if c in data.columns
+            else np.full(size, np.nan)
+            for c in PRICE_COLUMNS
+        ]
+        if 'market_type' in data.columns:
+            market_type = data['market_type'].map(str, na_action='ignore').astype(object)
+            market_type = market_type.where(market_type.notna(), None).to_numpy(object)
+        else:
+            market_type = np.full(size, None, dtype=object)
+
+        return cls(
+            data['symbol'].astype(str).to_numpy(object),
+            market_type,
+            data['interval'].astype(str).to_numpy(object),
+            pd.to_datetime(data['candle_date_time']).to_numpy('datetime64[s]').astype(np.int64),
+            *prices,
+        )
+
+    @classmethod
+    def from_candles(cls, symbol: str, interval: str, candles: List[DataOHLCV],
+                     market_type: Optional[str] = None) -> "CandleColumns":
+        records = np.array(
+            [(c.timestamp, c.open, c.high, c.low, c.close, c.volume) for c in candles],
+            dtype=[('timestamp', np.int64), ('open', np.float64), ('high', np.float64),
+                   ('low', np.float64), ('close', np.float64), ('volume', np.float64)]
+        )
+        size = len(records)
+        return cls(
+            np.full(size, str(symbol), dtype=object),
+            np.full(size, None if market_type is None else str(market_type), dtype=object),
+            np.full(size, str(interval), dtype=object),
+            records['timestamp'],
+            records['open'], records['high'], records['low'], records['close'], records['volume'],
+        )
+
+    def market_types(self) -> Dict[str, Optional[str]]:
+        """
+            Market type of every symbol in the batch; the last known value wins.
+        """
+        frame = pd.DataFrame({'symbol': self.symbol, 'market_type': self.market_type})
+        known = frame.dropna().drop_duplicates('symbol', keep='last').set_index('symbol')['market_type']
+        return {symbol: known.get(symbol) for symbol in pd.unique(self.symbol)}
+
+
+def analysis_to_record(analysis: MarketAnalysis) -> tuple:
+    """
+        (analysis_date, sentiment_score, summary, primary_sectors, reasons, market_sentiment,
+        trading_strategy, thought_process, cited_news_ids) with dates as ISO text and lists as JSON.
+    """
+    return (
+        str(analysis.date)[:10],
+        analysis.sentiment_score,
+        analysis.summary,
+        json.dumps(analysis.primary_sectors or [], ensure_ascii=False),
+        analysis.reasons,
+        _enum_value(analysis.market_sentiment),
+        _enum_value(analysis.trading_strategy),
+        analysis.thought_process,
+        json.dumps(analysis.cited_news_ids or []),
+    )
+
+
+def analysis_from_record(record) -> MarketAnalysis:
+    return MarketAnalysis(
+        date=str(record[0])[:10],
+        sentiment_score=record[1],
+        summary=record[2],
+        primary_sectors=json.loads(record[3]),
+        reasons=record[4],
+        market_sentiment=MarketSentiment(record[5]) if record[5] else None,
+        trading_strategy=TradingStrategy(record[6]) if record[6] else None,
+        thought_process=record[7],
+        cited_news_ids=json.loads(record[8]),
+    )
+
+
+def strategy_to_record(strategy_date: datetime.date, strategy: TradeStrategy) -> tuple:
+    """
+        (strategy_date, symbol, action, confidence_score, entry_price, take_profit, stop_loss,
+        reasoning, valid_until) with dates as ISO text.
+    """
+    return (
+        strategy_date.isoformat(),
+        str(strategy.symbol),
+        _enum_value(strategy.action),
+        strategy.confidence_score,
+        strategy.entry_price,
+        strategy.take_profit,
+        strategy.stop_loss,
+        strategy.reasoning,
+        strategy.valid_until.isoformat() if strategy.valid_until else None,
+    )
+
+
+def strategy_from_record(record) -> Tuple[datetime.date, TradeStrategy]:
+    valid_until = record[8]
+    if isinstance(valid_until, str):
+        valid_until = datetime.datetime.fromisoformat(valid_until)
+    return datetime.date.fromisoformat(str(record[0])[:10]), TradeStrategy(
+        symbol=record[1],
+        action=TradingStrategy(record[2]),
+        confidence_score=record[3],
+        entry_price=record[4],
+        take_profit=record[5],
+        stop_loss=record[6],
+        reasoning=record[7],
+        valid_until=valid_until,
+    )
+
+
+def _enum_value(value) -> Optional[str]:
+    if value is None:
+        return None
+    return value.value if isinstance(value, Enum) else str(value)
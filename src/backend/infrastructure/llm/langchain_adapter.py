@@ -54,5 +54,6 @@ class LangChainAdapter(LLMOutputPort):
                 sentiment_score=0.0,
                 summary="Analysis Failed",
                 primary_sectors=[],
-                reasons=str(e)
+                reasons=str(e),
+                failed=True
             )
@@ -112,7 +112,8 @@ class StrategyGenerationGraph(LLMOutputPort):
                 primary_sectors=result.get('primary_sectors', []),
                 reasons=result.get('reasons', ""),
                 thought_process=result.get('thought_process', ""),
-                cited_news_ids=result.get('cited_news_ids', [])
+                cited_news_ids=result.get('cited_news_ids', []),
+                failed='summary' not in result
             )
             return {"analysis_dict": result, "market_analysis": analysis_entity}
         except Exception as e:
@@ -122,7 +123,8 @@ class StrategyGenerationGraph(LLMOutputPort):
                 sentiment_score=0.0,
                 summary=f"Error: {str(e)}",
                 primary_sectors=[],
-                reasons="System Error"
+                reasons="System Error",
+                failed=True
             )}
 
     async def _technical_screener_node(self, state: AgentState):
@@ -164,6 +166,9 @@ class StrategyGenerationGraph(LLMOutputPort):
                 continue
                 
             context_str = f"Symbol: {symbol}\nTechnical: {stock_ctx.get('technical_context')}\nMarket Sentiment: {market_analysis.summary if market_analysis else 'Neutral'}\nSectors: {market_analysis.primary_sectors if market_analysis else []}"
+            related_news = stock_ctx.get('related_news')
+            if related_news:
+                context_str += "\nRelated News:\n" + "\n---\n".join(related_news)
             
             try:
                 result = await self.strategy_chain.ainvoke({
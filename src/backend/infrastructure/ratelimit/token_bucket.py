@@ -0,0 +1,271 @@
+import time
+import asyncio
+import logging
+import threading
+from typing import Callable, Dict, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Upbit answers 418 once a client keeps ignoring its 429s
+THROTTLE_STATUS_CODES = (418, 429, 503)
+
+
+# Refills the bucket with the server clock and takes `requested` tokens if available.
+# Returns the seconds the caller has to wait before retrying (0 when granted) and the current rate.
+_ACQUIRE_SCRIPT = """
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated', 'rate')
+local rate = tonumber(state[3]) or tonumber(ARGV[1])
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens >= requested then
+    tokens = tokens - requested
+else
+    wait = (requested - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now, 'rate', rate)
+redis.call('EXPIRE', KEYS[1], 3600)
+return {tostring(wait), tostring(rate)}
+"""
+
+# Multiplies the shared rate by ARGV[3] and adds ARGV[4], clamped to [min, max].
+# A decrease is skipped while the previous one is younger than the cooldown,
+# so a burst of 429s from many workers only halves the rate once.
+_ADAPT_SCRIPT = """
+local min_rate = tonumber(ARGV[1])
+local max_rate = tonumber(ARGV[2])
+local factor = tonumber(ARGV[3])
+local increment = tonumber(ARGV[4])
+local cooldown = tonumber(ARGV[5])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'rate', 'backoff')
+local rate = tonumber(state[1]) or max_rate
+if factor < 1 then
+    if now - (tonumber(state[2]) or 0) < cooldown then
+        return tostring(rate)
+    end
+    redis.call('HSET', KEYS[1], 'backoff', now)
+end
+rate = math.max(min_rate, math.min(max_rate, rate * factor + increment))
+redis.call('HSET', KEYS[1], 'rate', rate)
+return tostring(rate)
+"""
+
+
+class _LocalBucketState:
+    """
+        Token bucket kept in process memory, shared by the threads of one worker.
+    """
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float]):
+        self._lock = threading.Lock()
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+        self._backoff = float("-inf")
+        self.rate = rate
+
+    def take(self, requested: float, capacity: float) -> float:
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(capacity, self._tokens + max(0.0, now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= requested:
+                self._tokens -= requested
+                return 0.0
+            return (requested - self._tokens) / self.rate
+
+    def adapt(self, min_rate: float, max_rate: float, factor: float, increment: float, cooldown: float) -> float:
+        with self._lock:
+            if factor < 1:
+                now = self._clock()
+                if now - self._backoff < cooldown:
+                    return self.rate
+                self._backoff = now
+            self.rate = max(min_rate, min(max_rate, self.rate * factor + increment))
+            return self.rate
+
+
+class _RedisBucketState:
+    """
+        Token bucket kept in a Redis hash so every worker draws from one budget.
+        Refill and adaptation run as Lua scripts, so they are atomic across the fleet.
+    """
+    def __init__(self, key: str, rate: float, redis_url: str):
+        try:
+            import redis
+        except ImportError as e:
+            raise ImportError("A shared rate limit requires the 'redis' package.") from e
+
+        self._key = key
+        self._client = redis.Redis.from_url(redis_url)
+        self._acquire = self._client.register_script(_ACQUIRE_SCRIPT)
+        self._adapt = self._client.register_script(_ADAPT_SCRIPT)
+        self.rate = rate
+
+    def take(self, requested: float, capacity: float) -> float:
+        wait, rate = self._acquire(keys=[self._key], args=[self.rate, capacity, requested])
+        self.rate = float(rate)
+        return float(wait)
+
+    def adapt(self, min_rate: float, max_rate: float, factor: float, increment: float, cooldown: float) -> float:
+        self.rate = float(self._adapt(keys=[self._key], args=[min_rate, max_rate, factor, increment, cooldown]))
+        return self.rate
+
+
+class ThrottledError(requests.RequestException):
+    """
+        An answer that asks the client to slow down, such as a 429 or DART's status "020" inside a 200.
+    """
+
+
+def raise_for_throttle(response: requests.Response):
+    """
+        Raises ThrottledError for a throttling status, so a check inside `call` records a throttle instead of a success.
+    """
+    if response.status_code in THROTTLE_STATUS_CODES:
+        raise ThrottledError(f"{response.status_code} from {response.url}", response=response)
+
+
+def is_throttle_error(error: BaseException) -> bool:
+    """
+        True for errors that mean the upstream wants us to slow down:
+        timeouts, throttling HTTP statuses and non-JSON bodies (KRX and DART answer a blocked client with an HTML page).
+    """
+    if isinstance(error, (TimeoutError, asyncio.TimeoutError, requests.Timeout, requests.ConnectionError)):
+        return True
+    if isinstance(error, (ThrottledError, requests.exceptions.JSONDecodeError)):
+        return True
+    response = getattr(error, "response", None)
+    status = getattr(error, "status", None) or getattr(response, "status_code", None)
+    return status in THROTTLE_STATUS_CODES
+
+
+class AdaptiveRateLimiter:
+    """
+        Token bucket with additive-increase / multiplicative-decrease of its refill rate.
+
+        The rate starts at `rate`, the provider's allowed request rate. Each throttle signal
+        (429, timeout) multiplies it by `decrease_factor`, and each success adds `increase`
+        until it is back at `rate`. With `redis_url` the bucket and the adapted rate are
+        shared by every process that uses the same `name`.
+    """
+    def __init__(
+            self,
+            name: str,
+            rate: float,
+            capacity: Optional[float] = None,
+            min_rate: Optional[float] = None,
+            increase: Optional[float] = None,
+            decrease_factor: float = 0.5,
+            cooldown: float = 1.0,
+            redis_url: Optional[str] = None,
+            clock: Callable[[], float] = time.monotonic,
+            sleep: Callable[[float], None] = time.sleep,
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be positive.")
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor must be between 0 and 1.")
+
+        self.name = name
+        self.max_rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.min_rate = min_rate if min_rate is not None else rate / 20
+        self.increase = increase if increase is not None else rate / 50
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        self._sleep = sleep
+
+        self._local = _LocalBucketState(rate, self.capacity, clock)
+        self._shared = _RedisBucketState(f"ratelimit:{name}", rate, redis_url) if redis_url else None
+
+    @property
+    def rate(self) -> float:
+        return self._state.rate
+
+    @property
+    def _state(self):
+        return self._shared or self._local
+
+    def _take(self, tokens: float) -> float:
+        if self._shared is not None:
+            try:
+                return self._shared.take(tokens, self.capacity)
+            except Exception as e:
+                # Keep collecting on the local budget rather than failing every request
+                logger.warning(f"Shared rate limit '{self.name}' unavailable, using local bucket: {e}")
+        return self._local.take(tokens, self.capacity)
+
+    def _adapt(self, factor: float, increment: float) -> float:
+        args = (self.min_rate, self.max_rate, factor, increment, self.cooldown)
+        if self._shared is not None:
+            try:
+                return self._shared.adapt(*args)
+            except Exception as e:
+                logger.warning(f"Shared rate limit '{self.name}' unavailable, adapting local bucket: {e}")
+        return self._local.adapt(*args)
+
+    def acquire(self, tokens: float = 1) -> None:
+        while (wait := self._take(tokens)) > 0:
+            self._sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1) -> None:
+        while (wait := self._take(tokens)) > 0:
+            await asyncio.sleep(wait)
+
+    def on_success(self) -> None:
+        if self._state.rate < self.max_rate:
+            self._adapt(1.0, self.increase)
+
+    def on_throttle(self) -> None:
+        previous = self._state.rate
+        rate = self._adapt(self.decrease_factor, 0.0)
+        if rate < previous:
+            logger.warning(f"Rate limit '{self.name}' throttled, backing off to {rate:.2f} req/s")
+
+    def call(self, func: Callable, *args, **kwargs):
+        """
+            Runs `func` inside the budget and feeds its outcome back into the rate.
+            A throttled answer has to raise inside `func` (see raise_for_throttle), or it counts as a success.
+        """
+        self.acquire()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            if is_throttle_error(e):
+                self.on_throttle()
+            raise
+        self.on_success()
+        return result
+
+
+_limiters: Dict[str, AdaptiveRateLimiter] = {}
+_limiters_lock = threading.Lock()
+_shared_state_url: Optional[str] = None
+
+
+def configure_shared_state(redis_url: Optional[str]) -> None:
+    """
+        Makes limiters created afterwards keep their bucket in Redis.
+    """
+    global _shared_state_url
+    _shared_state_url = redis_url
+
+
+def get_rate_limiter(name: str, rate: float, **kwargs) -> AdaptiveRateLimiter:
+    """
+        Returns the process-wide limiter for `name`, creating it on first use.
+    """
+    with _limiters_lock:
+        if name not in _limiters:
+            kwargs.setdefault("redis_url", _shared_state_url)
+            _limiters[name] = AdaptiveRateLimiter(name, rate, **kwargs)
+        return _limiters[name]
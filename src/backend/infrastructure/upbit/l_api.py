@@ -1,3 +1,4 @@
+import asyncio
 import requests
 import jwt
 import json
@@ -5,6 +6,8 @@ import time
 from urllib.parse import urlencode
 import aiohttp
 
+from src.backend.infrastructure.ratelimit.token_bucket import THROTTLE_STATUS_CODES, get_rate_limiter, raise_for_throttle
+
 
 class DepositStatus:
     SUBMITTING = "submitting"
@@ -34,10 +37,13 @@ class BaseTradeType:
 
 
 class UpbitAPI:
-    def __init__(self, key, secret):
+    DEFAULT_REQUESTS_PER_SECOND = 8.0
+
+    def __init__(self, key, secret, rate_limiter=None):
         self.__key = key
         self.__secret = secret
         self.__base_url = "https://api.upbit.com/v1"
+        self.__rate_limiter = rate_limiter or get_rate_limiter("upbit", self.DEFAULT_REQUESTS_PER_SECOND)
 
     def get_ticker(self, symbol):
         return self.__public_api("/ticker", {"markets": symbol})
@@ -97,7 +103,7 @@ class UpbitAPI:
     def get_coin_addresses(self):
         return self.__get_private_api("/deposits/coin_addresses")
 
-    def withdraws_info(self, coin):
+    async def withdraws_info(self, coin):
         return await self.__async_get_private_api("/withdraws/chance", {"currency": coin})
 
     def get_transaction_fee(self):
@@ -108,7 +114,7 @@ class UpbitAPI:
     def __public_api(self, path, extra=None):
         if extra is None:
             extra = dict()
-        return requests.get(self.__base_url + path, params=extra)
+        return self.__request(requests.get, self.__base_url + path, params=extra)
 
     def __header_generator(self):
         payload = {
@@ -127,7 +133,8 @@ class UpbitAPI:
     def __get_private_api(self, path, extra=None):
         extra = {"query": urlencode(extra)} if extra is not None else dict()
 
-        response = requests.get(
+        response = self.__request(
+            requests.get,
             url=self.__base_url + path,
             headers=self.__header_generator(),
             params=extra
@@ -138,7 +145,8 @@ class UpbitAPI:
     def __post_private_api(self, path, extra=None):
         extra = {"query": urlencode(extra)} if extra is not None else dict()
 
-        response = requests.post(
+        response = self.__request(
+            requests.post,
             url=self.__base_url + path,
             headers=self.__header_generator(),
             data=extra
@@ -146,31 +154,54 @@ class UpbitAPI:
 
         return response.json()
 
-    def __async_get_raw_api(self, url):
+    def __request(self, method, *args, **kwargs):
+        return self.__rate_limiter.call(self.__checked_request, method, *args, **kwargs)
+
+    @staticmethod
+    def __checked_request(method, *args, **kwargs):
+        # Checked inside the limiter's call, so a throttled or non-JSON answer is recorded once, as a throttle
+        response = method(*args, **kwargs)
+        raise_for_throttle(response)
+        response.json()
+        return response
+
+    async def __async_request(self, session, method, *args, **kwargs):
+        await self.__rate_limiter.acquire_async()
+        try:
+            response = await getattr(session, method)(*args, **kwargs)
+        except asyncio.TimeoutError:
+            self.__rate_limiter.on_throttle()
+            raise
+        if response.status in THROTTLE_STATUS_CODES:
+            self.__rate_limiter.on_throttle()
+        else:
+            self.__rate_limiter.on_success()
+        return json.loads(await response.text())
+
+    async def __async_get_raw_api(self, url):
         async with aiohttp.ClientSession() as session:
-            response = await session.get(url)
-            return json.loads(await response.text())
+            return await self.__async_request(session, "get", url)
 
-    def __async_get_private_api(self, path, extra=None):
+    async def __async_get_private_api(self, path, extra=None):
         extra = {"query": urlencode(extra)} if extra is not None else dict()
 
         async with aiohttp.ClientSession() as session:
-            response = await session.get(
+            return await self.__async_request(
+                session,
+                "get",
                 url=self.__base_url + path,
                 headers=self.__header_generator(),
                 params=extra
             )
 
-            return await json.loads(response.text())
-
-    def __async_post_private_api(self, path, extra=None):
+    async def __async_post_private_api(self, path, extra=None):
         extra = {"query": urlencode(extra)} if extra is not None else dict()
 
         async with aiohttp.ClientSession() as session:
-            response = await session.post(
+            return await self.__async_request(
+                session,
+                "post",
                 url=self.__base_url + path,
                 headers=self.__header_generator(),
                 data=extra
             )
-
-            return await json.loads(response.text())
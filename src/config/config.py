@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import SecretStr
+from typing import Optional
 import logging
 import sys
 from pathlib import Path
@@ -10,6 +11,8 @@ from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 STATIC_FOLDER_PATH = BASE_DIR / "statics"
 SQLITE_DB_FOLDER_PATH = BASE_DIR / "database"
+ARCHIVE_FOLDER_PATH = BASE_DIR / "database" / "archive"
+FEED_STATE_PATH = BASE_DIR / "database" / "feed_state.json"
 LOG_DIR = BASE_DIR / "logs"
 
 
@@ -17,9 +20,14 @@ class Settings(BaseSettings):
     app_name: str = "StockTrader"
 
     # 1. DB Settings
+    # "sqlite" keeps everything in database/main.db; "postgres" uses the server below
+    database_backend: str = "sqlite"
     db_host: str
     db_user: str
     db_password: SecretStr
+    db_port: int = 5432
+    db_name: str = "trading"
+    db_pool_size: int = 10
 
     # 2. Important key settings
     open_dart_key: SecretStr
@@ -35,6 +43,15 @@ class Settings(BaseSettings):
     # 4. LangSmith Settings
     lang_smith_api_key: str
 
+    # 5. Rate limit Settings
+    # Redis shared by every worker for one request budget per provider; None keeps it per process
+    rate_limit_redis_url: Optional[str] = None
+    pykrx_requests_per_second: float = 2.0
+
+    # 6. Candle write buffer Settings
+    # Redis list shared by every worker; None writes the candles of each task directly
+    candle_buffer_redis_url: Optional[str] = None
+
     environment: str = "development"
 
     model_config = SettingsConfigDict(
@@ -0,0 +1,47 @@
+"""
+    Compares the article body extractors on article pages.
+
+    python -m src.scripts.bench_article_extraction [repeat] [page.html ...]
+
+    Without pages it times the fixtures in tests/infrastructure/fixtures. Those are synthetic
+    stand-ins with the body near the top of the page, where the streaming parser stops early,
+    so their timings overstate the gain; measure on real saved MK / HK pages before quoting a speedup.
+"""
+import sys
+import timeit
+from pathlib import Path
+from typing import List
+
+from src.backend.infrastructure.crawler.extractor import ExtractionRule, SoupExtractor, StreamingExtractor
+
+FIXTURE_DIR = Path(__file__).resolve().parents[2] / "tests" / "infrastructure" / "fixtures"
+
+RULES = (
+    ExtractionRule("div", "news_cnt_detail_wrap"),  # MK
+    ExtractionRule("div", "article-body"),  # HK
+)
+
+
+def _rule_for(html: str) -> ExtractionRule:
+    for rule in RULES:
+        if SoupExtractor(rule).extract(html) is not None:
+            return rule
+    raise SystemExit("page has no known article body container")
+
+
+def main(repeat: int = 200, pages: List[Path] = ()):
+    for path in pages or sorted(FIXTURE_DIR.glob("*.html")):
+        html = Path(path).read_text(encoding="utf-8")
+        rule = _rule_for(html)
+        soup, streaming = SoupExtractor(rule), StreamingExtractor(rule)
+        if soup.extract(html) != streaming.extract(html):
+            raise SystemExit(f"{path}: extractors disagree")
+
+        soup_ms = min(timeit.repeat(lambda: soup.extract(html), number=repeat, repeat=3)) / repeat * 1000
+        streaming_ms = min(timeit.repeat(lambda: streaming.extract(html), number=repeat, repeat=3)) / repeat * 1000
+        print(f"{Path(path).name} ({len(html) // 1024} KiB): BeautifulSoup {soup_ms:.2f} ms, "
+              f"streaming lxml {streaming_ms:.2f} ms, {soup_ms / streaming_ms:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200, [Path(p) for p in sys.argv[2:]])
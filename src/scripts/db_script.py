@@ -10,64 +10,8 @@ import re
 
 import sqlite3
 
-
-def setup_news_database(db_path):
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    qry = """
-        CREATE TABLE IF NOT EXISTS news (
-        id TEXT PRIMARY KEY,
-        title TEXT,
-        content TEXT,
-        published_at TEXT,
-        source TEXT,
-        url TEXT,
-        related_stocks TEXT,   -- JSON String으로 저장
-        related_sectors TEXT,  -- JSON String으로 저장
-        sentiment_score REAL DEFAULT 0.0,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """
-    cursor.execute(qry)
-
-    conn.commit()
-    conn.close()
-
-
-def setup_ohlcv_database(db_path):
-    """데이터베이스와 테이블을 초기 설정합니다. 테이블이 이미 존재하면 만들지 않습니다."""
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-
-    create_table_sql = """
-        CREATE TABLE IF NOT EXISTS ohlcv_candles (
-            symbol TEXT NOT NULL,           -- 종목 코드
-            market_type TEXT,                   -- 시장 구분 (KOSPI, KOSDAQ 등)
-            interval TEXT NOT NULL,             -- 캔들 간격 (day, week, month 등)
-            candle_date_time TEXT NOT NULL,     -- 캔들 기준 시각 (YYYY-MM-DD or YYYY-MM-DD HH:MM:SS)
-            
-            open_price REAL,                    -- 시가
-            high_price REAL,                    -- 고가
-            low_price REAL,                     -- 저가
-            close_price REAL,                   -- 종가
-            volume INTEGER,                     -- 거래량
-            
-            rsi REAL,                           
-            ema REAL,
-            sma REAL,
-            
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            PRIMARY KEY (symbol, interval, candle_date_time)
-        );
-    """
-    cursor.execute(create_table_sql)
-    
-    # 검색 속도 향상을 위한 인덱스 생성
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_ohlcv_stock_date ON ohlcv_candles (symbol, candle_date_time);")
-    
-    conn.commit()
-    conn.close()
-    print(f"OHLCV 데이터베이스 '{db_path}' 및 'ohlcv_candles' 테이블이 준비되었습니다.")
+from src.backend.infrastructure.db.database_api import SQLiteDatabase
+from src.backend.infrastructure.db.migrations import apply_migrations
 
 
 def setup_database(db_path):
@@ -305,7 +249,7 @@ def insert_stocks():
 
 # --- 메인 실행 부분 ---
 if __name__ == "__main__":
-    setup_news_database("../../database/main.db")
-    setup_ohlcv_database("../../database/main.db")
+    # main.db 스키마는 앱 시작 시 migrations.apply_migrations로 적용됩니다
+    apply_migrations(SQLiteDatabase.SQLITE_PATH)
     # setup_database("./financial_data.db")
     # test_code()
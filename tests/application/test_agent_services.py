@@ -0,0 +1,200 @@
+import datetime
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backend.application.agent_services import StrategyGenerationService
+from src.backend.application.scheduler_services import to_ohlcv_candles
+from src.backend.domain.entities import IndicatorState
+from src.backend.domain.reference_data import Interval
+from src.backend.domain.services import IndicatorService
+
+
+def _candle_history(target, interval, count, drop_every=0):
+    """pykrx 어댑터와 같은 형식(최신순)의 가짜 캔들 데이터"""
+    rng = np.random.default_rng(int(target))
+    dates = pd.bdate_range(end="2026-02-03", periods=count + 60)
+    if drop_every:
+        # 종목마다 다른 휴장일
+        dates = dates[(np.arange(len(dates)) + int(target)) % drop_every != 0]
+    dates = dates[-count:]
+    close = np.cumprod(1 + rng.normal(0, 0.02, count)) * 100
+    df = pd.DataFrame({"candle_date_time": dates, "close_price": close})
+    return df.sort_values("candle_date_time", ascending=False).reset_index(drop=True)
+
+
+class _OverlapCounter:
+    """동시에 실행 중인 조회 수의 최댓값을 기록하는 가짜 캔들 조회"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    def __call__(self, target, interval, count):
+        with self._lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            time.sleep(0.05)
+            return _candle_history(target, interval, count)
+        finally:
+            with self._lock:
+                self.running -= 1
+
+
+@pytest.mark.asyncio
+async def test_candle_histories_are_loaded_concurrently():
+    """종목별 캔들 조회가 동시에 실행되고 모든 종목이 스크리닝되는지 테스트"""
+    # Given
+    symbols = [f"{i:06d}" for i in range(40)]
+    fetcher = _OverlapCounter()
+    market_port = MagicMock()
+    market_port.get_candle_history.side_effect = fetcher
+
+    service = StrategyGenerationService(MagicMock(), MagicMock(), market_port, max_concurrency=20)
+
+    # When
+    contexts = await service._load_market_contexts(symbols)
+
+    # Then
+    assert fetcher.max_running > 1
+    assert sorted(contexts) == symbols
+    assert market_port.get_candle_history.call_count == len(symbols)
+
+
+@pytest.mark.asyncio
+async def test_market_context_does_not_depend_on_arrival_batch():
+    """휴장일이 다른 종목들이 한 번에 도착해도 종목 자신의 캔들로 계산한 지표와 같은지 테스트"""
+    # Given
+    symbols = [f"{i:06d}" for i in range(1, 9)]
+    arrive_together = threading.Barrier(len(symbols))
+
+    def candle_history(target, interval, count):
+        arrive_together.wait()
+        return _candle_history(target, interval, count, drop_every=7)
+
+    market_port = MagicMock()
+    market_port.get_candle_history.side_effect = candle_history
+    service = StrategyGenerationService(MagicMock(), MagicMock(), market_port, max_concurrency=len(symbols))
+
+    # When
+    contexts = await service._load_market_contexts(symbols)
+
+    # Then
+    for sym in symbols:
+        close = _candle_history(sym, None, 150, drop_every=7).sort_values("candle_date_time")["close_price"]
+        sma = IndicatorService.get_simple_moving_average_lines(close)
+        ema = IndicatorService.get_exponential_moving_average_lies(close)
+        rsi = IndicatorService.get_relative_strength_index(close)
+        assert contexts[sym].sma.sma_120 == pytest.approx(sma.sma_120)
+        assert contexts[sym].ema.ema_20 == pytest.approx(ema.ema_20)
+        assert contexts[sym].rsi.rsi_14 == pytest.approx(rsi.rsi_14)
+
+
+def test_related_news_are_searched_per_candidate():
+    """후보 종목마다 관련 뉴스만 검색해 중복 없이 붙이는지 테스트"""
+    # Given
+    article = MagicMock(id="a", title="삼성전자 실적", content="반도체")
+    db_port = MagicMock()
+    db_port.search_news.side_effect = [[article], [article, MagicMock(id="b", title="메모리", content=None)]]
+    market_port = MagicMock()
+    market_port.get_symbol_name.return_value = "삼성전자"
+    service = StrategyGenerationService(MagicMock(), db_port, market_port, news_per_candidate=5)
+
+    # When
+    related = service._related_news("005930", datetime.date(2026, 10, 18))
+
+    # Then
+    assert related == ["삼성전자 실적\n반도체", "메모리\n"]
+    assert db_port.search_news.call_args_list[0].kwargs["query"] == "삼성전자"
+    assert db_port.search_news.call_args_list[1].kwargs["related_stocks"] == ["005930"]
+
+
+def test_related_news_fall_back_to_symbol_without_name():
+    """종목명을 모르면 종목 코드로 관련 뉴스를 검색하는지 테스트"""
+    # Given
+    db_port = MagicMock()
+    db_port.search_news.return_value = []
+    market_port = MagicMock()
+    market_port.get_symbol_name.return_value = None
+    service = StrategyGenerationService(MagicMock(), db_port, market_port)
+
+    # When
+    service._related_news("005930", datetime.date(2026, 10, 18))
+
+    # Then
+    assert db_port.search_news.call_args_list[0].kwargs["query"] == "005930"
+
+
+@pytest.mark.asyncio
+async def test_market_news_sent_to_llm_are_capped():
+    """시장 분석에는 최신 뉴스 market_news_limit건만 보내는지 테스트"""
+    # Given
+    db_port = MagicMock()
+    db_port.search_news.return_value = [MagicMock(id=str(i), title="제목", content=f"뉴스 {i}") for i in range(3)]
+    db_port.get_all_symbols.return_value = ["005930"]
+    db_port.get_indicator_states.return_value = []
+    market_port = MagicMock()
+    market_port.get_candle_history.side_effect = _candle_history
+    llm_port = MagicMock()
+    llm_port.generate_strategies = AsyncMock(return_value=[])
+    service = StrategyGenerationService(llm_port, db_port, market_port, market_news_limit=3)
+
+    # When
+    with patch("src.backend.domain.specifications.default_screening_rule") as rule:
+        rule.return_value.is_satisfied_by.return_value = True
+        await service.run_strategy_generation()
+
+    # Then
+    assert db_port.search_news.call_args_list[0].kwargs["limit"] == 3
+    news_contents, stock_analyses = llm_port.generate_strategies.call_args.args
+    assert news_contents == ["뉴스 0", "뉴스 1", "뉴스 2"]
+    assert [a["symbol"] for a in stock_analyses] == ["005930"]
+
+
+def _warm_state(symbol, last_date):
+    """last_date 까지의 캔들 150개를 반영한 지표 상태"""
+    history = _candle_history(symbol, "day", 150)
+    history = history.assign(
+        candle_date_time=pd.bdate_range(end=last_date, periods=150)[::-1], symbol=symbol, interval="day",
+        open_price=history["close_price"], high_price=history["close_price"], low_price=history["close_price"],
+        volume=1.0,
+    )
+    state = IndicatorState(symbol=symbol, interval="day")
+    for candle in to_ohlcv_candles(history):
+        state.update(candle)
+    return state
+
+
+@pytest.mark.asyncio
+async def test_stale_indicator_state_is_reloaded():
+    """최근 영업일 캔들이 반영되지 않은 지표 상태는 쓰지 않고 캔들을 다시 조회하는지 테스트"""
+    # Given: 005930 은 최근 영업일(2/3)까지, 000660 은 1/20 에서 수집이 멈췄다
+    db_port = MagicMock()
+    db_port.search_news.return_value = []
+    db_port.get_all_symbols.return_value = ["005930", "000660"]
+    db_port.get_indicator_states.return_value = [
+        _warm_state("005930", "2026-02-03"), _warm_state("000660", "2026-01-20"),
+    ]
+    market_port = MagicMock()
+    market_port.get_window_start.return_value = datetime.date(2026, 2, 3)
+    market_port.get_symbol_name.return_value = None
+    market_port.get_candle_history.side_effect = _candle_history
+    llm_port = MagicMock()
+    llm_port.generate_strategies = AsyncMock(return_value=[])
+    service = StrategyGenerationService(llm_port, db_port, market_port)
+
+    # When
+    with patch("src.backend.domain.specifications.default_screening_rule") as rule:
+        rule.return_value.is_satisfied_by.return_value = True
+        await service.run_strategy_generation()
+
+    # Then
+    market_port.get_window_start.assert_called_once_with(Interval.DAY, 1, datetime.datetime.now().date())
+    assert [c.args[0] for c in market_port.get_candle_history.call_args_list] == ["000660"]
+    _, stock_analyses = llm_port.generate_strategies.call_args.args
+    assert sorted(a["symbol"] for a in stock_analyses) == ["000660", "005930"]
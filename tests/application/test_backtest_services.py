@@ -0,0 +1,85 @@
+import datetime
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from src.backend.application.backtest_services import (
+    StrategySweepService,
+    grid_strategy_configs,
+    random_strategy_configs,
+)
+from src.backend.domain.services import BacktestEngine
+from src.backend.domain.specifications import threshold_screening_rule
+from src.backend.domain.value_objects import CandleMatrix, ExitRule, StrategyConfig
+
+
+@pytest.fixture
+def candles():
+    rng = np.random.default_rng(11)
+    close = np.cumprod(1 + rng.normal(0, 0.03, (300, 8)), axis=0) * 100
+    return CandleMatrix(
+        dates=np.arange(300).astype("datetime64[D]"),
+        symbols=tuple(f"{i:06d}" for i in range(8)),
+        open=close.copy(),
+        high=close * 1.02,
+        low=close * 0.98,
+        close=close,
+        volume=np.ones(close.shape),
+    )
+
+
+def test_grid_skips_invalid_configs():
+    """StrategyConfig 검증에 실패하는 조합은 제외하는지 테스트"""
+    configs = grid_strategy_configs([20, 30, 60], [70, 40], [5, 20])
+
+    assert [(c.rsi_oversold_limit, c.rsi_overbought_limit, c.sharp_drop_limit) for c in configs] == [
+        (20, 70, 5), (30, 70, 5)
+    ]
+
+
+def test_random_configs_are_reproducible():
+    """같은 seed로 같은 조합을 생성하는지 테스트"""
+    assert random_strategy_configs(5, seed=1) == random_strategy_configs(5, seed=1)
+
+
+def test_sweep_matches_single_process_backtest(candles):
+    """프로세스 풀 결과가 단일 프로세스 백테스트와 같고 정렬되어 있는지 테스트"""
+    # Given
+    database_port = MagicMock()
+    database_port.get_candle_matrix.return_value = candles
+    exit_rule = ExitRule(take_profit_pct=0.05, stop_loss_pct=0.03, max_holding_bars=10)
+    configs = grid_strategy_configs([20, 30, 40], [70], [10])
+
+    # When
+    ranked = StrategySweepService(database_port, max_workers=2).execute(
+        list(candles.symbols), datetime.date(2020, 1, 1), datetime.date(2020, 12, 31), configs, exit_rule
+    )
+
+    # Then
+    engine = BacktestEngine(candles, exit_rule)
+    expected = {c: engine.run(threshold_screening_rule(c)) for c in configs}
+    assert {r.config: r.result for r in ranked} == expected
+    returns = [r.result.total_return for r in ranked]
+    assert returns == sorted(returns, reverse=True)
+
+
+@pytest.mark.parametrize("configs", [
+    grid_strategy_configs([30], [51, 70], [10]),
+    grid_strategy_configs([30], [70], [0, 10]),
+])
+def test_every_swept_field_changes_the_results(candles, configs):
+    """과매수/급락 기준만 바꿔도 스윕 결과가 달라지는지 테스트"""
+    # Given
+    database_port = MagicMock()
+    database_port.get_candle_matrix.return_value = candles
+    exit_rule = ExitRule(take_profit_pct=0.05, stop_loss_pct=0.03, max_holding_bars=10)
+
+    # When
+    ranked = StrategySweepService(database_port, max_workers=1).execute(
+        list(candles.symbols), datetime.date(2020, 1, 1), datetime.date(2020, 12, 31), configs, exit_rule
+    )
+
+    # Then
+    first, second = (r.result for r in ranked)
+    assert first.trades != second.trades
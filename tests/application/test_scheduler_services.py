@@ -0,0 +1,106 @@
+import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pandas as pd
+
+from src.backend.application.scheduler_services import CollectMarketDataService, NewsAnalysisService, to_ohlcv_candles
+from src.backend.domain.entities import IndicatorState, MarketAnalysis
+from src.backend.domain.reference_data import StockMarketType
+
+
+def _snapshot(day, symbols):
+    """pykrx 어댑터와 같은 형식의 하루치 시장 스냅샷 (휴장일은 빈 DataFrame)"""
+    if day.weekday() >= 5:
+        return pd.DataFrame()
+    return pd.DataFrame({
+        "symbol": symbols, "open_price": 1.0, "high_price": 1.0, "low_price": 1.0, "close_price": 1.0,
+        "volume": 10, "candle_date_time": pd.Timestamp(day), "interval": "day", "market_type": "KOSPI",
+    })
+
+
+def _state(symbol, last_date):
+    state = IndicatorState(symbol=symbol, interval="day")
+    state.update(to_ohlcv_candles(_snapshot(last_date, [symbol]))[0])
+    return state
+
+
+class TestMarketSnapshot:
+    def test_missed_days_are_collected(self):
+        """지난 실행에서 빠진 거래일까지 스냅샷으로 채우는지 테스트"""
+        # Given: 목요일(10/15) 이후 수집되지 않았다
+        target_date = datetime.date(2026, 10, 20)
+        database_port = MagicMock()
+        database_port.get_indicator_states.return_value = [_state("005930", datetime.date(2026, 10, 15))]
+        market_port = MagicMock()
+        market_port.get_market_snapshot.side_effect = lambda market, day: _snapshot(day, ["005930", "000660"])
+        service = CollectMarketDataService(market_port, database_port)
+
+        # When
+        per_ticker = service.execute_snapshot(StockMarketType.KOSPI, ["005930", "000660"], target_date)
+
+        # Then
+        fetched_days = [c.args[1] for c in market_port.get_market_snapshot.call_args_list]
+        assert fetched_days == [datetime.date(2026, 10, d) for d in range(16, 21)]
+        saved = database_port.put_ohlcv_to_database.call_args.args[0]
+        assert sorted(saved['candle_date_time'].dt.day) == [16, 19, 20]
+        assert set(saved['symbol']) == {"005930"}
+        (state,) = database_port.put_indicator_states.call_args.args[0]
+        assert state.last_timestamp == to_ohlcv_candles(_snapshot(target_date, ["005930"]))[0].timestamp
+        assert per_ticker == ["000660"]
+
+    def test_far_behind_symbols_are_synced_per_ticker(self):
+        """SNAPSHOT_CATCH_UP_DAYS보다 오래 밀린 종목은 스냅샷에서 빼고 종목별 동기화로 넘기는지 테스트"""
+        # Given
+        target_date = datetime.date(2026, 10, 20)
+        database_port = MagicMock()
+        database_port.get_indicator_states.return_value = [
+            _state("005930", datetime.date(2026, 10, 19)),
+            _state("000660", datetime.date(2026, 9, 1)),
+        ]
+        market_port = MagicMock()
+        market_port.get_market_snapshot.side_effect = lambda market, day: _snapshot(day, ["005930", "000660"])
+        service = CollectMarketDataService(market_port, database_port)
+
+        # When
+        per_ticker = service.execute_snapshot(StockMarketType.KOSPI, ["005930", "000660"], target_date)
+
+        # Then
+        assert [c.args[1] for c in market_port.get_market_snapshot.call_args_list] == [target_date]
+        assert set(database_port.put_ohlcv_to_database.call_args.args[0]['symbol']) == {"005930"}
+        assert per_ticker == ["000660"]
+
+
+class TestNewsAnalysis:
+    async def test_failed_analysis_is_not_saved(self):
+        """LLM 분석이 실패하면 저장된 그날의 분석을 덮어쓰지 않는지 테스트"""
+        # Given
+        database_port = MagicMock()
+        database_port.get_news_by_date.return_value = ["news"]
+        llm_port = MagicMock()
+        llm_port.analyze_market = AsyncMock(return_value=MarketAnalysis(
+            date="2026-10-18", sentiment_score=0.0, summary="Analysis Failed", primary_sectors=[],
+            reasons="timeout", failed=True,
+        ))
+
+        # When
+        result = await NewsAnalysisService(database_port, llm_port).execute()
+
+        # Then
+        assert result == "Analysis Failed"
+        database_port.save_market_analysis.assert_not_called()
+
+    async def test_successful_analysis_is_saved(self):
+        """정상 분석은 저장되는지 테스트"""
+        # Given
+        analysis = MarketAnalysis(date="2026-10-18", sentiment_score=0.4, summary="반도체 강세",
+                                  primary_sectors=["반도체"], reasons="")
+        database_port = MagicMock()
+        database_port.get_news_by_date.return_value = ["news"]
+        llm_port = MagicMock()
+        llm_port.analyze_market = AsyncMock(return_value=analysis)
+
+        # When
+        await NewsAnalysisService(database_port, llm_port).execute()
+
+        # Then
+        database_port.save_market_analysis.assert_called_once_with(analysis)
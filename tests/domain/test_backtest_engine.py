@@ -0,0 +1,143 @@
+import numpy as np
+import pytest
+
+from src.backend.domain.entities import TradeStrategy
+from src.backend.domain.reference_data import TradingStrategy
+from src.backend.domain.services import BacktestEngine
+from src.backend.domain.specifications import RsiOverSoldSpec, TrendAndPerfectOrderSpec
+from src.backend.domain.value_objects import CandleMatrix, ExitRule
+
+
+@pytest.fixture
+def candles():
+    rng = np.random.default_rng(3)
+    close = np.cumprod(1 + rng.normal(0, 0.025, (400, 12)), axis=0) * 100
+    high = close * (1 + rng.uniform(0, 0.03, close.shape))
+    low = close * (1 - rng.uniform(0, 0.03, close.shape))
+    return CandleMatrix(
+        dates=np.arange(400).astype("datetime64[D]"),
+        symbols=tuple(f"{i:06d}" for i in range(12)),
+        open=close.copy(),
+        high=high,
+        low=low,
+        close=close,
+        volume=np.ones(close.shape),
+    )
+
+
+def _reference_trade(candles, bar, col, exit_rule):
+    """봉 단위 루프로 계산한 기준 결과 (종목 자신의 캔들로 보유 기간을 센다)"""
+    own_rows = np.flatnonzero(~np.isnan(candles.close[:, col]))
+    following = own_rows[own_rows > bar][:exit_rule.max_holding_bars]
+    entry = candles.close[bar, col]
+    long = exit_rule.action == TradingStrategy.LONG
+    for row in following:
+        high, low = candles.high[row, col], candles.low[row, col]
+        stop = low <= entry * (1 - exit_rule.stop_loss_pct) if long else high >= entry * (1 + exit_rule.stop_loss_pct)
+        target = high >= entry * (1 + exit_rule.take_profit_pct) if long else low <= entry * (1 - exit_rule.take_profit_pct)
+        if stop:
+            return -exit_rule.stop_loss_pct
+        if target:
+            return exit_rule.take_profit_pct
+    change = candles.close[following[-1], col] / entry - 1
+    return change if long else -change
+
+
+@pytest.mark.parametrize("action", [TradingStrategy.LONG, TradingStrategy.SHORT])
+def test_trade_outcomes_match_bar_by_bar_loop(candles, action):
+    """벡터화된 청산 시뮬레이션이 봉 단위 루프와 같은지 테스트"""
+    # Given
+    exit_rule = ExitRule(take_profit_pct=0.05, stop_loss_pct=0.03, max_holding_bars=10, action=action)
+
+    # When
+    engine = BacktestEngine(candles, exit_rule)
+
+    # Then
+    for bar in (0, 57, 200, 389, 395):
+        for col in range(len(candles.symbols)):
+            assert engine.trade_returns[bar, col] == pytest.approx(_reference_trade(candles, bar, col, exit_rule))
+    # 마지막 캔들에서는 청산할 다음 캔들이 없다
+    assert np.isnan(engine.trade_returns[399]).all()
+
+
+def test_run_summarizes_signal_onsets(candles):
+    """규칙이 새로 충족된 봉에서만 진입하여 결과를 집계하는지 테스트"""
+    # Given
+    exit_rule = TradeStrategy(
+        symbol="000000", action=TradingStrategy.LONG, confidence_score=1.0,
+        entry_price=100.0, take_profit=106.0, stop_loss=97.0,
+    ).exit_rule(max_holding_bars=15)
+    engine = BacktestEngine(candles, exit_rule)
+    rule = RsiOverSoldSpec() | TrendAndPerfectOrderSpec()
+
+    # When
+    result = engine.run(rule)
+
+    # Then
+    signals = rule.satisfied_mask(engine.panel)
+    onsets = signals & ~np.vstack([np.zeros((1, signals.shape[1]), bool), signals[:-1]])
+    warm = ~np.isnan(engine.panel.sma_120)
+    expected = engine.trade_returns[onsets & warm & ~np.isnan(engine.trade_returns)]
+    assert result.trades == expected.size > 0
+    assert result.total_return == pytest.approx(expected.sum())
+    assert result.hit_rate == pytest.approx(np.mean(expected > 0))
+    assert result.max_drawdown >= 0.0
+
+
+def test_symbols_on_different_calendars_trade_after_gaps(candles):
+    """거래일이 다른 종목도 빈 날짜 직후부터 자기 캔들 기준으로 진입하는지 테스트"""
+    # Given: 절반의 종목은 거래하지 않은 날짜가 섞여 있다
+    rng = np.random.default_rng(11)
+    close = candles.close.copy()
+    for col in range(6, 12):
+        close[rng.choice(np.arange(20, 380), size=25, replace=False), col] = np.nan
+    misaligned = CandleMatrix(candles.dates, candles.symbols, candles.open, candles.high, candles.low, close,
+                              candles.volume)
+    exit_rule = ExitRule(take_profit_pct=0.05, stop_loss_pct=0.03, max_holding_bars=10, action=TradingStrategy.LONG)
+    engine = BacktestEngine(misaligned, exit_rule)
+    rule = RsiOverSoldSpec() | TrendAndPerfectOrderSpec()
+
+    # When
+    result = engine.run(rule)
+
+    # Then: 자기 캔들 120개 이후로는 빈 날짜 뒤에도 SMA120이 있다
+    for col in range(6, 12):
+        own_rows = np.flatnonzero(~np.isnan(close[:, col]))
+        assert not np.isnan(engine.panel.sma_120[own_rows[119:], col]).any()
+
+    # 진입 시점은 각 종목의 직전 캔들과 비교해 규칙이 새로 충족된 캔들이다
+    signals = rule.satisfied_mask(engine.panel)
+    expected = []
+    for col in range(len(candles.symbols)):
+        previous = False
+        for bar in np.flatnonzero(~np.isnan(close[:, col])):
+            held = bool(signals[bar, col])
+            if held and not previous and not np.isnan(engine.panel.sma_120[bar, col]) \
+                    and not np.isnan(engine.trade_returns[bar, col]):
+                expected.append(engine.trade_returns[bar, col])
+            previous = held
+    assert result.trades == len(expected) > 0
+    assert result.total_return == pytest.approx(sum(expected))
+
+
+def test_gaps_at_exit_bars_keep_the_trade(candles):
+    """청산 봉 날짜에 캔들이 없는 종목도 거래가 빠지지 않고 자기 캔들 기준으로 청산되는지 테스트"""
+    # Given: 절반의 종목은 7일마다 캔들이 없어, 공용 달력 기준 시간 청산 봉이 비는 진입이 있다
+    close = candles.close.copy()
+    close[::7, 6:] = np.nan
+    gapped = CandleMatrix(candles.dates, candles.symbols, candles.open, candles.high, candles.low, close,
+                          candles.volume)
+    exit_rule = ExitRule(take_profit_pct=0.5, stop_loss_pct=0.5, max_holding_bars=5, action=TradingStrategy.LONG)
+
+    # When
+    engine = BacktestEngine(gapped, exit_rule)
+
+    # Then: 자기 캔들이 있는 모든 봉(마지막 캔들 제외)에 거래 결과가 있다
+    for col in range(6, 12):
+        own_rows = np.flatnonzero(~np.isnan(close[:, col]))
+        assert not np.isnan(engine.trade_returns[own_rows[:-1], col]).any()
+        assert np.isnan(engine.trade_returns[own_rows[-1], col])
+        for bar in own_rows[::13]:
+            assert engine.trade_returns[bar, col] == pytest.approx(_reference_trade(gapped, bar, col, exit_rule))
+            # 다섯 번째 자기 캔들에서 시간 청산한다
+            assert engine.exit_bars[bar, col] == own_rows[min(np.searchsorted(own_rows, bar) + 5, own_rows.size - 1)]
@@ -0,0 +1,104 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backend.domain.entities import IndicatorState
+from src.backend.domain.services import IndicatorService
+from src.backend.domain.value_objects import DataOHLCV
+
+
+@pytest.fixture
+def price_matrix():
+    rng = np.random.default_rng(42)
+    prices = np.cumprod(1 + rng.normal(0, 0.02, (200, 6)), axis=0) * 100
+    df = pd.DataFrame(prices, columns=[f"00{i}930" for i in range(6)])
+    df.iloc[:80, 1] = np.nan  # 상장 기간이 짧은 종목
+    df.iloc[:190, 2] = np.nan  # 지표 계산에 데이터가 부족한 종목
+    df.iloc[:, 3] = 50_000.0  # 가격 변동이 없는 종목
+    return df
+
+
+def _assert_same(panel_value, expected):
+    for name in expected.__dataclass_fields__:
+        actual, wanted = getattr(panel_value, name), getattr(expected, name)
+        assert (np.isnan(actual) and np.isnan(wanted)) or actual == pytest.approx(wanted, rel=1e-10), name
+
+
+class TestIndicatorPanel:
+    def test_panel_matches_single_series_methods(self, price_matrix):
+        """패널 계산 결과가 종목별 계산 결과와 동일한지 테스트"""
+        # When
+        contexts = IndicatorService.get_indicator_panel(price_matrix).to_market_contexts()
+
+        # Then
+        assert list(contexts) == list(price_matrix.columns)
+        for symbol in price_matrix.columns:
+            prices = price_matrix[symbol]
+            _assert_same(contexts[symbol].sma, IndicatorService.get_simple_moving_average_lines(prices))
+            _assert_same(contexts[symbol].ema, IndicatorService.get_exponential_moving_average_lies(prices))
+            _assert_same(contexts[symbol].rsi, IndicatorService.get_relative_strength_index(prices))
+
+    def test_full_history_keeps_every_date(self, price_matrix):
+        """full_history 옵션이 날짜 축을 유지하는지 테스트"""
+        # When
+        panel = IndicatorService.get_indicator_panel(price_matrix, full_history=True)
+
+        # Then
+        assert panel.rsi_14.shape == price_matrix.shape
+        np.testing.assert_allclose(panel.sma_60, price_matrix.rolling(60).mean().to_numpy())
+        np.testing.assert_allclose(
+            panel.ema_20,
+            price_matrix.ewm(span=20, adjust=False).mean().to_numpy(),
+        )
+        np.testing.assert_array_equal(panel.latest().rsi_14, panel.rsi_14[-1])
+
+    def test_symbols_on_different_calendars_use_their_own_candles(self, price_matrix):
+        """종목마다 거래일이 달라도(휴장일, 거래정지) 각 종목의 캔들만으로 계산하는지 테스트"""
+        # Given: 종목마다 서로 다른 날짜가 비어 있는 행렬
+        rng = np.random.default_rng(7)
+        misaligned = price_matrix.copy()
+        for i, symbol in enumerate(misaligned.columns):
+            misaligned.loc[rng.choice(np.arange(170, 200), size=i + 1, replace=False), symbol] = np.nan
+
+        # When
+        contexts = IndicatorService.get_indicator_panel(misaligned).to_market_contexts()
+        history = IndicatorService.get_indicator_panel(misaligned, full_history=True)
+
+        # Then
+        for col, symbol in enumerate(misaligned.columns):
+            prices = misaligned[symbol].dropna()
+            _assert_same(contexts[symbol].sma, IndicatorService.get_simple_moving_average_lines(prices))
+            _assert_same(contexts[symbol].ema, IndicatorService.get_exponential_moving_average_lies(prices))
+            _assert_same(contexts[symbol].rsi, IndicatorService.get_relative_strength_index(prices))
+
+            observed = misaligned[symbol].notna().to_numpy()
+            np.testing.assert_allclose(history.sma_20[observed, col], prices.rolling(20).mean().to_numpy())
+            assert np.isnan(history.sma_20[~observed, col]).all()
+
+
+class TestIndicatorState:
+    def test_streaming_updates_match_full_recomputation(self, price_matrix):
+        """캔들을 하나씩 반영한 상태가 전체 재계산 결과와 같은지 테스트"""
+        # Given
+        prices = price_matrix.iloc[:, 0]
+        state = IndicatorState(symbol="000930", interval="day")
+
+        # When
+        for i, close in enumerate(prices):
+            state.update(DataOHLCV(open=close, high=close, low=close, close=close, volume=0, timestamp=i))
+        restored = IndicatorState.from_dict(json.loads(json.dumps(state.to_dict())))
+
+        # Then
+        assert restored.is_warm
+        _assert_same(restored.sma, IndicatorService.get_simple_moving_average_lines(prices))
+        _assert_same(restored.ema, IndicatorService.get_exponential_moving_average_lies(prices))
+        _assert_same(restored.rsi, IndicatorService.get_relative_strength_index(prices))
+
+    def test_old_candles_are_ignored(self):
+        """이미 반영된 시각의 캔들은 무시하는지 테스트"""
+        state = IndicatorState(symbol="005930", interval="day")
+        assert state.update(DataOHLCV(open=1, high=1, low=1, close=1, volume=1, timestamp=100))
+        assert not state.update(DataOHLCV(open=2, high=2, low=2, close=2, volume=1, timestamp=100))
+        assert list(state.closes) == [1.0]
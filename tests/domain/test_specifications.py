@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backend.domain.services import IndicatorService
+from src.backend.domain.specifications import (
+    RsiOverSoldSpec,
+    RsiOverBoughtSpec,
+    RsiSharpDropSpec,
+    RsiFastCrossOverSlowSpec,
+    TrendAndPerfectOrderSpec,
+    threshold_screening_rule,
+)
+
+
+@pytest.fixture
+def history_panel():
+    rng = np.random.default_rng(7)
+    prices = np.cumprod(1 + rng.normal(0, 0.03, (250, 40)), axis=0) * 100
+    df = pd.DataFrame(prices, columns=[f"{i:06d}" for i in range(40)])
+    df.iloc[:100, 0] = np.nan
+    return IndicatorService.get_indicator_panel(df, full_history=True)
+
+
+@pytest.mark.parametrize("rule", [
+    RsiOverSoldSpec(),
+    RsiOverBoughtSpec(),
+    RsiSharpDropSpec(),
+    RsiFastCrossOverSlowSpec(),
+    TrendAndPerfectOrderSpec(),
+    RsiOverSoldSpec() | TrendAndPerfectOrderSpec(),
+    (RsiSharpDropSpec() | RsiOverSoldSpec()) & RsiFastCrossOverSlowSpec(),
+    ~RsiOverBoughtSpec(),
+    threshold_screening_rule(),
+])
+def test_mask_matches_is_satisfied_by(history_panel, rule):
+    """벡터 마스크가 종목/일자별 is_satisfied_by 결과와 같은지 테스트"""
+    # When
+    mask = rule.satisfied_mask(history_panel)
+
+    # Then
+    assert mask.shape == history_panel.rsi_14.shape
+    for day in (0, 60, 130, 249):
+        contexts = history_panel.row(day).to_market_contexts()
+        expected = [rule.is_satisfied_by(ctx) for ctx in contexts.values()]
+        np.testing.assert_array_equal(mask[day], expected)
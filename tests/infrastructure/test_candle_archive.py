@@ -0,0 +1,145 @@
+import datetime
+import sqlite3
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backend.application.scheduler_services import ArchiveCandlesService
+from src.backend.domain.reference_data import Interval
+from src.backend.infrastructure.db.candle_archive import NumpyCandleArchive, TieredCandleReader
+from src.backend.infrastructure.db.database_api import SQLiteDatabase
+from src.backend.infrastructure.db.local_market_api import LocalMarketAPI
+from src.backend.infrastructure.db.migrations import apply_migrations
+
+SYMBOLS = ["005930", "000660", "035720"]
+DATES = pd.bdate_range("2023-01-02", "2026-10-16")
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    db_path = tmp_path / "main.db"
+    apply_migrations(db_path)
+    monkeypatch.setattr(SQLiteDatabase, "SQLITE_PATH", db_path)
+    database = SQLiteDatabase()
+
+    rng = np.random.default_rng(3)
+    for i, symbol in enumerate(SYMBOLS):
+        listed = DATES[DATES >= DATES[i * 200]]  # 상장일이 서로 다른 종목
+        closes = rng.uniform(100, 200, len(listed))
+        database.put_ohlcv_to_database(pd.DataFrame({
+            "candle_date_time": listed, "open_price": closes, "high_price": closes * 1.01,
+            "low_price": closes * 0.99, "close_price": closes, "volume": 1000,
+            "symbol": symbol, "interval": "day", "market_type": "KOSDAQ" if i == 2 else "KOSPI",
+        }))
+    return database
+
+
+class TestCandleArchive:
+    def test_archived_history_reads_the_same_as_live_history(self, database, tmp_path):
+        """아카이브로 옮긴 뒤에도 통합 조회 결과가 원본과 같은지 테스트"""
+        # Given
+        start, end = datetime.date(2023, 3, 1), datetime.date(2026, 10, 16)
+        expected = database.get_candle_matrix(SYMBOLS, Interval.DAY, start, end)
+        archive = NumpyCandleArchive(tmp_path / "archive")
+
+        # When
+        archived = ArchiveCandlesService(database, archive, hot_months=12).execute(
+            Interval.DAY, today=datetime.date(2026, 10, 18)
+        )
+        actual = TieredCandleReader(database, archive).get_candle_matrix(SYMBOLS, Interval.DAY, start, end)
+
+        # Then
+        assert archived == 33  # 2023-01 ~ 2025-09
+        assert archive.archived_until(Interval.DAY) == datetime.date(2025, 9, 30)
+        assert database.get_first_candle_date(Interval.DAY) == datetime.date(2025, 10, 1)
+        np.testing.assert_array_equal(actual.dates, expected.dates)
+        for field in ("open", "high", "low", "close", "volume"):
+            np.testing.assert_array_equal(getattr(actual, field), getattr(expected, field))
+
+    def test_archive_resumes_after_last_archived_month(self, database, tmp_path):
+        """이미 아카이브한 달은 다시 처리하지 않는지 테스트"""
+        archive = NumpyCandleArchive(tmp_path / "archive")
+        service = ArchiveCandlesService(database, archive, hot_months=12)
+
+        assert service.execute(Interval.DAY, today=datetime.date(2026, 9, 1)) == 32
+        assert service.execute(Interval.DAY, today=datetime.date(2026, 9, 30)) == 0
+        assert service.execute(Interval.DAY, today=datetime.date(2026, 10, 1)) == 1
+        assert (tmp_path / "archive" / "KOSDAQ" / "day" / "2025" / "2025-09.npy").exists()
+
+    def test_failed_delete_fails_the_archive_run(self, database, tmp_path, monkeypatch):
+        """실시간 DB 삭제가 실패하면 아카이브 작업이 실패로 끝나고 캔들은 그대로 남는지 테스트"""
+        # Given
+        archive = NumpyCandleArchive(tmp_path / "archive")
+        first = database.get_first_candle_date(Interval.DAY)
+
+        def locked(work):
+            raise sqlite3.OperationalError("database is locked")
+        monkeypatch.setattr(database, "_write", locked)
+
+        # When / Then
+        with pytest.raises(sqlite3.OperationalError):
+            ArchiveCandlesService(database, archive, hot_months=12).execute(Interval.DAY, today=datetime.date(2026, 10, 18))
+        assert database.get_first_candle_date(Interval.DAY) == first
+
+    def test_backfill_into_archived_month_is_kept(self, database, tmp_path):
+        """이미 아카이브한 달에 뒤늦게 들어온 캔들은 삭제되지 않고 통합 조회에 포함되는지 테스트"""
+        # Given
+        archive = NumpyCandleArchive(tmp_path / "archive")
+        service = ArchiveCandlesService(database, archive, hot_months=12)
+        service.execute(Interval.DAY, today=datetime.date(2026, 9, 1))
+        backfill_date = pd.Timestamp("2024-03-16")  # 아카이브된 달의 주말
+        database.put_ohlcv_to_database(pd.DataFrame({
+            "candle_date_time": [backfill_date], "open_price": [1.0], "high_price": [1.0], "low_price": [1.0],
+            "close_price": [1.0], "volume": [1], "symbol": "005930", "interval": "day", "market_type": "KOSPI",
+        }))
+
+        # When
+        archived = service.execute(Interval.DAY, today=datetime.date(2026, 10, 1))
+        matrix = TieredCandleReader(database, archive).get_candle_matrix(
+            ["005930"], Interval.DAY, datetime.date(2024, 3, 1), datetime.date(2024, 3, 31)
+        )
+
+        # Then
+        assert archived == 1
+        assert database.get_first_candle_date(Interval.DAY) == backfill_date.date()
+        assert matrix.close[matrix.dates == np.datetime64(backfill_date, 's')][0, 0] == 1.0
+        assert len(matrix.dates) == len(pd.bdate_range("2024-03-01", "2024-03-31")) + 1
+
+    def test_long_symbols_are_archived_whole(self, tmp_path):
+        """12자보다 긴 종목 코드도 잘리지 않고 아카이브되는지 테스트"""
+        # Given
+        archive = NumpyCandleArchive(tmp_path / "archive")
+        symbols = ["BRK.B", "LONG-SYMBOL-CODE-0001"]
+        data = pd.DataFrame({
+            "symbol": symbols, "market_type": "NYSE", "candle_date_time": pd.Timestamp("2024-01-02"),
+            "open_price": [1.0, 2.0], "high_price": [1.0, 2.0], "low_price": [1.0, 2.0],
+            "close_price": [1.0, 2.0], "volume": [10, 20],
+        })
+
+        # When
+        archive.put_month(Interval.DAY, 2024, 1, data)
+        matrix = archive.get_candle_matrix(symbols, Interval.DAY, datetime.date(2024, 1, 1), datetime.date(2024, 1, 31))
+
+        # Then
+        np.testing.assert_array_equal(matrix.close, [[1.0, 2.0]])
+
+    def test_local_market_api_completes_history_from_archive(self, database, tmp_path):
+        """실시간 DB에 남은 캔들이 부족하면 아카이브에서 채워 네트워크 조회를 하지 않는지 테스트"""
+        # Given
+        archive = NumpyCandleArchive(tmp_path / "archive")
+        ArchiveCandlesService(database, archive, hot_months=1).execute(Interval.DAY, today=datetime.date(2026, 10, 18))
+        fallback = MagicMock()
+        fallback.get_window_start.return_value = DATES[-1].date()
+        api = LocalMarketAPI(database, fallback, archive_port=archive)
+
+        # When
+        history = api.get_candle_history("005930", Interval.DAY, 150)
+
+        # Then
+        expected = DATES[-150:][::-1]
+        assert len(history) == 150
+        np.testing.assert_array_equal(history["candle_date_time"].to_numpy(), expected.to_numpy())
+        fallback.get_candle_history.assert_not_called()
+        fallback.get_candle_history_since.assert_not_called()
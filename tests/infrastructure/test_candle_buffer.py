@@ -0,0 +1,108 @@
+import sqlite3
+from unittest.mock import MagicMock
+
+import fakeredis
+import pandas as pd
+import pytest
+
+from src.backend.application.scheduler_services import FlushCandleBufferService
+from src.backend.domain.entities import IndicatorState
+from src.backend.infrastructure.db.candle_buffer import RedisCandleBuffer
+
+
+def _candles(symbol, days):
+    return pd.DataFrame({
+        "candle_date_time": pd.date_range("2026-01-01", periods=days),
+        "open_price": 1.0, "high_price": 1.0, "low_price": 1.0, "close_price": 1.0, "volume": 10,
+        "symbol": symbol, "interval": "day", "market_type": "KOSPI",
+    })
+
+
+def _redis_buffer():
+    """생성자는 redis URL에 연결하므로 fakeredis 클라이언트로 같은 필드를 채운 버퍼"""
+    buffer = RedisCandleBuffer.__new__(RedisCandleBuffer)
+    buffer._client = fakeredis.FakeRedis()
+    buffer._key, buffer._since_key = "candle_buffer", "candle_buffer:since"
+    buffer._lock_key, buffer._lock_token = "candle_buffer:flush_lock", None
+    return buffer
+
+
+class TestCandleBuffer:
+    def test_peek_returns_oldest_rows_until_trimmed(self):
+        """가장 먼저 들어온 행부터 읽고, trim 하기 전까지는 버퍼에 남겨 두는지 테스트"""
+        # Given
+        buffer = _redis_buffer()
+        for symbol in ("005930", "000660", "035720"):
+            buffer.push(_candles(symbol, 4))
+
+        # When
+        first = buffer.peek(6)
+
+        # Then
+        assert list(first["symbol"]) == ["005930"] * 4 + ["000660"] * 2
+        assert first["candle_date_time"].iloc[0] == "2026-01-01"
+        assert buffer.size() == 12
+
+        buffer.trim(6)
+        assert buffer.size() == 6
+        assert list(buffer.peek(100)["symbol"]) == ["000660"] * 2 + ["035720"] * 4
+        buffer.trim(6)
+        assert buffer.size() == 0 and buffer.age() == 0
+
+    def test_flush_writes_large_batches_once_threshold_is_reached(self):
+        """임계치를 넘으면 한 명의 writer가 큰 배치로 저장하는지 테스트"""
+        # Given
+        buffer, database = _redis_buffer(), MagicMock()
+        service = FlushCandleBufferService(buffer, database, flush_rows=100, flush_seconds=60, batch_rows=150)
+        for i in range(30):
+            buffer.push(_candles(f"{i:06d}", 5))
+        assert service.should_flush()
+
+        # When
+        assert buffer.acquire_flush_lock(10)
+        skipped = service.execute()
+        buffer.release_flush_lock()
+        flushed = service.execute()
+
+        # Then
+        assert skipped == 0
+        assert flushed == 150
+        assert database.put_ohlcv_to_database.call_count == 1
+        assert not service.should_flush()
+
+    def test_failed_write_keeps_rows_buffered(self):
+        """DB 저장이 실패하면 행을 버퍼에 남기고 오류를 그대로 올리는지 테스트"""
+        # Given
+        buffer, database = _redis_buffer(), MagicMock()
+        database.put_ohlcv_to_database.side_effect = sqlite3.OperationalError("database is locked")
+        service = FlushCandleBufferService(buffer, database, batch_rows=3)
+        buffer.push(_candles("005930", 5))
+
+        # When
+        with pytest.raises(sqlite3.OperationalError):
+            service.execute()
+
+        # Then: 다음 flush가 같은 행을 다시 저장한다
+        assert buffer.size() == 5
+        database.put_ohlcv_to_database.side_effect = None
+        assert service.execute() == 5
+        assert buffer.size() == 0
+
+    def test_indicator_states_follow_the_written_candles(self):
+        """지표 상태는 캔들이 저장된 뒤에만, 저장된 캔들까지 반영되는지 테스트"""
+        # Given
+        buffer, database = _redis_buffer(), MagicMock()
+        database.get_indicator_states.return_value = [IndicatorState(symbol="005930", interval="day")]
+        service = FlushCandleBufferService(buffer, database, batch_rows=100)
+        buffer.push(_candles("005930", 5))
+        buffer.push(_candles("000660", 3))
+
+        # When
+        service.execute()
+
+        # Then
+        states = {s.symbol: s for s in database.put_indicator_states.call_args.args[0]}
+        assert sorted(states) == ["000660", "005930"]
+        assert states["005930"].last_timestamp == int(pd.Timestamp("2026-01-05").timestamp())
+        calls = [name for name, _, _ in database.method_calls]
+        assert calls.index("put_ohlcv_to_database") < calls.index("put_indicator_states")
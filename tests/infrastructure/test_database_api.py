@@ -0,0 +1,242 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backend.domain.entities import News, MarketAnalysis, TradeStrategy
+from src.backend.domain.reference_data import Interval, MarketSentiment, TradingStrategy
+from src.backend.domain.value_objects import DataOHLCV
+from src.backend.infrastructure.db.database_api import SQLiteDatabase
+from src.backend.infrastructure.db.migrations import apply_migrations
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    db_path = tmp_path / "main.db"
+    apply_migrations(db_path)
+    monkeypatch.setattr(SQLiteDatabase, "SQLITE_PATH", db_path)
+    return SQLiteDatabase()
+
+
+def _candles(symbol, dates, closes):
+    return pd.DataFrame({
+        "candle_date_time": pd.to_datetime(dates),
+        "open_price": closes, "high_price": closes, "low_price": closes, "close_price": closes,
+        "volume": 100, "symbol": symbol, "interval": "day", "market_type": "KOSPI",
+    })
+
+
+class TestCandleMatrix:
+    def test_matrix_pivots_dates_by_requested_symbols(self, database):
+        """요청한 종목 순서대로 (날짜 x 종목) 행렬을 만들고 빈 칸은 NaN으로 채우는지 테스트"""
+        # Given
+        database.put_ohlcv_to_database(_candles("005930", ["2026-01-05", "2026-01-06", "2026-01-07"], [1.0, 2.0, 3.0]))
+        database.put_ohlcv_to_database(_candles("000660", ["2026-01-06", "2026-01-07"], [10.0, 20.0]))
+        database.put_ohlcv_to_database(_candles("035720", ["2026-01-08"], [5.0]))
+
+        # When
+        matrix = database.get_candle_matrix(
+            ["000660", "005930", "999999"], Interval.DAY, datetime.date(2026, 1, 6), datetime.date(2026, 1, 7)
+        )
+
+        # Then
+        assert matrix.symbols == ("000660", "005930", "999999")
+        np.testing.assert_array_equal(matrix.dates, np.array(["2026-01-06", "2026-01-07"], dtype="datetime64[s]"))
+        np.testing.assert_array_equal(matrix.close, [[10.0, 2.0, np.nan], [20.0, 3.0, np.nan]])
+        np.testing.assert_array_equal(matrix.volume[:, :2], 100.0)
+
+    def test_empty_range_keeps_symbol_axis(self, database):
+        """조회 결과가 없어도 종목 축은 유지하는지 테스트"""
+        matrix = database.get_candle_matrix(["005930"], Interval.DAY, datetime.date(2020, 1, 1), datetime.date(2020, 1, 2))
+
+        assert matrix.close.shape == (0, 1)
+
+
+KST = datetime.timezone(datetime.timedelta(hours=9))
+
+
+def _news(news_id, published_at, source="MK"):
+    return News(
+        id=news_id, title=f"title {news_id}", content="content", published_at=published_at,
+        source=source, related_stocks=[], related_sectors=[],
+    )
+
+
+class TestNewsByDate:
+    def test_filters_by_local_publish_date_and_source(self, database):
+        """발행처 현지 날짜 기준으로 조회하고 datetime으로 복원하는지 테스트"""
+        # Given
+        database.put_news([
+            _news("a", datetime.datetime(2026, 10, 18, 0, 30, tzinfo=KST)),
+            _news("b", datetime.datetime(2026, 10, 18, 23, 50, tzinfo=KST), source="HK"),
+            _news("c", datetime.datetime(2026, 10, 17, 23, 59, tzinfo=KST)),
+        ])
+
+        # When
+        all_news = database.get_news_by_date(datetime.date(2026, 10, 18))
+        mk_news = database.get_news_by_date(datetime.date(2026, 10, 18), source="MK")
+
+        # Then
+        assert sorted(n.id for n in all_news) == ["a", "b"]
+        assert [n.id for n in mk_news] == ["a"]
+        assert mk_news[0].published_at == datetime.datetime(2026, 10, 18, 0, 30, tzinfo=KST)
+
+    def test_daily_lookup_uses_index(self, database):
+        """일자 조회와 언론사+일자 조회가 인덱스를 타는지 테스트"""
+        conn, cursor = database._connect()
+
+        by_date = cursor.execute("EXPLAIN QUERY PLAN SELECT id FROM news WHERE published_date = ?", ("2026-10-18",)).fetchall()
+        by_source = cursor.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM news WHERE published_date = ? AND source = ?", ("2026-10-18", "MK")
+        ).fetchall()
+
+        assert "idx_news_published_date" in by_date[0][3]
+        assert "idx_news_source_date" in by_source[0][3]
+
+    def test_known_news_ids_returns_stored_subset(self, database):
+        """주어진 ID 중 이미 저장된 것만 돌려주는지 테스트"""
+        # Given
+        now = datetime.datetime.now(KST)
+        database.put_news([_news("a", now), _news("b", now)])
+
+        # When / Then
+        assert database.get_known_news_ids(["a", "b", "c"]) == {"a", "b"}
+        assert database.get_known_news_ids(["c"]) == set()
+        assert database.get_known_news_ids([]) == set()
+
+
+class TestNewsSearch:
+    def test_ranks_matching_news_by_relevance_and_recency(self, database):
+        """검색어가 포함된 뉴스만 찾고, 같은 관련도면 최신 뉴스를 먼저 반환하는지 테스트"""
+        # Given
+        now = datetime.datetime.now(KST)
+        database.put_news([
+            News(id="old", title="삼성전자 실적 발표", content="반도체 업황 개선", published_at=now - datetime.timedelta(days=6), source="MK"),
+            News(id="new", title="삼성전자 실적 발표", content="반도체 업황 개선", published_at=now, source="MK"),
+            News(id="other", title="카카오 신사업", content="플랫폼 규제", published_at=now, source="HK"),
+        ])
+
+        # When
+        by_body = database.search_news("반도체")
+        by_title = database.search_news("삼성전자 실적")
+
+        # Then
+        assert [n.id for n in by_body] == ["new", "old"]
+        assert [n.id for n in by_title] == ["new", "old"]
+
+    def test_filters_by_related_stocks_and_sectors(self, database):
+        """관련 종목/섹터 태그로 필터링하는지 테스트"""
+        # Given
+        now = datetime.datetime.now(KST)
+        database.put_news([
+            News(id="a", title="반도체 수출 증가", content="", published_at=now, source="MK",
+                 related_stocks=["005930"], related_sectors=["반도체"]),
+            News(id="b", title="반도체 장비 수주", content="", published_at=now - datetime.timedelta(hours=1), source="MK",
+                 related_stocks=["000660"], related_sectors=["반도체"]),
+        ])
+
+        # When / Then
+        assert [n.id for n in database.search_news("반도체", related_stocks=["000660"])] == ["b"]
+        assert [n.id for n in database.search_news(related_sectors=["반도체"])] == ["a", "b"]
+        assert database.search_news(related_stocks=["035720"]) == []
+
+    def test_index_follows_deletes_and_updates(self, database):
+        """뉴스 삭제/수정이 검색 인덱스에 반영되는지 테스트"""
+        # Given
+        database.put_news([_news("a", datetime.datetime.now(KST))])
+
+        # When
+        database._write(lambda conn: conn.execute("UPDATE news SET title = '코스피 마감 시황' WHERE id = 'a'"))
+
+        # Then
+        assert database.search_news("title") == []
+        assert [n.id for n in database.search_news("코스피")] == ["a"]
+        database._write(lambda conn: conn.execute("DELETE FROM news WHERE id = 'a'"))
+        assert database.search_news("코스피") == []
+
+
+class TestCandleIngestion:
+    def test_frame_is_not_modified(self, database):
+        """저장 시 호출자의 DataFrame 타입과 값이 바뀌지 않는지 테스트"""
+        # Given
+        data = _candles("005930", ["2026-01-05", "2026-01-06"], [1.0, 2.0])
+        before = data.copy()
+
+        # When
+        database.put_ohlcv_to_database(data)
+
+        # Then
+        pd.testing.assert_frame_equal(data, before)
+
+    def test_ohlcv_batches_are_stored_directly(self, database):
+        """DataOHLCV 배치를 바로 저장하고, 기존 시장 구분은 유지하는지 테스트"""
+        # Given
+        database.put_ohlcv_to_database(_candles("005930", ["2026-01-05"], [1.0]))
+        timestamps = [int(pd.Timestamp(d).timestamp()) for d in ["2026-01-05", "2026-01-06"]]
+        candles = [DataOHLCV(open=c, high=c, low=c, close=c, volume=10.0, timestamp=t)
+                   for c, t in zip([5.0, 6.0], timestamps)]
+
+        # When
+        database.put_candles("005930", Interval.DAY, candles)
+
+        # Then
+        recent = database.get_recent_candles(Interval.DAY, 5)
+        assert recent['close_price'].tolist() == [6.0, 5.0]
+        assert recent['market_type'].tolist() == ["KOSPI", "KOSPI"]
+        assert recent['volume'].tolist() == [10, 10]
+
+
+class TestAnalysisHistory:
+    def test_market_analyses_are_read_back_by_date_range(self, database):
+        """날짜별 시장 분석을 저장하고 기간으로 조회하며, 같은 날짜는 덮어쓰는지 테스트"""
+        # Given
+        for day, score in [(17, 0.1), (18, -0.5), (18, 0.4), (19, 0.0)]:
+            database.save_market_analysis(MarketAnalysis(
+                date=f"2026-10-{day}", sentiment_score=score, summary=f"summary {day}",
+                primary_sectors=["반도체"], reasons="", market_sentiment=MarketSentiment.BULLISH,
+                cited_news_ids=["a"],
+            ))
+
+        # When
+        analyses = database.get_market_analyses(datetime.date(2026, 10, 18), datetime.date(2026, 10, 19))
+
+        # Then
+        assert [(a.date, a.sentiment_score) for a in analyses] == [("2026-10-18", 0.4), ("2026-10-19", 0.0)]
+        assert analyses[0].primary_sectors == ["반도체"]
+        assert analyses[0].market_sentiment == MarketSentiment.BULLISH
+        assert analyses[0].cited_news_ids == ["a"]
+
+    def test_trade_strategies_are_grouped_by_date(self, database):
+        """전략을 날짜/종목별로 저장하고 기간과 종목으로 조회하는지 테스트"""
+        # Given
+        long = TradeStrategy(symbol="005930", action=TradingStrategy.LONG, confidence_score=0.8,
+                             entry_price=100.0, take_profit=110.0, stop_loss=95.0,
+                             valid_until=datetime.datetime(2026, 10, 20, 15, 30))
+        hold = TradeStrategy(symbol="000660", action=TradingStrategy.CASH_HOLD, confidence_score=0.3)
+        database.save_trade_strategies(datetime.date(2026, 10, 17), [long])
+        database.save_trade_strategies(datetime.date(2026, 10, 18), [long, hold])
+
+        # When
+        history = database.get_trade_strategies(datetime.date(2026, 10, 17), datetime.date(2026, 10, 18))
+        samsung = database.get_trade_strategies(datetime.date(2026, 10, 1), datetime.date(2026, 10, 31), symbol="005930")
+
+        # Then
+        assert history[datetime.date(2026, 10, 18)] == [hold, long]
+        assert history[datetime.date(2026, 10, 17)] == [long]
+        assert list(samsung) == [datetime.date(2026, 10, 17), datetime.date(2026, 10, 18)]
+
+    def test_rerun_replaces_every_strategy_of_the_date(self, database):
+        """같은 날짜를 다시 저장하면 빠진 종목의 이전 전략이 남지 않는지 테스트"""
+        # Given
+        long = TradeStrategy(symbol="005930", action=TradingStrategy.LONG, confidence_score=0.8)
+        hold = TradeStrategy(symbol="000660", action=TradingStrategy.CASH_HOLD, confidence_score=0.3)
+        database.save_trade_strategies(datetime.date(2026, 10, 17), [hold])
+        database.save_trade_strategies(datetime.date(2026, 10, 18), [long, hold])
+
+        # When
+        database.save_trade_strategies(datetime.date(2026, 10, 18), [long])
+
+        # Then
+        history = database.get_trade_strategies(datetime.date(2026, 10, 17), datetime.date(2026, 10, 18))
+        assert history == {datetime.date(2026, 10, 17): [hold], datetime.date(2026, 10, 18): [long]}
@@ -0,0 +1,60 @@
+from pathlib import Path
+
+import pytest
+from lxml import etree
+
+from src.backend.infrastructure.crawler import extractor as extractor_module
+from src.backend.infrastructure.crawler.extractor import ExtractionRule, SoupExtractor, StreamingExtractor
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+
+MK_RULE = ExtractionRule("div", "news_cnt_detail_wrap")
+HK_RULE = ExtractionRule("div", "article-body")
+
+
+class TestStreamingExtractor:
+    @pytest.mark.parametrize("name, rule", [("mk_article.html", MK_RULE), ("hk_article.html", HK_RULE)])
+    def test_same_text_as_beautifulsoup_on_article_layouts(self, name, rule):
+        """매경/한경 기사 구조를 본뜬 합성 페이지에서 BeautifulSoup과 같은 본문을 추출하는지 테스트"""
+        # Given
+        html = (FIXTURE_DIR / name).read_text(encoding="utf-8")
+
+        # When
+        expected = SoupExtractor(rule).extract(html)
+        content = StreamingExtractor(rule).extract(html)
+
+        # Then
+        assert expected
+        assert content == expected
+
+    @pytest.mark.parametrize("html", [
+        '<div class="article-body">앞<script>var a = 1;</script><style>p {}</style><!-- 광고 -->뒤</div>',
+        '<div class="article-body extra">본문<div class="article-body">중첩</div>끝</div>',
+        '<div class="article-body"><p>첫 줄</p>\n      <p>둘째&nbsp;줄 &amp; 기호</p><pre>  \n  </pre></div>',
+        '<div class="article-body">닫히지 않은 <p>본문',
+        '<div class="other">본문 없음</div>',
+        '',
+    ])
+    def test_same_text_as_beautifulsoup_on_edge_cases(self, html):
+        """숨김 태그, 중첩, 공백, 닫히지 않은 태그, 본문 없는 페이지를 같게 처리하는지 테스트"""
+        assert StreamingExtractor(HK_RULE).extract(html) == SoupExtractor(HK_RULE).extract(html)
+
+    def test_stops_parsing_after_container_closes(self, monkeypatch):
+        """본문 컨테이너가 닫히면 나머지 페이지를 파싱하지 않는지 테스트"""
+        # Given
+        fed = []
+
+        class SpyParser(etree.HTMLPullParser):
+            def feed(self, data):
+                fed.append(len(data))
+                return super().feed(data)
+
+        monkeypatch.setattr(extractor_module.etree, "HTMLPullParser", SpyParser)
+        html = '<div class="article-body">본문</div>' + "<ul><li>관련 기사</li></ul>" * 10000
+
+        # When
+        content = StreamingExtractor(HK_RULE).extract(html)
+
+        # Then
+        assert content == "본문"
+        assert sum(fed) <= StreamingExtractor.CHUNK_SIZE < len(html)
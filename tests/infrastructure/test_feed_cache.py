@@ -0,0 +1,41 @@
+from src.backend.infrastructure.crawler.feed_cache import FeedStateCache
+
+
+class TestFeedStateCache:
+    def test_validators_are_replayed_as_conditional_headers(self, tmp_path):
+        """저장한 ETag/Last-Modified를 조건부 요청 헤더로 돌려주는지 테스트"""
+        # Given
+        cache = FeedStateCache(tmp_path / "feed_state.json")
+        cache.update("http://a", '"v1"', "Tue, 03 Feb 2026 01:00:00 GMT")
+        cache.update("http://b", None, "Tue, 03 Feb 2026 02:00:00 GMT")
+
+        # When: 다른 프로세스가 같은 파일을 읽는 경우
+        reloaded = FeedStateCache(tmp_path / "feed_state.json")
+
+        # Then
+        assert reloaded.request_headers("http://a") == {
+            "If-None-Match": '"v1"', "If-Modified-Since": "Tue, 03 Feb 2026 01:00:00 GMT",
+        }
+        assert reloaded.request_headers("http://b") == {"If-Modified-Since": "Tue, 03 Feb 2026 02:00:00 GMT"}
+        assert reloaded.request_headers("http://unknown") == {}
+
+    def test_feed_without_validators_is_forgotten(self, tmp_path):
+        """검증 헤더가 없어진 피드는 상태를 지우는지 테스트"""
+        # Given
+        cache = FeedStateCache(tmp_path / "feed_state.json")
+        cache.update("http://a", '"v1"', None)
+
+        # When
+        cache.update("http://a", None, None)
+
+        # Then
+        assert cache.request_headers("http://a") == {}
+
+    def test_unreadable_state_file_is_ignored(self, tmp_path):
+        """손상된 상태 파일이면 조건 없이 요청하는지 테스트"""
+        # Given
+        path = tmp_path / "feed_state.json"
+        path.write_text("{broken", encoding="utf-8")
+
+        # When / Then
+        assert FeedStateCache(path).request_headers("http://a") == {}
@@ -0,0 +1,111 @@
+import pandas as pd
+import pytest
+from unittest.mock import MagicMock
+
+from src.backend.domain.reference_data import Interval
+from src.backend.infrastructure.db.local_market_api import LocalMarketAPI
+
+
+def _candles(symbol, count, end="2026-02-03"):
+    dates = pd.bdate_range(end=end, periods=count)[::-1]
+    return pd.DataFrame({
+        "candle_date_time": dates,
+        "close_price": range(count),
+        "interval": str(Interval.DAY),
+        "symbol": symbol,
+    })
+
+
+def _fallback(latest="2026-02-03"):
+    """영업일 달력이 latest 까지인 대체 포트"""
+    fallback = MagicMock()
+    fallback.get_window_start.side_effect = (
+        lambda interval, count, until: pd.bdate_range(end=latest, periods=count)[0].date()
+    )
+    return fallback
+
+
+@pytest.fixture
+def database_port():
+    port = MagicMock()
+    port.get_recent_candles.return_value = pd.concat(
+        [_candles("005930", 150), _candles("000660", 40)], ignore_index=True
+    )
+    return port
+
+
+class TestLocalMarketAPI:
+    def test_stored_history_is_served_from_one_bulk_query(self, database_port):
+        """저장된 캔들은 한 번의 일괄 조회로 제공되는지 테스트"""
+        # Given
+        fallback = _fallback()
+        api = LocalMarketAPI(database_port, fallback)
+
+        # When
+        first = api.get_candle_history("005930", Interval.DAY, 150)
+        second = api.get_candle_history("005930", Interval.DAY, 150)
+
+        # Then
+        assert len(first) == len(second) == 150
+        database_port.get_recent_candles.assert_called_once_with(Interval.DAY, 150)
+        fallback.get_candle_history.assert_not_called()
+        fallback.get_candle_history_since.assert_not_called()
+        fallback.get_candle_history_between.assert_not_called()
+
+    def test_missing_history_falls_back_and_is_stored(self, database_port):
+        """저장된 캔들이 없는 종목은 전부, 부족한 종목은 모자란 과거 구간만 가져와 저장하는지 테스트"""
+        # Given
+        fallback = _fallback()
+        fallback.get_candle_history.return_value = _candles("035720", 150)
+        fallback.get_candle_history_between.return_value = _candles("000660", 110, end="2025-12-09")
+        api = LocalMarketAPI(database_port, fallback)
+
+        # When
+        result = api.get_candles_history(["005930", "000660", "035720"], Interval.DAY, 150)
+
+        # Then
+        assert len(result) == 3 * 150
+        assert [c.args[0] for c in fallback.get_candle_history.call_args_list] == ["035720"]
+        fallback.get_candle_history_between.assert_called_once_with(
+            "000660", Interval.DAY,
+            pd.bdate_range(end="2026-02-03", periods=150)[0].date(), pd.Timestamp("2025-12-09").date(),
+        )
+        hynix = result[result["symbol"] == "000660"]
+        assert hynix["candle_date_time"].is_unique
+        assert hynix["candle_date_time"].max() == pd.Timestamp("2026-02-03")
+        assert database_port.put_ohlcv_to_database.call_count == 2
+
+    def test_stale_history_fetches_only_the_days_after_the_last_stored(self, database_port):
+        """저장된 마지막 캔들이 최근 영업일보다 오래되면 그 이후만 가져와 붙이는지 테스트"""
+        # Given
+        fallback = _fallback(latest="2026-02-05")
+        fallback.get_candle_history_since.return_value = _candles("005930", 3, end="2026-02-05")
+        api = LocalMarketAPI(database_port, fallback)
+
+        # When
+        result = api.get_candle_history("005930", Interval.DAY, 150)
+
+        # Then
+        fallback.get_candle_history_since.assert_called_once_with(
+            "005930", Interval.DAY, pd.Timestamp("2026-02-03").date()
+        )
+        fallback.get_candle_history.assert_not_called()
+        assert len(result) == 150
+        assert result["candle_date_time"].is_unique
+        assert list(result["candle_date_time"][:3]) == list(pd.bdate_range(end="2026-02-05", periods=3)[::-1])
+        database_port.put_ohlcv_to_database.assert_called_once()
+
+    def test_latest_trading_day_is_looked_up_once(self, database_port):
+        """최근 영업일은 종목마다가 아니라 한 번만 조회하는지 테스트"""
+        # Given
+        fallback = _fallback()
+        fallback.get_candle_history_between.return_value = pd.DataFrame()
+        api = LocalMarketAPI(database_port, fallback)
+
+        # When
+        api.get_candles_history(["005930", "000660"], Interval.DAY, 150)
+        api.get_candles_history(["005930", "000660"], Interval.DAY, 150)
+
+        # Then
+        latest_lookups = [c for c in fallback.get_window_start.call_args_list if c.args[1] == 1]
+        assert len(latest_lookups) == 1
@@ -0,0 +1,128 @@
+import datetime
+import sqlite3
+
+import numpy as np
+import pytest
+
+from src.backend.domain.reference_data import Interval
+from src.backend.infrastructure.db.database_api import SQLiteDatabase
+from src.backend.infrastructure.db.migrations import MIGRATIONS, Migration, apply_migrations, schema_version
+
+LATEST = MIGRATIONS[-1].version
+
+
+def _legacy_database(db_path):
+    """스크립트로 만들던 예전 스키마와 데이터"""
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE news (id TEXT PRIMARY KEY, title TEXT, content TEXT, published_at TEXT, source TEXT, "
+                 "url TEXT, related_stocks TEXT, related_sectors TEXT, sentiment_score REAL DEFAULT 0.0)")
+    conn.execute("INSERT INTO news (id, title, published_at, related_stocks, related_sectors) "
+                 "VALUES ('a', '코스피 마감 시황', '2026-10-18 08:00:00+09:00', '[]', '[]')")
+    conn.execute("""
+        CREATE TABLE ohlcv_candles (
+            symbol TEXT NOT NULL, market_type TEXT, interval TEXT NOT NULL, candle_date_time TEXT NOT NULL,
+            open_price REAL, high_price REAL, low_price REAL, close_price REAL, volume INTEGER,
+            rsi REAL, ema REAL, sma REAL, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (symbol, interval, candle_date_time)
+        )
+    """)
+    conn.executemany(
+        "INSERT INTO ohlcv_candles (symbol, market_type, interval, candle_date_time, close_price, volume) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            ("005930", "KOSPI", "day", "2026-10-15 00:00:00", 100.0, 10),
+            ("005930", "KOSPI", "day", "2026-10-16", 101.0, 11),
+            ("035720", "KOSDAQ", "day", "2026-10-16 00:00:00", 50.0, 5),
+            ("005930", "KOSPI", "minute60", "2026-10-16 10:00:00", 100.5, 1),
+        ]
+    )
+    conn.commit()
+    conn.close()
+
+
+class TestMigrations:
+    def test_fresh_database_reaches_latest_version(self, tmp_path):
+        """빈 DB에 모든 마이그레이션을 적용하고, 다시 실행해도 그대로인지 테스트"""
+        db_path = tmp_path / "main.db"
+
+        assert apply_migrations(db_path) == LATEST
+        assert apply_migrations(db_path) == LATEST
+
+        conn = sqlite3.connect(db_path)
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        conn.close()
+        assert {"news", "news_fts", "symbols", "candles", "indicator_states"} <= tables
+        assert "ohlcv_candles" not in tables
+
+    def test_legacy_database_is_migrated_with_its_data(self, tmp_path, monkeypatch):
+        """예전 스키마의 뉴스와 캔들이 정규화된 스키마로 옮겨지는지 테스트"""
+        # Given
+        db_path = tmp_path / "main.db"
+        _legacy_database(db_path)
+
+        # When
+        apply_migrations(db_path)
+
+        # Then
+        monkeypatch.setattr(SQLiteDatabase, "SQLITE_PATH", db_path)
+        database = SQLiteDatabase()
+        assert [n.id for n in database.search_news("코스피")] == ["a"]
+        assert [n.id for n in database.get_news_by_date(datetime.date(2026, 10, 18))] == ["a"]
+
+        assert sorted(database.get_all_symbols()) == ["005930", "035720"]
+        assert database.get_last_candle_date("005930", Interval.DAY) == datetime.date(2026, 10, 16)
+        columns = database.get_candle_columns(["005930"], Interval.DAY, datetime.date(2026, 10, 15), datetime.date(2026, 10, 16))
+        np.testing.assert_array_equal(columns['date'], np.array(["2026-10-15", "2026-10-16"], dtype="datetime64[s]"))
+        np.testing.assert_array_equal(columns['close'], [100.0, 101.0])
+
+        hourly = database.get_recent_candles(Interval.MINUTE_60, 1)
+        assert hourly['candle_date_time'].tolist() == [np.datetime64("2026-10-16T10:00:00")]
+        assert hourly['market_type'].tolist() == ["KOSPI"]
+
+    def test_news_search_survives_vacuum(self, tmp_path, monkeypatch):
+        """VACUUM 뒤에도 검색 인덱스가 같은 뉴스를 가리키는지 테스트"""
+        # Given
+        db_path = tmp_path / "main.db"
+        _legacy_database(db_path)
+        apply_migrations(db_path)
+        conn = sqlite3.connect(db_path)
+        conn.executemany(
+            "INSERT INTO news (id, title, published_at, related_stocks, related_sectors) VALUES (?, ?, ?, '[]', '[]')",
+            [("b", "반도체 수출 증가", "2026-10-18 09:00:00+09:00"), ("c", "원달러 환율 급등", "2026-10-18 10:00:00+09:00")]
+        )
+        conn.execute("DELETE FROM news WHERE id = 'a'")
+        conn.commit()
+
+        # When
+        conn.execute("VACUUM")
+        key = [row[1] for row in conn.execute("PRAGMA table_info(news)") if row[5]]
+        fts_sql = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'news_fts'").fetchone()[0]
+        conn.close()
+
+        # Then: 인덱스는 암묵적 rowid가 아니라 명시적 정수 키를 가리킨다
+        assert key == ["news_no"]
+        assert "content_rowid='news_no'" in fts_sql
+        monkeypatch.setattr(SQLiteDatabase, "SQLITE_PATH", db_path)
+        database = SQLiteDatabase()
+        assert [n.id for n in database.search_news("반도체")] == ["b"]
+        assert [n.id for n in database.search_news("원달러")] == ["c"]
+        assert database.search_news("코스피") == []
+
+    def test_failed_migration_keeps_previous_version(self, tmp_path):
+        """마이그레이션이 실패하면 변경 사항과 버전이 모두 롤백되는지 테스트"""
+        # Given
+        db_path = tmp_path / "main.db"
+
+        def _broken(conn):
+            conn.execute("CREATE TABLE half_done (id INTEGER)")
+            raise RuntimeError("boom")
+
+        # When
+        with pytest.raises(RuntimeError):
+            apply_migrations(db_path, MIGRATIONS + [Migration(LATEST + 1, "broken", _broken)])
+
+        # Then
+        conn = sqlite3.connect(db_path)
+        assert schema_version(conn) == LATEST
+        assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'half_done'").fetchone() is None
+        conn.close()
@@ -1,8 +1,13 @@
+import time
+import asyncio
 import pytest
 import hashlib
+from aiohttp import web
 from datetime import datetime
 from unittest.mock import MagicMock, patch
 from src.backend.infrastructure.crawler.news_rss import MKNews, HKNews
+from src.backend.infrastructure.crawler.feed_cache import FeedStateCache
+from src.backend.application.scheduler_services import CollectNewsService
 from src.backend.domain.entities import News
 from src.backend.domain.reference_data import NewsSourceType
 
@@ -109,4 +114,309 @@ class TestRSSCrawler:
         assert mk_crawler.source_type == NewsSourceType.MK_STOCK
 
         assert hk_crawler.content_class == "article-body"
-        assert hk_crawler.source_type == NewsSourceType.HK_FINANCE
\ No newline at end of file
+        assert hk_crawler.source_type == NewsSourceType.HK_FINANCE
+
+
+def _feed_xml(base_url: str, paths: list) -> str:
+    items = "".join(
+        f"<item><title>{path}</title><link>{base_url}{path}</link>"
+        f"<pubDate>Tue, 03 Feb 2026 10:00:00 +0900</pubDate></item>"
+        for path in paths
+    )
+    return f'<?xml version="1.0" encoding="UTF-8"?><rss><channel>{items}</channel></rss>'
+
+
+@pytest.fixture
+async def news_server():
+    """피드 2개와 기사 4개(각 0.3초 지연), 응답하지 않는 기사 1개, 처음 한 번 실패하는 기사 1개를 제공하는 로컬 서버"""
+    state = {"base_url": None, "requested": [], "feed_requests": [], "flaky_calls": 0}
+
+    async def feed(request):
+        paths = {
+            "a": ["/article/1", "/article/2"],
+            "b": ["/article/3", "/article/4"],
+            "slow": ["/article/1", "/hang"],
+            "flaky": ["/article/1", "/flaky"],
+        }[request.match_info["name"]]
+        return web.Response(text=_feed_xml(state["base_url"], paths), content_type="application/xml")
+
+    async def article(request):
+        state["requested"].append(request.path)
+        await asyncio.sleep(0.3)
+        number = request.match_info["number"]
+        return web.Response(text=f'<div class="news_cnt_detail_wrap">본문 {number}</div>', content_type="text/html")
+
+    async def versioned_feed(request):
+        state["feed_requests"].append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        paths = {"versioned": ["/article/1"], "versioned-flaky": ["/article/1", "/flaky"]}[request.match_info["name"]]
+        return web.Response(text=_feed_xml(state["base_url"], paths),
+                            content_type="application/xml", headers={"ETag": '"v1"'})
+
+    async def flaky(request):
+        state["flaky_calls"] += 1
+        if state["flaky_calls"] == 1:
+            return web.Response(status=500)
+        return web.Response(text='<div class="news_cnt_detail_wrap">늦은 본문</div>', content_type="text/html")
+
+    async def hang(request):
+        await asyncio.sleep(3)
+        return web.Response(text="")
+
+    app = web.Application()
+    app.router.add_get("/feed/{name:versioned.*}", versioned_feed)
+    app.router.add_get("/feed/{name}", feed)
+    app.router.add_get("/article/{number}", article)
+    app.router.add_get("/hang", hang)
+    app.router.add_get("/flaky", flaky)
+
+    runner = web.AppRunner(app, shutdown_timeout=0)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    state["base_url"] = f"http://127.0.0.1:{port}"
+    yield state
+    await runner.cleanup()
+
+
+@pytest.fixture
+def today():
+    """로컬 서버 피드의 발행일(2026-02-03)을 오늘로 고정"""
+    with patch("src.backend.infrastructure.crawler.news_rss.datetime") as mock_datetime:
+        mock_datetime.now.return_value.date.return_value = datetime(2026, 2, 3).date()
+        yield
+
+
+@pytest.mark.usefixtures("today")
+class TestAsyncRSSCrawler:
+    async def test_fetch_news_async_fetches_feeds_and_articles_concurrently(self, news_server, mk_crawler):
+        """모든 피드와 기사 본문을 동시에 받아오는지 테스트"""
+        # Given
+        base_url = news_server["base_url"]
+        mk_crawler._rss_urls = {"a": f"{base_url}/feed/a", "b": f"{base_url}/feed/b"}
+
+        # When
+        started = time.monotonic()
+        news_list = await mk_crawler.fetch_news_async(deadline=10)
+        elapsed = time.monotonic() - started
+
+        # Then: 기사 4개를 순서대로 받으면 1.2초 이상 걸린다
+        assert elapsed < 1.0
+        assert sorted(n.content for n in news_list) == ["본문 1", "본문 2", "본문 3", "본문 4"]
+        assert {n.id for n in news_list} == {
+            hashlib.md5(f"{base_url}/article/{i}".encode()).hexdigest() for i in range(1, 5)
+        }
+
+    async def test_fetch_news_async_leaves_out_articles_past_deadline(self, news_server, mk_crawler):
+        """마감 시간 안에 끝나지 않은 기사는 제외하고 나머지를 반환하는지 테스트"""
+        # Given
+        base_url = news_server["base_url"]
+        mk_crawler._rss_urls = {"slow": f"{base_url}/feed/slow"}
+
+        # When
+        started = time.monotonic()
+        news_list = await mk_crawler.fetch_news_async(deadline=1)
+
+        # Then
+        assert time.monotonic() - started < 2
+        assert [n.content for n in news_list] == ["본문 1"]
+
+    async def test_fetch_news_async_skips_unreachable_feed(self, news_server, mk_crawler):
+        """응답하지 않는 피드가 있어도 다른 피드의 뉴스는 수집하는지 테스트"""
+        # Given
+        base_url = news_server["base_url"]
+        mk_crawler._rss_urls = {"a": f"{base_url}/feed/a", "missing": f"{base_url}/feed-missing"}
+
+        # When
+        news_list = await mk_crawler.fetch_news_async(deadline=10)
+
+        # Then
+        assert sorted(n.content for n in news_list) == ["본문 1", "본문 2"]
+
+    async def test_fetch_news_async_skips_known_articles(self, news_server, mk_crawler):
+        """이미 저장된 뉴스는 본문을 받지 않고 새 기사만 수집하는지 테스트"""
+        # Given
+        base_url = news_server["base_url"]
+        mk_crawler._rss_urls = {"a": f"{base_url}/feed/a", "b": f"{base_url}/feed/b"}
+        stored = {hashlib.md5(f"{base_url}/article/{i}".encode()).hexdigest() for i in (1, 3)}
+        lookups = []
+
+        def known_ids(ids):
+            lookups.append(ids)
+            return stored.intersection(ids)
+
+        # When
+        news_list = await mk_crawler.fetch_news_async(deadline=10, known_ids=known_ids)
+
+        # Then: 피드마다 한 번씩 조회하고, 새 기사 본문만 요청한다
+        assert len(lookups) == 2
+        assert sorted(news_server["requested"]) == ["/article/2", "/article/4"]
+        assert sorted(n.content for n in news_list) == ["본문 2", "본문 4"]
+
+    async def test_article_without_body_is_fetched_on_next_run(self, news_server, mk_crawler):
+        """본문 요청이 실패한 기사는 저장하지 않고 다음 실행에서 다시 수집하는지 테스트"""
+        # Given
+        base_url = news_server["base_url"]
+        mk_crawler._rss_urls = {"flaky": f"{base_url}/feed/flaky"}
+        stored = set()
+
+        def known_ids(ids):
+            return stored.intersection(ids)
+
+        # When
+        first = await mk_crawler.fetch_news_async(deadline=10, known_ids=known_ids)
+        stored.update(n.id for n in first)
+        second = await mk_crawler.fetch_news_async(deadline=10, known_ids=known_ids)
+
+        # Then: 500으로 실패한 기사만 두 번째 실행에서 받는다
+        assert [n.content for n in first] == ["본문 1"]
+        assert [n.content for n in second] == ["늦은 본문"]
+        assert news_server["flaky_calls"] == 2
+
+    @patch("requests.get")
+    def test_fetch_single_rss_leaves_out_failed_bodies(self, mock_get, mk_crawler):
+        """동기 수집에서도 본문을 받지 못한 기사는 결과에서 빠지는지 테스트"""
+        # Given
+        mock_rss_res = MagicMock(status_code=200, content=MOCK_RSS_XML.encode("utf-8"))
+        mock_content_res = MagicMock()
+        mock_content_res.raise_for_status.side_effect = Exception("500 Server Error")
+        mock_get.side_effect = [mock_rss_res, mock_content_res]
+
+        # When
+        news_list = mk_crawler._fetch_single_rss("http://rss-url.com")
+
+        # Then
+        assert news_list == []
+
+    async def test_unchanged_feed_is_not_downloaded_again(self, news_server, tmp_path):
+        """ETag가 같은 피드는 304로 받고 새 뉴스 없음으로 처리하는지 테스트"""
+        # Given
+        base_url = news_server["base_url"]
+        crawler = MKNews(FeedStateCache(tmp_path / "feed_state.json"))
+        crawler._rss_urls = {"versioned": f"{base_url}/feed/versioned"}
+
+        # When
+        first = await crawler.fetch_news_async(deadline=10)
+        second = await crawler.fetch_news_async(deadline=10)
+
+        # Then
+        assert [n.content for n in first] == ["본문 1"]
+        assert second == []
+        assert news_server["feed_requests"] == [None, '"v1"']
+        assert news_server["requested"] == ["/article/1"]
+
+    async def test_feed_cut_off_by_deadline_is_downloaded_again(self, news_server, tmp_path):
+        """마감 시간에 끊긴 피드는 검증 헤더를 저장하지 않아 다음 실행에서 다시 받는지 테스트"""
+        # Given
+        base_url = news_server["base_url"]
+        cache = FeedStateCache(tmp_path / "feed_state.json")
+        crawler = MKNews(cache)
+        crawler._rss_urls = {"versioned": f"{base_url}/feed/versioned"}
+
+        # When
+        news_list = await crawler.fetch_news_async(deadline=0.1)
+
+        # Then
+        assert news_list == []
+        assert cache.request_headers(f"{base_url}/feed/versioned") == {}
+
+    async def test_feed_with_failed_article_is_downloaded_again(self, news_server, tmp_path):
+        """본문을 받지 못한 기사가 있는 피드는 검증 헤더를 저장하지 않아 다음 실행에서 그 기사를 받는지 테스트"""
+        # Given
+        base_url = news_server["base_url"]
+        cache = FeedStateCache(tmp_path / "feed_state.json")
+        crawler = MKNews(cache)
+        crawler._rss_urls = {"versioned": f"{base_url}/feed/versioned-flaky"}
+
+        # When
+        first = await crawler.fetch_news_async(deadline=10)
+        headers_after_failure = cache.request_headers(f"{base_url}/feed/versioned-flaky")
+        second = await crawler.fetch_news_async(deadline=10)
+
+        # Then: 두 번째 실행은 304 대신 피드를 다시 받고, 모두 받은 뒤에야 ETag를 저장한다
+        assert [n.content for n in first] == ["본문 1"]
+        assert headers_after_failure == {}
+        assert "늦은 본문" in [n.content for n in second]
+        assert news_server["feed_requests"] == [None, None]
+        assert cache.request_headers(f"{base_url}/feed/versioned-flaky") == {"If-None-Match": '"v1"'}
+
+    @patch("requests.get")
+    def test_fetch_single_rss_keeps_validators_only_when_complete(self, mock_get, tmp_path):
+        """동기 수집에서도 본문을 받지 못한 기사가 있으면 검증 헤더를 저장하지 않는지 테스트"""
+        # Given
+        cache = FeedStateCache(tmp_path / "feed_state.json")
+        crawler = MKNews(cache)
+        mock_rss_res = MagicMock(status_code=200, content=MOCK_RSS_XML.encode("utf-8"), headers={"ETag": '"v1"'})
+        failed_res = MagicMock()
+        failed_res.raise_for_status.side_effect = Exception("500 Server Error")
+        ok_res = MagicMock(status_code=200, text=MOCK_ARTICLE_HTML)
+
+        # When
+        mock_get.side_effect = [mock_rss_res, failed_res]
+        crawler._fetch_single_rss("http://rss-url.com")
+        headers_after_failure = cache.request_headers("http://rss-url.com")
+        mock_get.side_effect = [mock_rss_res, ok_res]
+        crawler._fetch_single_rss("http://rss-url.com")
+
+        # Then
+        assert headers_after_failure == {}
+        assert cache.request_headers("http://rss-url.com") == {"If-None-Match": '"v1"'}
+
+    async def test_slow_consumer_pauses_the_crawl(self, news_server, mk_crawler):
+        """소비가 늦으면 대기 중인 뉴스가 QUEUE_SIZE를 넘지 않도록 본문 수집을 멈추는지 테스트"""
+        # Given
+        base_url = news_server["base_url"]
+        mk_crawler._rss_urls = {"a": f"{base_url}/feed/a", "b": f"{base_url}/feed/b"}
+        mk_crawler.QUEUE_SIZE = 1
+        stream = mk_crawler.stream_news(deadline=10)
+
+        # When: 첫 뉴스를 받은 뒤 소비를 멈춘다
+        first = await anext(stream)
+        await asyncio.sleep(1)
+        requested_while_paused = len(news_server["requested"])
+        rest = [news async for news in stream]
+
+        # Then: 받은 1건 외에 1건만 미리 받아 두고, 이후 나머지를 모두 수집한다
+        assert requested_while_paused == 2
+        assert sorted([first.content] + [n.content for n in rest]) == ["본문 1", "본문 2", "본문 3", "본문 4"]
+
+
+@pytest.mark.usefixtures("today")
+class TestCollectNewsService:
+    async def test_news_are_saved_in_bounded_batches(self, news_server, mk_crawler):
+        """수집 중인 뉴스를 batch_size 단위로 나눠 저장하는지 테스트"""
+        # Given
+        base_url = news_server["base_url"]
+        mk_crawler._rss_urls = {"a": f"{base_url}/feed/a", "b": f"{base_url}/feed/b"}
+        database_port = MagicMock()
+        database_port.get_known_news_ids.return_value = set()
+        service = CollectNewsService(mk_crawler, database_port, deadline=10, batch_size=3)
+
+        # When
+        saved = await service.execute()
+
+        # Then
+        assert saved == 4
+        assert [len(call.args[0]) for call in database_port.put_news.call_args_list] == [3, 1]
+
+    async def test_collected_news_are_saved_when_crawl_fails(self):
+        """수집 도중 실패해도 그 전까지 받은 뉴스는 저장하는지 테스트"""
+        # Given
+        async def failing_stream(deadline, known_ids=None):
+            yield MagicMock(spec=News)
+            yield MagicMock(spec=News)
+            raise ConnectionError("feed closed")
+
+        crawler_port = MagicMock()
+        crawler_port.stream_news = failing_stream
+        database_port = MagicMock()
+        service = CollectNewsService(crawler_port, database_port, batch_size=50)
+
+        # When
+        with pytest.raises(ConnectionError):
+            await service.execute()
+
+        # Then
+        assert len(database_port.put_news.call_args.args[0]) == 2
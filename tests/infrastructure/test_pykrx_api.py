@@ -0,0 +1,95 @@
+import datetime
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from src.backend.domain.reference_data import Interval, StockMarketType
+from src.backend.infrastructure.api.pykrx_api import PykrxAPI
+from src.backend.infrastructure.ratelimit.token_bucket import AdaptiveRateLimiter
+
+TODAY = datetime.date.today()
+# 주말을 제외한 날짜를 KRX 영업일로 가정
+BUSINESS_DAYS = pd.bdate_range(end=TODAY, periods=400)
+LIMITER = AdaptiveRateLimiter("pykrx-test", rate=1000)
+
+
+def _business_days(year, month):
+    return [d for d in BUSINESS_DAYS if d.year == year and d.month == month]
+
+
+def _market_ohlcv(from_str, to_str, ticker, freq):
+    days = BUSINESS_DAYS[(BUSINESS_DAYS >= pd.Timestamp(from_str)) & (BUSINESS_DAYS <= pd.Timestamp(to_str))]
+    df = pd.DataFrame(
+        {"시가": 1.0, "고가": 1.0, "저가": 1.0, "종가": range(len(days)), "거래량": 10, "등락률": 0.0},
+        index=days,
+    )
+    df.index.name = "날짜"
+    return df
+
+
+@pytest.fixture
+def mock_stock():
+    PykrxAPI._business_days.clear()
+    with patch("src.backend.infrastructure.api.pykrx_api.stock") as stock:
+        stock.get_previous_business_days.side_effect = _business_days
+        stock.get_market_ohlcv.side_effect = _market_ohlcv
+        yield stock
+
+
+class TestPykrxAPI:
+    def test_count_window_is_sized_by_trading_calendar(self, mock_stock):
+        """영업일 달력으로 조회 구간을 정확히 계산하여 한 번만 요청하는지 테스트"""
+        # When
+        df = PykrxAPI(LIMITER).get_candle_history("005930", Interval.DAY, 150)
+
+        # Then
+        assert len(df) == 150
+        assert mock_stock.get_market_ohlcv.call_count == 1
+        from_str = mock_stock.get_market_ohlcv.call_args.args[0]
+        assert pd.Timestamp(from_str) == BUSINESS_DAYS[-150]
+        assert df["candle_date_time"].iloc[0] == BUSINESS_DAYS[-1]
+
+    def test_sync_fetches_only_days_after_last_stored(self, mock_stock):
+        """마지막 저장일 이후의 영업일만 가져오는지 테스트"""
+        # When
+        df = PykrxAPI(LIMITER).get_candle_history_since("005930", Interval.DAY, BUSINESS_DAYS[-4].date())
+
+        # Then
+        assert list(df["candle_date_time"]) == list(BUSINESS_DAYS[-3:][::-1])
+        assert mock_stock.get_market_ohlcv.call_count == 1
+
+    def test_sync_skips_request_when_up_to_date(self, mock_stock):
+        """새 영업일이 없으면 요청하지 않는지 테스트"""
+        df = PykrxAPI(LIMITER).get_candle_history_since("005930", Interval.DAY, TODAY)
+
+        assert df.empty
+        mock_stock.get_market_ohlcv.assert_not_called()
+
+    def test_falls_back_to_scanning_without_calendar(self, mock_stock):
+        """영업일 달력을 가져오지 못하면 기존 방식으로 조회하는지 테스트"""
+        mock_stock.get_previous_business_days.side_effect = Exception("KRX blocked")
+
+        df = PykrxAPI(LIMITER).get_candle_history("005930", Interval.DAY, 20)
+
+        assert len(df) == 20
+        assert df["candle_date_time"].is_monotonic_decreasing
+
+    def test_market_snapshot_drops_suspended_tickers(self, mock_stock):
+        """시장 전체 스냅샷을 한 번에 조회하고 거래정지 종목을 제외하는지 테스트"""
+        # Given
+        mock_stock.get_market_ohlcv.side_effect = None
+        mock_stock.get_market_ohlcv.return_value = pd.DataFrame(
+            {"시가": [10.0, 0.0], "고가": [11.0, 0.0], "저가": [9.0, 0.0], "종가": [10.5, 0.0],
+             "거래량": [100, 0], "거래대금": [1050, 0], "등락률": [0.5, 0.0]},
+            index=["005930", "000010"],
+        )
+
+        # When
+        df = PykrxAPI(LIMITER).get_market_snapshot(StockMarketType.KOSPI, BUSINESS_DAYS[-1].date())
+
+        # Then
+        assert list(df["symbol"]) == ["005930"]
+        assert df["close_price"].iloc[0] == 10.5
+        assert df["candle_date_time"].iloc[0] == BUSINESS_DAYS[-1]
+        mock_stock.get_market_ohlcv.assert_called_once_with(BUSINESS_DAYS[-1].strftime("%Y%m%d"), market="KOSPI")
@@ -0,0 +1,129 @@
+import pytest
+import requests
+
+from src.backend.infrastructure.ratelimit.token_bucket import AdaptiveRateLimiter
+from src.backend.infrastructure.upbit.l_api import UpbitAPI
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def _limiter(clock, **kwargs):
+    return AdaptiveRateLimiter("test", rate=4.0, clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def _response(status_code, body):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = body.encode()
+    response.url = "https://api.upbit.com/v1/ticker"
+    return response
+
+
+class TestAdaptiveRateLimiter:
+    def test_burst_then_waits_for_refill(self, clock):
+        """버킷 용량만큼은 바로 통과하고 이후에는 재충전 속도에 맞춰 대기하는지 테스트"""
+        # Given
+        limiter = _limiter(clock)
+
+        # When
+        for _ in range(8):
+            limiter.acquire()
+
+        # Then
+        assert clock.now == pytest.approx(1.0)
+        assert clock.sleeps == [pytest.approx(0.25)] * 4
+
+    def test_throttle_halves_rate_once_per_cooldown(self, clock):
+        """429 신호가 몰려도 쿨다운 동안 한 번만 속도를 줄이는지 테스트"""
+        # Given
+        limiter = _limiter(clock, cooldown=1.0)
+
+        # When
+        limiter.on_throttle()
+        limiter.on_throttle()
+
+        # Then
+        assert limiter.rate == 2.0
+        clock.now += 1.0
+        limiter.on_throttle()
+        assert limiter.rate == 1.0
+
+    def test_success_recovers_rate_up_to_limit(self, clock):
+        """성공 응답마다 속도를 조금씩 올리되 허용 속도를 넘지 않는지 테스트"""
+        # Given
+        limiter = _limiter(clock, increase=1.0)
+        limiter.on_throttle()
+
+        # When
+        for _ in range(5):
+            limiter.on_success()
+
+        # Then
+        assert limiter.rate == 4.0
+
+    def test_call_backs_off_on_timeout(self, clock):
+        """타임아웃 예외가 발생하면 속도를 줄이고 예외를 다시 던지는지 테스트"""
+        # Given
+        limiter = _limiter(clock)
+
+        def timeout():
+            raise requests.Timeout()
+
+        # When / Then
+        with pytest.raises(requests.Timeout):
+            limiter.call(timeout)
+        assert limiter.rate == 2.0
+
+        with pytest.raises(KeyError):
+            limiter.call({}.__getitem__, "missing")
+        assert limiter.rate == 2.0
+
+    @pytest.mark.parametrize("status_code, body", [
+        (429, '{"error": {"name": "too_many_requests"}}'),
+        (200, "<html>blocked</html>"),
+    ])
+    def test_throttled_answer_is_recorded_once(self, clock, monkeypatch, status_code, body):
+        """429 응답이나 HTML 차단 페이지는 성공으로 기록되지 않고 한 번의 감속으로만 기록되는지 테스트"""
+        # Given
+        limiter = _limiter(clock)
+        throttles, successes = [], []
+        monkeypatch.setattr(limiter, "on_throttle", lambda: throttles.append(1))
+        monkeypatch.setattr(limiter, "on_success", lambda: successes.append(1))
+        monkeypatch.setattr(requests, "get", lambda *args, **kwargs: _response(status_code, body))
+        api = UpbitAPI("key", "secret", rate_limiter=limiter)
+
+        # When / Then
+        with pytest.raises(requests.RequestException):
+            api.get_ticker("KRW-BTC")
+        assert (len(throttles), len(successes)) == (1, 0)
+
+    def test_valid_answer_is_recorded_as_success(self, clock, monkeypatch):
+        """정상 응답은 성공으로 한 번 기록되는지 테스트"""
+        # Given
+        limiter = _limiter(clock)
+        monkeypatch.setattr(requests, "get", lambda *args, **kwargs: _response(200, '[{"market": "KRW-BTC"}]'))
+        api = UpbitAPI("key", "secret", rate_limiter=limiter)
+        limiter.on_throttle()
+
+        # When
+        response = api.get_ticker("KRW-BTC")
+
+        # Then
+        assert response.json() == [{"market": "KRW-BTC"}]
+        assert limiter.rate == pytest.approx(2.0 + limiter.increase)
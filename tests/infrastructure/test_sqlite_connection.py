@@ -0,0 +1,60 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.backend.infrastructure.db.connection import SQLiteConnectionManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = SQLiteConnectionManager.for_path(tmp_path / "test.db")
+    manager.write(lambda conn: conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, value TEXT)"))
+    yield manager
+    manager.close()
+
+
+class TestSQLiteConnectionManager:
+    def test_connection_is_reused_per_thread_with_pragmas(self, manager):
+        """스레드별 연결을 재사용하고 WAL 등 설정이 적용되는지 테스트"""
+        # When
+        conn = manager.connection()
+        other = []
+        thread = threading.Thread(target=lambda: other.append(manager.connection()))
+        thread.start()
+        thread.join()
+
+        # Then
+        assert manager.connection() is conn
+        assert other[0] is not conn
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == SQLiteConnectionManager.BUSY_TIMEOUT_MS
+
+    def test_concurrent_writers_are_serialized(self, manager):
+        """여러 스레드가 동시에 쓰더라도 잠금 오류 없이 모두 반영되는지 테스트"""
+        # When
+        def insert(i):
+            manager.write(lambda conn: conn.executemany(
+                "INSERT INTO items (value) VALUES (?)", [(f"{i}-{j}",) for j in range(50)]
+            ))
+
+        with ThreadPoolExecutor(max_workers=32) as pool:
+            list(pool.map(insert, range(400)))
+
+        # Then
+        assert manager.connection().execute("SELECT COUNT(*) FROM items").fetchone()[0] == 400 * 50
+
+    def test_failed_write_is_rolled_back(self, manager):
+        """쓰기 작업이 실패하면 트랜잭션 전체가 롤백되는지 테스트"""
+        # Given
+        def work(conn):
+            conn.execute("INSERT INTO items (value) VALUES ('kept?')")
+            raise ValueError("boom")
+
+        # When
+        with pytest.raises(ValueError):
+            manager.write(work)
+
+        # Then
+        assert manager.connection().execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0